@@ -4,6 +4,7 @@ import json
 import pathlib
 import sys
 from http.server import BaseHTTPRequestHandler
+from typing import TYPE_CHECKING
 from urllib.parse import parse_qs, urlparse
 
 
@@ -12,8 +13,75 @@ PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from transport_system.agents.integration_agent import IntegrationAgent
-from transport_system.schemas import Scenario
+from transport_system.core import CoreModel
+
+if TYPE_CHECKING:
+    from transport_system.schemas import Scenario
+    from transport_system.service import ScenarioService
+
+# Baked by ``python -m transport_system.core`` at build time; see get_core().
+COMPILED_DIR = PROJECT_ROOT / "data" / "compiled"
+
+# Query parameter -> (Scenario field, default).
+QUERY_PARAMS = {
+    "avoid": ("avoid_demand_reduction", 0.0),
+    "shift": ("shift_to_public_transport", 0.0),
+    "improve": ("improve_efficiency", 0.0),
+    "ev": ("ev_adoption", 0.1),
+    "freight_shift": ("freight_shift_road_to_rail", 0.0),
+    "grid": ("grid_emission_factor_kg_per_kwh", 0.72),
+}
+
+# Kept at module level so warm invocations of the function reuse the agent, data and cache.
+_SERVICE: ScenarioService | None = None
+_CORE: CoreModel | None = None
+
+
+def get_service() -> ScenarioService:
+    global _SERVICE
+    if _SERVICE is None:
+        # The full agent stack (pandas, SciPy) is only imported when it is needed.
+        from transport_system.agents.data_agent import DataAgent
+        from transport_system.agents.integration_agent import IntegrationAgent
+        from transport_system.service import ScenarioService
+
+        _SERVICE = ScenarioService(IntegrationAgent(DataAgent(PROJECT_ROOT / "data")))
+    return _SERVICE
+
+
+def get_core() -> CoreModel | None:
+    """The pandas-free model over the baked dataset, or ``None`` if it is missing or stale."""
+    global _CORE
+    if _CORE is None and CoreModel.available(COMPILED_DIR):
+        try:
+            _CORE = CoreModel(COMPILED_DIR)
+        except ValueError:
+            return None
+    return _CORE
+
+
+def _parse_float(params, key: str, default: float) -> float:
+    try:
+        return float(params.get(key, [default])[0])
+    except (TypeError, ValueError):
+        return default
+
+
+def query_levers(params) -> dict:
+    return {field: _parse_float(params, key, default) for key, (field, default) in QUERY_PARAMS.items()}
+
+
+def scenario_from_query(params) -> Scenario:
+    from transport_system.schemas import Scenario
+
+    return Scenario(name=params.get("name", ["api-scenario"])[0], **query_levers(params))
+
+
+def scenario_payload(scenario: Scenario, kpis: dict) -> dict:
+    return {
+        "scenario": scenario.model_dump(),
+        "kpis": kpis,
+    }
 
 
 class handler(BaseHTTPRequestHandler):
@@ -32,33 +100,20 @@ class handler(BaseHTTPRequestHandler):
       - grid: grid emission factor (kg CO₂ / kWh)
     """
 
-    def _parse_float(self, params, key: str, default: float) -> float:
-        try:
-            return float(params.get(key, [default])[0])
-        except (TypeError, ValueError):
-            return default
-
     def do_GET(self) -> None:  # noqa: N802 (Vercel requires this name)
         parsed = urlparse(self.path)
         params = parse_qs(parsed.query)
 
-        scenario = Scenario(
-            name=params.get("name", ["api-scenario"])[0],
-            avoid_demand_reduction=self._parse_float(params, "avoid", 0.0),
-            shift_to_public_transport=self._parse_float(params, "shift", 0.0),
-            improve_efficiency=self._parse_float(params, "improve", 0.0),
-            ev_adoption=self._parse_float(params, "ev", 0.1),
-            freight_shift_road_to_rail=self._parse_float(params, "freight_shift", 0.0),
-            grid_emission_factor_kg_per_kwh=self._parse_float(params, "grid", 0.72),
-        )
-
-        agent = IntegrationAgent()
-        result = agent.run_scenario(scenario)
-
-        payload = {
-            "scenario": scenario.model_dump(),
-            "kpis": result.kpis,
-        }
+        # Cold-start path: valid levers go to the baked core model, which needs neither pandas nor
+        # pydantic. Anything else takes the full path, so validation errors are unchanged.
+        core = get_core()
+        levers = query_levers(params)
+        if core is not None and core.in_bounds(levers):
+            scenario = {"name": params.get("name", ["api-scenario"])[0], **levers}
+            payload = {"scenario": scenario, "kpis": core.evaluate_one(levers)}
+        else:
+            scenario = scenario_from_query(params)
+            payload = scenario_payload(scenario, get_service().evaluate(scenario))
 
         body = json.dumps(payload, default=float).encode("utf-8")
 
@@ -68,4 +123,3 @@ class handler(BaseHTTPRequestHandler):
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
-
@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from pydantic import ValidationError
+
+# Ensure project root is on sys.path so we can import transport_system
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from api.scenario import get_service, scenario_from_query, scenario_payload
+from transport_system.profiling import DEFAULT_REGISTRY
+from transport_system.schemas import Scenario
+from transport_system.utils.result_store import ResultStore
+
+# Upper bound on scenarios per POST, to keep one request from monopolising the server.
+MAX_BATCH = 100_000
+
+
+class ScenarioRequestHandler(BaseHTTPRequestHandler):
+    """
+    Standalone scenario server sharing one warm ``ScenarioService``.
+
+    Routes:
+      - GET  /api/scenario   same query params as the Vercel function in api/scenario.py
+      - POST /api/scenarios  JSON body {"scenarios": [{<Scenario fields>}, ...]} (or a bare list)
+      - GET  /healthz        service cache statistics
+      - GET  /metrics        Prometheus text: per-stage aggregates of profiled runs and cache gauges
+    """
+
+    protocol_version = "HTTP/1.1"
+    # Keep-alive responses are written as headers + body; without TCP_NODELAY each one stalls on delayed ACKs.
+    disable_nagle_algorithm = True
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - keep stdout quiet under load
+        pass
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload, default=float).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_text(self, status: int, text: str, content_type: str) -> None:
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        parsed = urlparse(self.path)
+        if parsed.path == "/healthz":
+            self._send_json(200, {"status": "ok", **get_service().stats()})
+            return
+        if parsed.path == "/metrics":
+            gauges = {f"transport_service_{k}": v for k, v in get_service().stats().items()}
+            self._send_text(200, DEFAULT_REGISTRY.render(gauges), "text/plain; version=0.0.4")
+            return
+        if parsed.path != "/api/scenario":
+            self._send_json(404, {"error": f"unknown route {parsed.path}"})
+            return
+        try:
+            scenario = scenario_from_query(parse_qs(parsed.query))
+        except ValidationError as exc:
+            self._send_json(400, {"error": exc.errors(include_url=False)})
+            return
+        try:
+            kpis = get_service().evaluate(scenario)
+        except Exception as exc:  # noqa: BLE001 - answer the request rather than drop the connection
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        self._send_json(200, scenario_payload(scenario, kpis))
+
+    def do_POST(self) -> None:  # noqa: N802
+        parsed = urlparse(self.path)
+        if parsed.path != "/api/scenarios":
+            self._send_json(404, {"error": f"unknown route {parsed.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            data = json.loads(self.rfile.read(length) or b"[]")
+            items = data.get("scenarios", []) if isinstance(data, dict) else data
+            if not isinstance(items, list) or len(items) > MAX_BATCH:
+                raise ValueError(f"expected a list of at most {MAX_BATCH} scenarios")
+            scenarios = [Scenario(**item) for item in items]
+        except ValidationError as exc:
+            self._send_json(400, {"error": exc.errors(include_url=False)})
+            return
+        except (ValueError, TypeError, AttributeError) as exc:
+            self._send_json(400, {"error": str(exc)})
+            return
+
+        try:
+            results = get_service().evaluate_many(scenarios)
+        except Exception as exc:  # noqa: BLE001 - answer the request rather than drop the connection
+            self._send_json(500, {"error": f"{type(exc).__name__}: {exc}"})
+            return
+        self._send_json(200, {"results": [scenario_payload(sc, k) for sc, k in zip(scenarios, results)]})
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    profile: bool = False,
+    trace_memory: bool = False,
+    store: str | None = None,
+) -> None:
+    agent = get_service().agent
+    agent.profiling = profile
+    agent.trace_memory = trace_memory
+    if store:
+        agent.store = ResultStore(store)
+    get_service().data_version()  # warm the agent and data bundle before accepting requests
+    server = ThreadingHTTPServer((host, port), ScenarioRequestHandler)
+    server.daemon_threads = True
+    print(f"Serving scenarios on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the long-lived scenario API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--profile", action="store_true", help="record per-stage timings for /metrics")
+    parser.add_argument("--trace-memory", action="store_true", help="also trace peak allocations (slow)")
+    parser.add_argument("--store", metavar="PATH", help="persist results in this SQLite file across restarts")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.profile, args.trace_memory, args.store)
+
+
+if __name__ == "__main__":
+    main()
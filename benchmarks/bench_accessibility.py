@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import resource
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_assignment import grid_network
+from transport_system.agents.sustainability_agent import SustainabilityAgent
+from transport_system.config import AccessibilitySettings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-zone gravity accessibility over a network skim")
+    parser.add_argument("--side", type=int, default=100, help="grid side; links ~= 4 * side^2")
+    parser.add_argument("--zones", type=int, default=5_000)
+    parser.add_argument("--betas", type=float, nargs="+", default=[0.05, 0.1, 0.15])
+    parser.add_argument("--block", type=int, default=1024)
+    parser.add_argument("--float32", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(2)
+    links = grid_network(args.side)
+    zones = rng.choice(args.side * args.side, args.zones, replace=False).astype(str)
+    opportunities = pd.DataFrame(
+        {
+            "zone_id": zones,
+            "jobs": rng.integers(0, 20_000, args.zones),
+            "schools": rng.integers(0, 50, args.zones),
+            "hospitals": rng.integers(0, 5, args.zones),
+        }
+    )
+    agent = SustainabilityAgent(
+        access=AccessibilitySettings(block=args.block, dtype="float32" if args.float32 else "float64")
+    )
+
+    print(f"links={len(links)} zones={args.zones} betas={args.betas} block={args.block}")
+    t0 = time.perf_counter()
+    table = agent.zone_accessibility(opportunities, links, betas=args.betas)
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"accessibility: {elapsed:.2f} s, {table.shape[1]} columns, peak RSS {peak_mb:.0f} MB")
+    print(f"(a dense {args.zones}x{args.zones} float64 skim alone would be {args.zones**2 * 8 / 2**20:.0f} MB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from transport_system.utils.assignment import LinkGraph, all_or_nothing, frank_wolfe_assignment
+from transport_system.utils.link_table import LinkTable
+
+
+def grid_network(side: int, seed: int = 0) -> LinkTable:
+    # Bidirectional square grid: ~4 * side^2 directed links.
+    rng = np.random.default_rng(seed)
+    ids = np.arange(side * side).reshape(side, side)
+    tails, heads = [], []
+    for a, b in ((ids[:, :-1], ids[:, 1:]), (ids[:-1, :], ids[1:, :])):
+        tails += [a.ravel(), b.ravel()]
+        heads += [b.ravel(), a.ravel()]
+    tail = np.concatenate(tails)
+    head = np.concatenate(heads)
+    m = tail.shape[0]
+    length = rng.uniform(0.3, 2.0, m)
+    return LinkTable(
+        link_id=np.arange(m).astype(object),
+        from_node=tail.astype(str).astype(object),
+        to_node=head.astype(str).astype(object),
+        length_km=length,
+        free_flow_time_min=length / rng.uniform(25.0, 60.0, m) * 60.0,
+        capacity_vph=rng.choice([900.0, 1800.0, 3600.0], m),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Frank–Wolfe user-equilibrium assignment benchmark")
+    parser.add_argument("--side", type=int, default=100, help="grid side; links ~= 4 * side^2")
+    parser.add_argument("--zones", type=int, default=1_000)
+    parser.add_argument("--od-per-zone", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--gap", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1)
+    links = grid_network(args.side)
+    graph = LinkGraph(links)
+    zones = rng.choice(graph.num_nodes, args.zones, replace=False)
+    n_od = args.zones * args.od_per_zone
+    origins = zones[rng.integers(0, args.zones, n_od)]
+    destinations = zones[rng.integers(0, args.zones, n_od)]
+    trips = rng.uniform(1.0, 15.0, n_od)
+
+    print(f"links={len(links)} nodes={graph.num_nodes} zones={args.zones} od_pairs={n_od}")
+    graph.reweight(links.free_flow_time_min)
+    t0 = time.perf_counter()
+    all_or_nothing(graph, origins, destinations, trips)
+    print(f"all-or-nothing load: {time.perf_counter() - t0:.2f} s")
+
+    t0 = time.perf_counter()
+    res = frank_wolfe_assignment(
+        links, graph, origins, destinations, trips, relative_gap=args.gap, max_iterations=args.iterations
+    )
+    print(
+        f"frank-wolfe: {time.perf_counter() - t0:.2f} s, iterations={res.iterations}, "
+        f"relative_gap={res.relative_gap:.2e}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from transport_system.agents.energy_agent import EnergySystemAgent
+from transport_system.config import ChargingSettings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hourly EV charging load and CO2 benchmark (8760 h x scenarios)")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    hours = np.arange(8760)
+    # Non-EV demand with daily and seasonal swings, for the system peak and peak-flattening.
+    base_load = 2.0e6 * (1.0 + 0.25 * np.sin(2 * np.pi * (hours % 24 - 13) / 24) + 0.1 * np.cos(2 * np.pi * hours / 8760))
+
+    cases = {
+        "unmanaged": ChargingSettings(mode="hourly"),
+        "managed co2": ChargingSettings(mode="hourly", managed=True),
+        "managed peak + base": ChargingSettings(mode="hourly", managed=True, objective="peak"),
+    }
+    print(f"{'case':<24} {'scenarios':>9} {'time (s)':>9} {'EV peak (MW)':>13} {'avg kg/kWh':>11} {'marg kg/kWh':>12}")
+    for n in args.scenarios:
+        energy = rng.uniform(1e8, 2e9, n)
+        grid = rng.uniform(0.3, 0.8, n)
+        for name, settings in cases.items():
+            agent = EnergySystemAgent(charging=settings)
+            base = base_load if settings.objective == "peak" else None
+            t0 = time.perf_counter()
+            out = agent.evaluate_hourly(energy, grid, base_load_kw=base)
+            elapsed = time.perf_counter() - t0
+            print(
+                f"{name:<24} {n:>9} {elapsed:9.3f} {out['ev_peak_kw'].mean() / 1e3:13.1f} "
+                f"{out['ev_average_intensity_kg_per_kwh'].mean():11.3f} {out['ev_marginal_intensity_kg_per_kwh'].mean():12.3f}"
+            )
+
+    # Inside scenario sweeps the hourly mode is one precomputed factor per agent.
+    agent = EnergySystemAgent(charging=ChargingSettings(mode="hourly", managed=True))
+    vkm, share, grid = np.full(100_000, 1e6), rng.uniform(0, 1, 100_000), rng.uniform(0.3, 0.8, 100_000)
+    t0 = time.perf_counter()
+    agent.evaluate_batch(vkm, share, grid)
+    print(f"evaluate_batch, hourly mode, 100000 scenarios: {time.perf_counter() - t0:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import argparse
+import json
+import pathlib
+import subprocess
+import sys
+import tempfile
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from transport_system.core import bake
+
+# Run in a fresh interpreter per sample: imports, data loading and the first request all count.
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+sys.path.insert(0, {root!r})
+import api.scenario as endpoint
+t1 = time.perf_counter()
+query = {{"ev": ["0.4"], "grid": ["0.5"]}}
+{call}
+t2 = time.perf_counter()
+print(json.dumps({{"import_s": t1 - t0, "first_s": t2 - t1, "modules": len(sys.modules),
+                   "pandas": "pandas" in sys.modules, "pydantic": "pydantic" in sys.modules}}))
+"""
+
+PATHS = {
+    # The pre-baked artifact and the pandas-free core model, as the handler uses them.
+    "core": """
+from transport_system.core import CoreModel
+CoreModel({compiled!r}).evaluate_one(endpoint.query_levers(query))
+""",
+    # The full agent stack over the CSVs, as when no artifact is baked (what ``get_service`` builds).
+    "service": """
+from transport_system.agents.data_agent import DataAgent
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.service import ScenarioService
+ScenarioService(IntegrationAgent(DataAgent({data!r}))).evaluate(endpoint.scenario_from_query(query))
+""",
+}
+
+
+def probe(path: str, data: str, compiled: pathlib.Path) -> dict:
+    call = PATHS[path].format(data=data, compiled=str(compiled))
+    code = _PROBE.format(root=str(PROJECT_ROOT), call=call)
+    out = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Cold start of the serverless scenario endpoint: import + first response")
+    parser.add_argument("--data", default=str(PROJECT_ROOT / "data"), help="CSV dataset, baked into a temporary artifact")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        compiled = pathlib.Path(tmp) / "compiled"
+        bake(args.data, compiled)
+        print(f"{'path':>8} {'import (ms)':>12} {'first (ms)':>11} {'total (ms)':>11} {'modules':>8} {'pandas':>7} {'pydantic':>9}")
+        for path in PATHS:
+            runs = [probe(path, args.data, compiled) for _ in range(args.repeat)]
+            best = min(runs, key=lambda r: r["import_s"] + r["first_s"])
+            print(
+                f"{path:>8} {best['import_s'] * 1e3:12.1f} {best['first_s'] * 1e3:11.1f} "
+                f"{(best['import_s'] + best['first_s']) * 1e3:11.1f} {best['modules']:8d} "
+                f"{str(best['pandas']):>7} {str(best['pydantic']):>9}"
+            )
+
+
+if __name__ == "__main__":
+    main()
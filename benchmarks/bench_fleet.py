@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from transport_system.agents.energy_agent import EnergySystemAgent
+from transport_system.utils.fleet import linear_trajectory, logistic_trajectory
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fleet stock-turnover pathways benchmark")
+    parser.add_argument("--pathways", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    agent = EnergySystemAgent()
+    years = np.arange(agent.fleet.start_year, agent.fleet.end_year + 1)
+    rng = np.random.default_rng(args.seed)
+    print(f"years={len(years)} vintages={len(years) + agent.fleet.max_age}")
+    for n in args.pathways:
+        # EV sales S-curves (final share, midpoint year, steepness) and grid decarbonisation per pathway.
+        t0 = time.perf_counter()
+        shares = logistic_trajectory(years, rng.uniform(0.2, 1.0, n), rng.uniform(2028, 2045, n), rng.uniform(0.2, 0.6, n))
+        grid = linear_trajectory(years, agent.defaults.grid_emission_factor_kg_per_kwh, rng.uniform(0.05, 0.7, n))
+        projection = agent.project_fleet(shares, grid)
+        elapsed = time.perf_counter() - t0
+        cumulative = projection.cumulative() / 1e9
+        print(
+            f"{n:>8} pathways: {elapsed:.3f} s, cumulative CO2 {cumulative.min():.1f}-{cumulative.max():.1f} Mt, "
+            f"2050 EV stock share {projection['ev_stock_share'][-1].mean():.2f} (mean)"
+        )
+
+
+if __name__ == "__main__":
+    main()
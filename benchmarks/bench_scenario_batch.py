@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_transport_simulate import synthetic_links
+
+from transport_system.agents.data_agent import DataAgent, DataBundle
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.schemas import ScenarioBatch
+
+
+class _StaticDataAgent(DataAgent):
+    def __init__(self, bundle: DataBundle) -> None:
+        super().__init__(cache=None)
+        self.bundle = bundle
+
+    def load(self) -> DataBundle:
+        return self.bundle
+
+
+def random_batch(n: int, seed: int = 0) -> ScenarioBatch:
+    rng = np.random.default_rng(seed)
+    return ScenarioBatch(
+        avoid_demand_reduction=rng.uniform(0.0, 0.8, n),
+        shift_to_public_transport=rng.uniform(0.0, 0.8, n),
+        improve_efficiency=rng.uniform(0.0, 0.8, n),
+        ev_adoption=rng.uniform(0.0, 1.0, n),
+        freight_shift_road_to_rail=rng.uniform(0.0, 0.9, n),
+        grid_emission_factor_kg_per_kwh=rng.uniform(0.3, 1.2, n),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="IntegrationAgent.run_batch scaling over scenarios x links")
+    parser.add_argument("--scenarios", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--links", type=int, nargs="+", default=[0, 100, 1_000])
+    args = parser.parse_args()
+
+    sample = DataAgent(PROJECT_ROOT / "data", cache=None).load()
+    print(f"{'scenarios':>10} {'links':>8} {'seconds':>9} {'ns/cell':>9}")
+    for n_links in args.links:
+        links = sample.traffic_links if n_links == 0 else synthetic_links(n_links)
+        bundle = DataBundle(
+            traffic_links=links,
+            passenger_demand=sample.passenger_demand,
+            freight_shipments=sample.freight_shipments,
+            opportunities=sample.opportunities,
+        )
+        agent = IntegrationAgent(data_agent=_StaticDataAgent(bundle))
+        for n in args.scenarios:
+            batch = random_batch(n)
+            t0 = time.perf_counter()
+            table = agent.run_batch(batch)
+            dt = time.perf_counter() - t0
+            assert isinstance(table, pd.DataFrame) and len(table) == n
+            print(f"{n:>10} {len(links):>8} {dt:9.3f} {dt / (n * len(links)) * 1e9:9.2f}")
+
+
+if __name__ == "__main__":
+    main()
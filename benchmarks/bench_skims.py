@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import pathlib
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_assignment import grid_network
+from transport_system.utils.skims import SkimStore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Skim build, reload and incremental update")
+    parser.add_argument("--side", type=int, default=60, help="grid side; links ~= 4 * side^2")
+    parser.add_argument("--zones", type=int, default=800)
+    parser.add_argument("--edits", type=int, default=3, help="links whose free-flow time is changed")
+    parser.add_argument("--dtype", default="float32")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(3)
+    links = grid_network(args.side)
+    zones = rng.choice(args.side * args.side, args.zones, replace=False).astype(str)
+
+    with tempfile.TemporaryDirectory() as root:
+        store = SkimStore(root, dtype=args.dtype)
+        print(f"links={len(links)} zones={args.zones} dtype={args.dtype}")
+
+        t0 = time.perf_counter()
+        store.get(links, zones)
+        print(f"full build: {time.perf_counter() - t0:.2f} s")
+
+        t0 = time.perf_counter()
+        store.get(links, zones)
+        print(f"reload (mmap): {(time.perf_counter() - t0) * 1e3:.1f} ms")
+
+        fft = links.free_flow_time_min.copy()
+        edited = rng.choice(len(links), args.edits, replace=False)
+        fft[edited] *= rng.uniform(0.7, 1.5, args.edits)
+        t0 = time.perf_counter()
+        store.get(dataclasses.replace(links, free_flow_time_min=fft), zones)
+        stats = store.last_update
+        print(
+            f"update after {args.edits} edits: {time.perf_counter() - t0:.2f} s, "
+            f"{stats['recomputed_origins']:.0f}/{stats['origins']:.0f} origin trees regrown"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+
+import pandas as pd
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from bench_transport_simulate import _best_of, synthetic_links
+from transport_system.agents.transport_agent import TransportSimulationAgent
+from transport_system.config import TimeOfDaySettings
+from transport_system.utils.link_table import LinkTable
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Full-day time-of-day simulation vs one peak hour")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--interval-minutes", type=float, default=15.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    hour = TransportSimulationAgent()
+    day = TransportSimulationAgent(time_of_day=TimeOfDaySettings(interval_minutes=args.interval_minutes))
+    intervals = len(day.day_profile())
+    demand = pd.DataFrame({"peak_hour_trips": [5_500_000.0], "avg_trip_km": [10.0]})
+
+    print(f"{'links':>10} {'peak hour (ms)':>15} {f'day x{intervals} (ms)':>15} {'ratio':>7}")
+    for n in args.sizes:
+        links = LinkTable.from_frame(synthetic_links(n))
+        t_hour = _best_of(lambda: hour.simulate(links, demand), args.repeat)
+        t_day = _best_of(lambda: day.simulate(links, demand), args.repeat)
+        print(f"{n:>10} {t_hour * 1e3:15.2f} {t_day * 1e3:15.2f} {t_day / t_hour:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
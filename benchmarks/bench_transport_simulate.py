@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import argparse
+import pathlib
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from transport_system.agents.transport_agent import TransportSimulationAgent
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.math_models import bpr_travel_time
+
+
+def synthetic_links(n: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    length = rng.uniform(0.5, 10.0, n)
+    return pd.DataFrame(
+        {
+            "link_id": [f"L{i}" for i in range(n)],
+            "from_node": rng.integers(0, max(n // 3, 1), n).astype(str),
+            "to_node": rng.integers(0, max(n // 3, 1), n).astype(str),
+            "length_km": length,
+            "free_flow_time_min": length / rng.uniform(20.0, 60.0, n) * 60.0,
+            "capacity_vph": rng.choice([800.0, 1600.0, 2400.0, 3600.0], n),
+        }
+    )
+
+
+def legacy_simulate(traffic_links: pd.DataFrame, volume_per_link: float) -> float:
+    # Reference per-row loop, as simulate() was written before the array engine.
+    times = []
+    for _, row in traffic_links.iterrows():
+        times.append(bpr_travel_time(row["free_flow_time_min"], volume_per_link, row["capacity_vph"]))
+    return sum(times) / len(times)
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Scaling benchmark for TransportSimulationAgent.simulate")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 50_000, 100_000, 300_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--legacy-max", type=int, default=50_000, help="largest size to time the iterrows loop on")
+    args = parser.parse_args()
+
+    agent = TransportSimulationAgent()
+    demand = pd.DataFrame({"peak_hour_trips": [5_500_000.0], "avg_trip_km": [10.0]})
+
+    print(f"{'links':>10} {'frame (ms)':>12} {'table (ms)':>12} {'legacy (ms)':>12}")
+    for n in args.sizes:
+        links = synthetic_links(n)
+        table = LinkTable.from_frame(links)
+        t_frame = _best_of(lambda: agent.simulate(links, demand), args.repeat)
+        t_table = _best_of(lambda: agent.simulate(table, demand), args.repeat)
+        legacy = "-"
+        if n <= args.legacy_max:
+            legacy = f"{_best_of(lambda: legacy_simulate(links, 5_500_000.0 / n), 1) * 1e3:12.2f}"
+        print(f"{n:>10} {t_frame * 1e3:12.2f} {t_table * 1e3:12.2f} {legacy:>12}")
+
+
+if __name__ == "__main__":
+    main()
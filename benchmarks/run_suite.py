@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import gc
+import pathlib
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from transport_system.agents import (
+    DataAgent,
+    EmissionsAgent,
+    EnergySystemAgent,
+    FreightOptimizationAgent,
+    IntegrationAgent,
+    SustainabilityAgent,
+    TransportSimulationAgent,
+)
+from transport_system.agents.optimization_agent import LeverCost, OptimizationAgent
+from transport_system.config import AssignmentSettings, ChargingSettings, TimeOfDaySettings
+from transport_system.schemas import Scenario, ScenarioBatch
+from transport_system.synthetic import CitySpec, generate_city, write_city
+from transport_system.utils.io import read_json, write_json
+
+RESULTS_DIR = PROJECT_ROOT / "benchmarks" / "results"
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Best-of-``repeat`` wall and CPU time, then one traced run for peak Python/NumPy allocations."""
+    wall = cpu = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        w0, c0 = time.perf_counter(), time.process_time()
+        fn()
+        wall = min(wall, time.perf_counter() - w0)
+        cpu = min(cpu, time.process_time() - c0)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"wall_s": wall, "cpu_s": cpu, "peak_mb": peak / 2**20}
+
+
+def benches(data_dir: pathlib.Path, spec: CitySpec, equilibrium: bool) -> Dict[str, Callable[[], object]]:
+    data_agent = DataAgent(data_dir)
+    bundle = data_agent.load()
+    links = bundle.link_table
+    scenario = Scenario(avoid_demand_reduction=0.1, shift_to_public_transport=0.2, improve_efficiency=0.1)
+    warm = IntegrationAgent(data_agent)
+    warm.run_scenario(scenario)
+    grid_step = iter(np.linspace(0.3, 1.2, 1_000_000))
+    fleet_shares = np.linspace(0.0, 1.0, 26)[:, None] * np.linspace(0.2, 1.0, 10_000)
+    batch = ScenarioBatch.grid(
+        avoid_demand_reduction=np.linspace(0.0, 0.5, 10),
+        shift_to_public_transport=np.linspace(0.0, 0.5, 10),
+        ev_adoption=np.linspace(0.0, 1.0, 10),
+    )
+
+    cases: Dict[str, Callable[[], object]] = {
+        "generate_city": lambda: generate_city(spec),
+        "data_load_csv": lambda: DataAgent(data_dir, cache=None).load(),
+        "transport_simulate": lambda: TransportSimulationAgent().simulate(links, bundle.passenger_demand, 0.1, 0.2, 0.1),
+        "transport_time_of_day": lambda: TransportSimulationAgent(time_of_day=TimeOfDaySettings()).simulate(
+            links, bundle.passenger_demand, 0.1, 0.2, 0.1
+        ),
+        "emissions_passenger": lambda: EmissionsAgent().passenger_emissions(bundle.passenger_demand),
+        "emissions_freight": lambda: EmissionsAgent().freight_emissions(bundle.freight_shipments, 0.8),
+        "freight_optimize": lambda: FreightOptimizationAgent().optimize(bundle.freight_shipments, 0.2, 0.1),
+        "freight_plan_flows": lambda: FreightOptimizationAgent().plan_flows(bundle.freight_shipments, links),
+        "energy_evaluate": lambda: EnergySystemAgent().evaluate(1e6, 0.3, 0.7),
+        "fleet_projection_10000": lambda: EnergySystemAgent().project_fleet(fleet_shares, 0.5),
+        "energy_hourly_1000": lambda: EnergySystemAgent(charging=ChargingSettings(mode="hourly", managed=True)).evaluate_hourly(
+            np.full(1_000, 1e9), np.linspace(0.3, 0.8, 1_000)
+        ),
+        # A fresh agent each time, so the accessibility skim is part of the cost.
+        "sustainability_compute": lambda: SustainabilityAgent().compute(
+            total_co2_kg=1e6,
+            congestion_index=1.2,
+            avg_travel_time_min=20.0,
+            opportunities=bundle.opportunities,
+            traffic_links=links,
+        ),
+        "run_scenario_cold": lambda: IntegrationAgent(data_agent).run_scenario(scenario),
+        "run_scenario_one_lever": lambda: warm.run_scenario(
+            scenario.model_copy(update={"grid_emission_factor_kg_per_kwh": float(next(grid_step))})
+        ),
+        "run_batch_1000": lambda: warm.run_batch(batch),
+        # A fresh optimizer each time so its result cache does not carry over between repeats.
+        "optimize_budget_2000": lambda: OptimizationAgent(warm).optimize(
+            costs={name: LeverCost(100.0) for name in ("avoid_demand_reduction", "shift_to_public_transport")},
+            budget=40.0,
+            max_evaluations=2_000,
+            patience=10**6,
+        ),
+        "pareto_100000": lambda: OptimizationAgent(warm).pareto(n_evaluations=100_000),
+    }
+    if equilibrium:
+        settings = AssignmentSettings(mode="equilibrium", relative_gap=1e-3, max_iterations=10)
+        cases["transport_equilibrium"] = lambda: TransportSimulationAgent(settings).simulate(
+            links, bundle.passenger_demand, 0.1, 0.2, 0.1
+        )
+    return cases
+
+
+def metadata() -> Dict[str, str]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = ""
+    return {
+        "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(current: List[Dict], baseline_path: pathlib.Path, threshold: float, min_ms: float) -> int:
+    baseline = {(r["links"], r["bench"]): r for r in read_json(baseline_path)["results"]}
+    regressions = 0
+    print(f"\nvs {baseline_path.name} (regression: wall time > {threshold:.2f}x and > {min_ms:g} ms slower)")
+    print(f"{'links':>8} {'bench':<24} {'wall':>8} {'peak mem':>9}")
+    for r in current:
+        old = baseline.get((r["links"], r["bench"]))
+        if old is None:
+            continue
+        wall = r["wall_s"] / max(old["wall_s"], 1e-9)
+        mem = r["peak_mb"] / max(old["peak_mb"], 1e-9)
+        slower_ms = (r["wall_s"] - old["wall_s"]) * 1e3
+        flag = "  REGRESSION" if wall > threshold and slower_ms > min_ms else ""
+        regressions += bool(flag)
+        print(f"{r['links']:>8} {r['bench']:<24} {wall:7.2f}x {mem:8.2f}x{flag}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time and memory-profile every agent on synthetic cities")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000], help="links per city")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="run only these benchmarks")
+    parser.add_argument("--equilibrium", action="store_true", help="also time Frank–Wolfe assignment")
+    parser.add_argument("--out", type=pathlib.Path, help="JSON output (default: benchmarks/results/suite-<time>.json)")
+    parser.add_argument("--compare", type=pathlib.Path, help="earlier suite JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    parser.add_argument("--min-ms", type=float, default=2.0, help="ignore slowdowns smaller than this (timer noise)")
+    args = parser.parse_args()
+
+    results: List[Dict] = []
+    print(f"{'links':>8} {'bench':<24} {'wall (ms)':>10} {'cpu (ms)':>10} {'peak (MB)':>10}")
+    for n_links in args.sizes:
+        spec = CitySpec(n_links=n_links, seed=args.seed)
+        with tempfile.TemporaryDirectory() as tmp:
+            data_dir = write_city(generate_city(spec), tmp)
+            for name, fn in benches(data_dir, spec, args.equilibrium).items():
+                if args.only and name not in args.only:
+                    continue
+                row = {"links": n_links, "bench": name, **measure(fn, args.repeat)}
+                results.append(row)
+                print(
+                    f"{n_links:>8} {name:<24} {row['wall_s'] * 1e3:10.2f} {row['cpu_s'] * 1e3:10.2f} "
+                    f"{row['peak_mb']:10.1f}"
+                )
+
+    out = args.out or RESULTS_DIR / f"suite-{dt.datetime.now():%Y%m%d-%H%M%S}.json"
+    write_json(out, {"meta": metadata(), "seed": args.seed, "results": results})
+    print(f"\nWrote {out}")
+
+    if args.compare and compare(results, args.compare, args.threshold, args.min_ms):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
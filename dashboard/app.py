@@ -11,8 +11,51 @@ PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
+from transport_system.agents.data_agent import DataAgent
 from transport_system.agents.integration_agent import IntegrationAgent
-from transport_system.schemas import Scenario
+from transport_system.agents.optimization_agent import OptimizationAgent
+from transport_system.lever_grid import LeverGrid, coarsen_axes, slider_axis
+from transport_system.schemas import LEVERS, Scenario
+from transport_system.utils.result_store import ResultStore
+
+# Slider ranges as (min, max, default, step); the precomputed grid uses the same steps.
+SLIDERS = {
+    "avoid_demand_reduction": (0.0, 0.8, 0.0, 0.05),
+    "shift_to_public_transport": (0.0, 0.8, 0.0, 0.05),
+    "improve_efficiency": (0.0, 0.8, 0.0, 0.05),
+    "ev_adoption": (0.0, 1.0, 0.1, 0.05),
+    "freight_shift_road_to_rail": (0.0, 0.9, 0.0, 0.05),
+    "grid_emission_factor_kg_per_kwh": (0.3, 1.2, 0.72, 0.02),
+}
+
+# Grid cells kept in memory (x ~30 KPIs x 8 bytes); axes are coarsened to fit.
+MAX_GRID_CELLS = 500_000
+
+
+@st.cache_resource
+def get_agent() -> IntegrationAgent:
+    # One warm agent (and cached data bundle) per server process, shared by every rerun and session;
+    # off-grid scenarios it computes are kept on disk for the next launch.
+    return IntegrationAgent(DataAgent(PROJECT_ROOT / "data"), store=ResultStore(PROJECT_ROOT / "data" / "results.sqlite"))
+
+
+@st.cache_resource
+def get_lever_grid() -> LeverGrid:
+    axes = {name: slider_axis(lo, hi, step) for name, (lo, hi, _, step) in SLIDERS.items()}
+    grid = LeverGrid(get_agent(), coarsen_axes(axes, MAX_GRID_CELLS))
+    grid.build_in_background()
+    return grid
+
+
+@st.cache_resource
+def get_frontier() -> pd.DataFrame:
+    # CO2 vs travel time vs lever cost trade-off from the default scenario; computed once per process.
+    return OptimizationAgent(get_agent()).pareto(n_evaluations=200_000)
+
+
+def _slider(label: str, name: str) -> float:
+    lo, hi, default, step = SLIDERS[name]
+    return st.sidebar.slider(label, lo, hi, default, step)
 
 
 def run_dashboard() -> None:
@@ -40,22 +83,17 @@ and see their impact on:
     name = st.sidebar.text_input("Scenario name", value="baseline")
 
     st.sidebar.subheader("ASI policy levers")
-    avoid = st.sidebar.slider("Avoid: demand reduction", 0.0, 0.8, 0.0, 0.05)
-    shift = st.sidebar.slider("Shift: to public / non-motorised", 0.0, 0.8, 0.0, 0.05)
-    improve = st.sidebar.slider("Improve: system efficiency", 0.0, 0.8, 0.0, 0.05)
+    avoid = _slider("Avoid: demand reduction", "avoid_demand_reduction")
+    shift = _slider("Shift: to public / non-motorised", "shift_to_public_transport")
+    improve = _slider("Improve: system efficiency", "improve_efficiency")
 
     st.sidebar.subheader("Technology transitions")
-    ev_share = st.sidebar.slider("EV adoption (passenger)", 0.0, 1.0, 0.1, 0.05)
-    freight_shift = st.sidebar.slider("Freight shift road → rail", 0.0, 0.9, 0.0, 0.05)
+    ev_share = _slider("EV adoption (passenger)", "ev_adoption")
+    freight_shift = _slider("Freight shift road → rail", "freight_shift_road_to_rail")
 
     st.sidebar.subheader("Power system")
-    grid_factor = st.sidebar.slider(
-        "Grid emission factor (kg CO₂ / kWh)",
-        0.3,
-        1.2,
-        0.72,
-        0.02,
-    )
+    grid_factor = _slider("Grid emission factor (kg CO₂ / kWh)", "grid_emission_factor_kg_per_kwh")
+    exact = st.sidebar.checkbox("Exact evaluation (skip precomputed grid)", value=False)
 
     scenario = Scenario(
         name=name,
@@ -67,9 +105,17 @@ and see their impact on:
         grid_emission_factor_kg_per_kwh=grid_factor,
     )
 
-    agent = IntegrationAgent()
-    result = agent.run_scenario(scenario)
-    kpis = result.kpis
+    agent = get_agent()
+    grid = get_lever_grid()
+    kpis = None if exact else grid.lookup(scenario)
+    if kpis is None:
+        # Grid still building, value off-grid or exact mode: run the (memoised) pipeline.
+        kpis = agent.run_scenario(scenario, compact=True).kpis.to_dict()
+        st.sidebar.caption("KPIs: exact evaluation" + ("" if grid.ready.is_set() else " (grid still building)"))
+    else:
+        st.sidebar.caption("KPIs: precomputed lever grid")
+    bundle = agent.data_agent.load()
+    policy = agent.policy_agent.recommend(scenario=scenario, kpis=kpis)
 
     st.subheader("Key indicators")
     col1, col2, col3, col4 = st.columns(4)
@@ -109,18 +155,32 @@ and see their impact on:
     st.plotly_chart(fig_perf, use_container_width=True)
 
     st.markdown("### Policy narrative")
-    st.write(result.tables["policy"]["policy_summary"].iloc[0])
+    st.write(policy["policy_summary"])
 
     with st.expander("Scenario table (digital twin snapshot)"):
-        st.dataframe(result.tables["scenario_summary"].T, use_container_width=True)
+        st.dataframe(pd.DataFrame([kpis]).T, use_container_width=True)
+
+    with st.expander("Trade-off frontier (CO₂ vs travel time vs lever cost)"):
+        if st.button("Compute frontier"):
+            frontier = get_frontier()
+            fig_front = px.scatter(
+                frontier,
+                x="avg_travel_time_min",
+                y="system_total_co2_kg",
+                color="lever_cost",
+                hover_data=[name for name in LEVERS if name != "grid_emission_factor_kg_per_kwh"],
+                labels={"system_total_co2_kg": "CO₂ (kg)", "avg_travel_time_min": "Avg travel time (min)"},
+                title=f"{len(frontier):,} non-dominated scenarios of {frontier.attrs['evaluations']:,} evaluated",
+            )
+            st.plotly_chart(fig_front, use_container_width=True)
 
     with st.expander("Input datasets"):
         st.write("Traffic links")
-        st.dataframe(result.tables["traffic_links"], use_container_width=True)
+        st.dataframe(bundle.traffic_links, use_container_width=True)
         st.write("Passenger OD demand")
-        st.dataframe(result.tables["passenger_demand"], use_container_width=True)
+        st.dataframe(bundle.passenger_demand, use_container_width=True)
         st.write("Freight shipments")
-        st.dataframe(result.tables["freight_shipments"], use_container_width=True)
+        st.dataframe(bundle.freight_shipments, use_container_width=True)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,7 @@
+import pathlib
+import sys
+
+# Make transport_system importable when pytest is run from any directory.
+PROJECT_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
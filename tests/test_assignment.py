@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import brentq
+
+from transport_system.utils.assignment import LinkGraph, frank_wolfe_assignment
+from transport_system.utils.link_table import LinkTable
+
+ALPHA, BETA = 0.15, 4.0
+
+
+def assign(frame, od, relative_gap=1e-6, max_iterations=500):
+    links = LinkTable.from_frame(pd.DataFrame(frame))
+    graph = LinkGraph(links, extra_nodes=[node for o, d, _ in od for node in (o, d)])
+    index = graph.node_index
+    origins = np.array([index[o] for o, _, _ in od])
+    destinations = np.array([index[d] for _, d, _ in od])
+    trips = np.array([q for _, _, q in od], dtype=np.float64)
+    return frank_wolfe_assignment(
+        links, graph, origins, destinations, trips, relative_gap=relative_gap, max_iterations=max_iterations
+    )
+
+
+def parallel_links(free_flow, capacity):
+    k = len(free_flow)
+    return {
+        "link_id": [f"L{i}" for i in range(k)],
+        "from_node": ["A"] * k,
+        "to_node": ["B"] * k,
+        "length_km": np.ones(k),
+        "free_flow_time_min": free_flow,
+        "capacity_vph": capacity,
+    }
+
+
+def ue_split(free_flow, capacity, demand):
+    """Wardrop split over parallel BPR links: every used link has the common time T, and inverting
+    ``t = f (1 + a (x / c)^b)`` gives each link's volume at T; T is where they add up to the demand."""
+    f, c = np.asarray(free_flow, dtype=np.float64), np.asarray(capacity, dtype=np.float64)
+
+    def volumes(T):
+        return c * (np.maximum(T / f - 1.0, 0.0) / ALPHA) ** (1.0 / BETA)
+
+    T = brentq(lambda T: volumes(T).sum() - demand, f.min(), f.max() * 1e3)
+    return volumes(T), T
+
+
+def test_equal_free_flow_splits_by_capacity():
+    # Equal times with equal free-flow times means equal volume/capacity: x_i = D * c_i / sum(c).
+    result = assign(parallel_links([10.0, 10.0], [1000.0, 2000.0]), [("A", "B", 3000.0)])
+    assert result.converged
+    np.testing.assert_allclose(result.link_volume, [1000.0, 2000.0], rtol=1e-6)
+    np.testing.assert_allclose(result.link_time, 10.0 * (1.0 + ALPHA * 1.0**BETA), rtol=1e-6)
+
+
+@pytest.mark.parametrize(
+    "free_flow,capacity,demand",
+    [
+        ([10.0, 15.0], [1000.0, 3000.0], 4000.0),
+        ([8.0, 12.0, 20.0], [800.0, 1500.0, 2500.0], 6000.0),
+        # Light demand: the slowest link stays unused.
+        ([5.0, 6.0, 30.0], [1000.0, 1000.0, 1000.0], 1500.0),
+    ],
+)
+def test_parallel_links_reach_wardrop_equilibrium(free_flow, capacity, demand):
+    result = assign(parallel_links(free_flow, capacity), [("A", "B", demand)], relative_gap=1e-7, max_iterations=2000)
+    expected, T = ue_split(free_flow, capacity, demand)
+
+    assert result.converged
+    assert result.relative_gap <= 1e-7
+    assert result.link_volume.sum() == pytest.approx(demand, rel=1e-9)
+    np.testing.assert_allclose(result.link_volume, expected, rtol=1e-3, atol=1e-3 * demand)
+    used = expected > 1e-6 * demand
+    np.testing.assert_allclose(result.link_time[used], T, rtol=1e-4)
+    assert (result.link_time[~used] >= T * (1 - 1e-4)).all()
+
+
+def test_relative_gap_stops_early_and_unreachable_trips_are_reported():
+    frame = parallel_links([8.0, 12.0], [800.0, 1500.0])
+    loose = assign(frame, [("A", "B", 5000.0), ("B", "A", 50.0)], relative_gap=1e-2)
+    tight = assign(frame, [("A", "B", 5000.0), ("B", "A", 50.0)], relative_gap=1e-7, max_iterations=2000)
+
+    assert loose.converged and loose.relative_gap <= 1e-2
+    assert loose.iterations <= tight.iterations
+    # Links only run A -> B, so the B -> A trips have no path.
+    assert loose.unassigned_trips == pytest.approx(50.0)
+    assert loose.link_volume.sum() == pytest.approx(5000.0, rel=1e-9)
@@ -0,0 +1,133 @@
+import numpy as np
+import pandas as pd
+import pytest
+from scipy.optimize import linprog
+
+from transport_system.agents.freight_agent import FreightOptimizationAgent
+from transport_system.utils.transportation import TransportationSolver
+
+SHAPES = [(1, 1), (1, 5), (6, 1), (3, 4), (8, 8), (12, 30), (40, 25)]
+
+
+def lp_optimum(cost, supply, demand):
+    """min sum(cost * x) with row sums <= supply and column sums == demand, via HiGHS."""
+    m, n = cost.shape
+    rows = np.kron(np.eye(m), np.ones(n))
+    cols = np.kron(np.ones(m), np.eye(n))
+    res = linprog(cost.ravel(), A_ub=rows, b_ub=supply, A_eq=cols, b_eq=demand, method="highs")
+    assert res.status == 0
+    return res.fun
+
+
+def instance(rng, m, n, excess=0.0, integer=False):
+    cost = rng.uniform(1.0, 100.0, (m, n))
+    if integer:
+        # Small integer amounts and costs give ties and degenerate bases.
+        cost = np.round(cost / 20.0)
+        supply = rng.integers(1, 6, m).astype(float)
+        demand = rng.multinomial(int(supply.sum()), np.full(n, 1.0 / n)).astype(float)
+    else:
+        supply = rng.uniform(1.0, 50.0, m)
+        demand = rng.dirichlet(np.ones(n)) * supply.sum()
+    return cost, supply * (1.0 + excess), demand
+
+
+def check(solution, cost, supply, demand):
+    x = solution.dense(cost.shape)
+    assert (solution.flow >= -1e-9).all()
+    np.testing.assert_allclose(x.sum(axis=0), demand, rtol=1e-8, atol=1e-8)
+    assert (x.sum(axis=1) <= supply * (1 + 1e-9) + 1e-9).all()
+    assert solution.objective == pytest.approx(float((cost * x).sum()), rel=1e-9, abs=1e-9)
+    assert solution.objective == pytest.approx(lp_optimum(cost, supply, demand), rel=1e-8, abs=1e-8)
+
+
+@pytest.mark.parametrize("m,n", SHAPES)
+@pytest.mark.parametrize("excess", [0.0, 0.2])
+@pytest.mark.parametrize("integer", [False, True])
+def test_cold_solve_matches_linprog(m, n, excess, integer):
+    rng = np.random.default_rng(1000 * m + n)
+    cost, supply, demand = instance(rng, m, n, excess, integer)
+    solution = TransportationSolver(block_cells=64).solve(cost, supply, demand, warm_start=False)
+    assert not solution.warm_started
+    check(solution, cost, supply, demand)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_warm_start_after_cost_and_supply_changes(seed):
+    rng = np.random.default_rng(seed)
+    m, n = rng.integers(2, 30, 2)
+    cost, supply, demand = instance(rng, m, n, excess=0.1 * (seed % 2))
+    solver = TransportationSolver(block_cells=64)
+    check(solver.solve(cost, supply, demand), cost, supply, demand)
+
+    cost = cost * rng.uniform(0.8, 1.2, cost.shape)
+    solution = solver.solve(cost, supply, demand)
+    assert solution.warm_started
+    check(solution, cost, supply, demand)
+
+    # Supply changes keep or drop the basis depending on whether its flows stay feasible.
+    supply = supply * rng.uniform(1.0, 1.3, m)
+    check(solver.solve(cost, supply, demand), cost, supply, demand)
+
+
+def test_infeasible_demand_is_rejected():
+    with pytest.raises(ValueError, match="demand exceeds supply"):
+        TransportationSolver().solve(np.ones((2, 2)), np.array([1.0, 1.0]), np.array([2.0, 1.0]))
+
+
+def shipments(rng, m, n, count):
+    return pd.DataFrame(
+        {
+            "origin": [f"O{i:02d}" for i in rng.integers(0, m, count)],
+            "destination": [f"D{j:02d}" for j in rng.integers(0, n, count)],
+            "tonnes": rng.uniform(10.0, 200.0, count),
+        }
+    )
+
+
+def mode_lp_optimum(road, rail, supply, demand, mode, cap):
+    """Least cost with a road and a rail flow per pair and the tonnes on ``mode`` capped at ``cap``."""
+    m, n = road.shape
+    rows = np.kron(np.eye(m), np.ones(n))
+    cols = np.kron(np.ones(m), np.eye(n))
+    a_eq = np.vstack([np.hstack([rows, rows]), np.hstack([cols, cols])])
+    on_mode = np.repeat([mode == "road", mode == "rail"], m * n).astype(float)
+    res = linprog(
+        np.concatenate([road.ravel(), rail.ravel()]),
+        A_ub=on_mode[None, :],
+        b_ub=[cap],
+        A_eq=a_eq,
+        b_eq=np.concatenate([supply, demand]),
+        method="highs",
+    )
+    assert res.status == 0
+    return res.fun
+
+
+@pytest.mark.parametrize("mode", ["rail", "road"])
+@pytest.mark.parametrize("seed", range(4))
+def test_plan_flows_binding_cap_matches_linprog(mode, seed):
+    rng = np.random.default_rng(seed)
+    m, n = 6, 9
+    frame = shipments(rng, m, n, 60)
+    origins = np.unique(frame["origin"])
+    destinations = np.unique(frame["destination"])
+    distance = rng.uniform(20.0, 900.0, (len(origins), len(destinations)))
+
+    agent = FreightOptimizationAgent()
+    free = agent.plan_flows(frame, distance_km=distance)
+    total = free.totals["freight_total_tonnes"]
+    on_mode = free.totals[f"freight_{mode}_share"] * total
+    if on_mode < 1.0:
+        pytest.skip(f"no {mode} tonnes to cap in this instance")
+    cap = 0.5 * on_mode
+
+    plan = agent.plan_flows(frame, distance_km=distance, mode_capacity={mode: cap})
+    assert plan.totals[f"freight_{mode}_share"] * total == pytest.approx(cap, rel=1e-6)
+    assert plan.totals["freight_capacity_price"] > 0.0
+
+    supply = frame.groupby("origin")["tonnes"].sum().reindex(origins).to_numpy()
+    demand = frame.groupby("destination")["tonnes"].sum().reindex(destinations).to_numpy()
+    road, rail = agent.mode_costs_per_tonne(distance)
+    expected = mode_lp_optimum(road, rail, supply, demand, mode, cap)
+    assert plan.totals["freight_cost_inr"] == pytest.approx(expected, rel=1e-6)
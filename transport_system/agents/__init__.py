@@ -1,20 +1,42 @@
-from .data_agent import DataAgent
-from .emissions_agent import EmissionsAgent
-from .transport_agent import TransportSimulationAgent
-from .freight_agent import FreightOptimizationAgent
-from .energy_agent import EnergySystemAgent
-from .sustainability_agent import SustainabilityAgent
-from .policy_agent import PolicyAgent
-from .integration_agent import IntegrationAgent
-
-__all__ = [
-    "DataAgent",
-    "EmissionsAgent",
-    "TransportSimulationAgent",
-    "FreightOptimizationAgent",
-    "EnergySystemAgent",
-    "SustainabilityAgent",
-    "PolicyAgent",
-    "IntegrationAgent",
-]
+from __future__ import annotations
 
+import importlib
+from typing import TYPE_CHECKING, Any
+
+# Agents are imported on first attribute access, so ``import transport_system.agents.x`` does not
+# pull in every agent module (and pandas) for processes that only need one of them.
+_EXPORTS = {
+    "DataAgent": "data_agent",
+    "EmissionsAgent": "emissions_agent",
+    "TransportSimulationAgent": "transport_agent",
+    "FreightOptimizationAgent": "freight_agent",
+    "EnergySystemAgent": "energy_agent",
+    "SustainabilityAgent": "sustainability_agent",
+    "PolicyAgent": "policy_agent",
+    "IntegrationAgent": "integration_agent",
+}
+
+__all__ = list(_EXPORTS)
+
+if TYPE_CHECKING:
+    from .data_agent import DataAgent
+    from .emissions_agent import EmissionsAgent
+    from .energy_agent import EnergySystemAgent
+    from .freight_agent import FreightOptimizationAgent
+    from .integration_agent import IntegrationAgent
+    from .policy_agent import PolicyAgent
+    from .sustainability_agent import SustainabilityAgent
+    from .transport_agent import TransportSimulationAgent
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, Tuple
 
 import pandas as pd
 
+from transport_system.utils.columnar import MANIFEST, is_compiled, read_columnar, write_columnar
+from transport_system.utils.freight_stream import freight_flows
+from transport_system.utils.link_table import LinkTable
+
+DATASETS = ("traffic_links", "passenger_demand", "freight_shipments", "opportunities")
+
 
 @dataclass
 class DataBundle:
@@ -13,18 +23,189 @@ class DataBundle:
     passenger_demand: pd.DataFrame
     freight_shipments: pd.DataFrame
     opportunities: pd.DataFrame
+    # Content hash of the source files; empty for bundles assembled by hand.
+    version: str = field(default="", compare=False)
+
+    @cached_property
+    def link_table(self) -> LinkTable:
+        return LinkTable.from_frame(self.traffic_links)
+
+    def nbytes(self) -> int:
+        return int(sum(getattr(self, name).memory_usage(deep=True).sum() for name in DATASETS))
+
+
+@dataclass
+class _CacheEntry:
+    stats: Tuple[Tuple[int, int], ...]
+    hashes: Tuple[str, ...]
+    bundle: DataBundle
+    nbytes: int
+
+
+class BundleCache:
+    """In-process LRU cache of parsed bundles, keyed by data directory.
+
+    An entry is reused while every file keeps its size and mtime; if those change, the files are
+    re-hashed and the entry survives as long as the content is identical. Bundles are shared
+    between callers, so treat their DataFrames as read-only.
+    """
+
+    def __init__(self, max_entries: int | None = 8, max_bytes: int | None = None) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, key: str) -> _CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: _CacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > 1 and (
+            (self.max_entries is not None and len(self._entries) > self.max_entries)
+            or (self.max_bytes is not None and self.total_bytes() > self.max_bytes)
+        ):
+            self._entries.popitem(last=False)
+
+    def total_bytes(self) -> int:
+        return sum(e.nbytes for e in self._entries.values())
+
+    def invalidate(self, key: str | None = None) -> None:
+        """Drop one data directory (or everything when ``key`` is None)."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "hits": float(self.hits),
+                "misses": float(self.misses),
+                "entries": float(len(self._entries)),
+                "bytes": float(self.total_bytes()),
+            }
+
+
+# Shared by every DataAgent in the process unless one is given its own cache.
+DEFAULT_CACHE = BundleCache()
+
+
+def _file_hash(path: Path) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with path.open("rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _bundle_version(hashes: Tuple[str, ...]) -> str:
+    return hashlib.blake2b("".join(hashes).encode(), digest_size=16).hexdigest()
 
 
 class DataAgent:
-    """Loads and preprocesses core datasets for the transport system."""
+    """Loads and preprocesses core datasets for the transport system.
 
-    def __init__(self, data_dir: str | Path = "data") -> None:
+    ``data_dir`` is either the CSV layout of ``data/`` or a compiled columnar directory (see
+    ``transport_system.utils.columnar``), which is memory-mapped instead of parsed.
+
+    With ``stream_freight`` the shipment log is never held in memory: it is read in chunks of
+    ``freight_chunksize`` rows and ``bundle.freight_shipments`` holds the per origin/destination/mode
+    flow table (see ``transport_system.utils.freight_stream``) with network distances.
+    """
+
+    def __init__(
+        self,
+        data_dir: str | Path = "data",
+        cache: BundleCache | None = DEFAULT_CACHE,
+        stream_freight: bool = False,
+        freight_chunksize: int = 1_000_000,
+    ) -> None:
         self.data_dir = Path(data_dir)
+        self.cache = cache
+        self.stream_freight = stream_freight
+        self.freight_chunksize = freight_chunksize
+
+    @property
+    def compiled(self) -> bool:
+        return is_compiled(self.data_dir)
+
+    def _paths(self) -> Tuple[Path, ...]:
+        # For compiled data the manifest carries the data version, so it stands in for the columns.
+        if self.compiled:
+            return (self.data_dir / MANIFEST,)
+        return tuple(self.data_dir / f"{name}.csv" for name in DATASETS)
+
+    @property
+    def cache_key(self) -> str:
+        key = str(self.data_dir.resolve())
+        return f"{key}#freight-flows" if self.stream_freight else key
 
     def load(self) -> DataBundle:
+        paths = self._paths()
+        if self.cache is None:
+            return self._read(version=_bundle_version(tuple(_file_hash(p) for p in paths)))
+
+        stats = tuple((st.st_size, st.st_mtime_ns) for st in (p.stat() for p in paths))
+        key = self.cache_key
+        entry = self.cache.get(key)
+        if entry is not None and entry.stats == stats:
+            self.cache.record(hit=True)
+            return entry.bundle
+
+        hashes = tuple(_file_hash(p) for p in paths)
+        if entry is not None and entry.hashes == hashes:
+            # Touched but unchanged: keep the parsed frames, refresh the stat signature.
+            self.cache.record(hit=True)
+            self.cache.put(key, _CacheEntry(stats, hashes, entry.bundle, entry.nbytes))
+            return entry.bundle
+
+        self.cache.record(hit=False)
+        bundle = self._read(version=_bundle_version(hashes))
+        self.cache.put(key, _CacheEntry(stats, hashes, bundle, bundle.nbytes()))
+        return bundle
+
+    def invalidate(self) -> None:
+        """Forget the cached bundle for this data directory so the next load re-parses it."""
+        if self.cache is not None:
+            self.cache.invalidate(self.cache_key)
+
+    def _read(self, version: str = "") -> DataBundle:
+        if self.compiled:
+            frames, manifest = read_columnar(self.data_dir)
+            if self.stream_freight and "tonne_km" not in frames["freight_shipments"]:
+                frames["freight_shipments"] = freight_flows(
+                    frames["freight_shipments"], frames["traffic_links"], self.freight_chunksize
+                )
+            return DataBundle(**{name: frames[name] for name in DATASETS}, version=manifest["data_version"])
+
         traffic_links = pd.read_csv(self.data_dir / "traffic_links.csv")
         passenger_demand = pd.read_csv(self.data_dir / "passenger_demand.csv")
-        freight_shipments = pd.read_csv(self.data_dir / "freight_shipments.csv")
+        if self.stream_freight:
+            freight_shipments = freight_flows(
+                self.data_dir / "freight_shipments.csv", traffic_links, self.freight_chunksize
+            )
+        else:
+            freight_shipments = pd.read_csv(self.data_dir / "freight_shipments.csv")
         opportunities = pd.read_csv(self.data_dir / "opportunities.csv")
 
         return DataBundle(
@@ -32,8 +213,15 @@ class DataAgent:
             passenger_demand=passenger_demand,
             freight_shipments=freight_shipments,
             opportunities=opportunities,
+            version=version,
         )
 
+    def compile(self, out_dir: str | Path) -> Dict[str, Any]:
+        """Convert this agent's datasets into the memory-mappable columnar format at ``out_dir``."""
+        bundle = self.load()
+        frames = {name: getattr(bundle, name) for name in DATASETS}
+        return write_columnar(frames, out_dir, data_version=bundle.version)
+
     def basic_stats(self, bundle: DataBundle) -> Dict[str, float]:
         return {
             "num_links": float(len(bundle.traffic_links)),
@@ -41,4 +229,3 @@ class DataAgent:
             "peak_hour_passenger_trips": float(bundle.passenger_demand["peak_hour_trips"].sum()),
             "daily_freight_tonnes": float(bundle.freight_shipments["tonnes"].sum()),
         }
-
@@ -1,12 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import TYPE_CHECKING, Dict
 
-import pandas as pd
+import numpy as np
 
 from transport_system.utils.math_models import emissions, freight_emissions
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 @dataclass
 class EmissionFactors:
@@ -14,6 +17,8 @@ class EmissionFactors:
     passenger_road_g_per_vkm: float = 180.0
     freight_road_g_per_tkm: float = 90.0
     freight_rail_g_per_tkm: float = 25.0
+    # Average haul used to turn shipped tonnes into tonne-km.
+    freight_avg_haul_km: float = 300.0
 
 
 class EmissionsAgent:
@@ -22,6 +27,24 @@ class EmissionsAgent:
     def __init__(self, factors: EmissionFactors | None = None) -> None:
         self.factors = factors or EmissionFactors()
 
+    def freight_tonne_km(self, freight_shipments: pd.DataFrame):
+        """Tonne-km of raw shipments (flat average haul) or of aggregated flows (network distances).
+
+        Flows from ``transport_system.utils.freight_stream`` carry ``tonne_km``; tonnes without a
+        known distance (``unpriced_tonnes``, or whole NaN groups in older flow tables) fall back to
+        the average haul. Factors may be arrays, so the haul term is left unreduced.
+        """
+        if "tonne_km" not in freight_shipments:
+            return float(freight_shipments["tonnes"].sum()) * self.factors.freight_avg_haul_km
+        tonne_km = np.asarray(freight_shipments["tonne_km"], dtype=np.float64)
+        if "unpriced_tonnes" in freight_shipments:
+            unpriced = float(np.asarray(freight_shipments["unpriced_tonnes"], dtype=np.float64).sum())
+            return float(tonne_km.sum()) + unpriced * self.factors.freight_avg_haul_km
+        unknown = np.isnan(tonne_km)
+        known_tkm = float(tonne_km[~unknown].sum())
+        unknown_tonnes = float(np.asarray(freight_shipments["tonnes"], dtype=np.float64)[unknown].sum())
+        return known_tkm + unknown_tonnes * self.factors.freight_avg_haul_km
+
     def passenger_emissions(self, passenger_demand: pd.DataFrame, avg_occupancy: float = 1.6) -> Dict[str, float]:
         # Approximate vehicle-km from trips and average trip length / occupancy
         total_trips = passenger_demand["peak_hour_trips"].sum()
@@ -38,13 +61,27 @@ class EmissionsAgent:
             "passenger_co2_kg": float(co2_kg),
         }
 
+    def passenger_emissions_batch(
+        self, passenger_demand: pd.DataFrame, n: int, avg_occupancy: float = 1.6
+    ) -> Dict[str, np.ndarray]:
+        # Levers do not move passenger activity; factors may be arrays, so broadcast to n scenarios.
+        total_trips = float(passenger_demand["peak_hour_trips"].sum())
+        avg_trip_km = float(passenger_demand["avg_trip_km"].mean())
+        vehicle_km = (total_trips * avg_trip_km) / max(avg_occupancy, 0.1)
+        co2_kg = vehicle_km * np.asarray(self.factors.passenger_road_g_per_vkm, dtype=np.float64) / 1000.0
+
+        return {
+            "passenger_vehicle_km": np.full(n, vehicle_km),
+            "passenger_co2_kg": np.broadcast_to(co2_kg, (n,)).copy(),
+        }
+
     def freight_emissions(
         self,
         freight_shipments: pd.DataFrame,
         road_share: float = 1.0,
     ) -> Dict[str, float]:
         # Split tonnage between road and rail
-        total_tonne_km = (freight_shipments["tonnes"] * 300.0).sum()  # assume average 300 km
+        total_tonne_km = self.freight_tonne_km(freight_shipments)
         road_tkm = total_tonne_km * road_share
         rail_tkm = total_tonne_km * (1.0 - road_share)
 
@@ -68,3 +105,21 @@ class EmissionsAgent:
             "freight_total_co2_kg": float(road_co2_kg + rail_co2_kg),
         }
 
+    def freight_emissions_batch(
+        self,
+        freight_shipments: pd.DataFrame,
+        road_share: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        # Vectorised freight_emissions over an array of road shares.
+        road_share = np.asarray(road_share, dtype=np.float64)
+        # Factors may be arrays (e.g. Monte Carlo samples), so keep the product unreduced.
+        total_tonne_km = self.freight_tonne_km(freight_shipments)
+        road_co2_kg = total_tonne_km * road_share * self.factors.freight_road_g_per_tkm / 1000.0
+        rail_co2_kg = total_tonne_km * (1.0 - road_share) * self.factors.freight_rail_g_per_tkm / 1000.0
+
+        return {
+            "freight_tonne_km": np.broadcast_to(total_tonne_km, road_co2_kg.shape).copy(),
+            "freight_road_co2_kg": road_co2_kg,
+            "freight_rail_co2_kg": rail_co2_kg,
+            "freight_total_co2_kg": road_co2_kg + rail_co2_kg,
+        }
@@ -2,15 +2,52 @@ from __future__ import annotations
 
 from typing import Dict
 
-from transport_system.config import IndiaDefaults
+import numpy as np
+
+from transport_system.config import ChargingSettings, FleetSettings, IndiaDefaults
+from transport_system.utils.charging import GridIntensity, effective_intensity, hourly_charging
+from transport_system.utils.fleet import FleetProjection, project_fleet
 from transport_system.utils.math_models import co2_from_energy
 
 
 class EnergySystemAgent:
     """Estimates energy use and CO₂ for ICE vs EV under different EV adoption rates."""
 
-    def __init__(self, defaults: IndiaDefaults | None = None) -> None:
+    def __init__(
+        self,
+        defaults: IndiaDefaults | None = None,
+        fleet: FleetSettings | None = None,
+        charging: ChargingSettings | None = None,
+        grid: GridIntensity | None = None,
+    ) -> None:
         self.defaults = defaults or IndiaDefaults()
+        self.fleet = fleet or FleetSettings()
+        self.charging = charging or ChargingSettings()
+        if self.charging.mode not in ("annual", "hourly"):
+            raise ValueError(f"unknown charging mode {self.charging.mode!r}; expected 'annual' or 'hourly'")
+        if self.charging.max_power_ratio < 1.0:
+            raise ValueError("max_power_ratio must be at least 1, or a day's flexible energy does not fit")
+        self._grid = grid
+        self._ev_intensity: float | None = None
+
+    @property
+    def grid(self) -> GridIntensity:
+        """Hourly grid intensity for the hourly mode (the illustrative default unless one was given)."""
+        if self._grid is None:
+            self._grid = GridIntensity.default()
+        return self._grid
+
+    def ev_grid_factor(self, grid_factor):
+        """CO₂ per kWh of EV charging on a grid with mean intensity ``grid_factor``.
+
+        In the annual mode that is the grid factor itself. In the hourly mode it is weighted by when
+        vehicles charge (computed once per agent, then a multiply, so sweeps stay vectorised).
+        """
+        if self.charging.mode == "annual":
+            return grid_factor
+        if self._ev_intensity is None:
+            self._ev_intensity = effective_intensity(self.charging, self.grid)
+        return grid_factor * self._ev_intensity
 
     def evaluate(
         self,
@@ -22,7 +59,7 @@ class EnergySystemAgent:
 
         # Simple energy intensities (kWh per vehicle-km)
         ice_kwh_per_vkm = (self.defaults.petrol_mj_per_vkm / self.defaults.mj_per_kwh)
-        ev_kwh_per_vkm = 0.18  # typical EV car consumption ~ 0.15–0.2 kWh/km
+        ev_kwh_per_vkm = self.defaults.ev_kwh_per_vkm
 
         ev_vkm = passenger_vehicle_km * ev_share
         ice_vkm = passenger_vehicle_km * (1.0 - ev_share)
@@ -30,8 +67,8 @@ class EnergySystemAgent:
         ice_energy_kwh = ice_vkm * ice_kwh_per_vkm
         ev_energy_kwh = ev_vkm * ev_kwh_per_vkm
 
-        ice_co2_kg = co2_from_energy(ice_energy_kwh, emission_factor=0.25)  # tank-to-wheel approx
-        ev_co2_kg = co2_from_energy(ev_energy_kwh, emission_factor=grid_factor)
+        ice_co2_kg = co2_from_energy(ice_energy_kwh, emission_factor=self.defaults.ice_co2_kg_per_kwh)
+        ev_co2_kg = co2_from_energy(ev_energy_kwh, emission_factor=self.ev_grid_factor(grid_factor))
 
         return {
             "ice_energy_kwh": float(ice_energy_kwh),
@@ -42,3 +79,75 @@ class EnergySystemAgent:
             "total_co2_kg": float(ice_co2_kg + ev_co2_kg),
         }
 
+    def evaluate_batch(
+        self,
+        passenger_vehicle_km: np.ndarray | float,
+        ev_share: np.ndarray,
+        grid_emission_factor_kg_per_kwh: np.ndarray | None = None,
+    ) -> Dict[str, np.ndarray]:
+        # Vectorised evaluate(); non-positive grid factors fall back to the default, as in evaluate().
+        # Defaults may themselves be arrays (e.g. Monte Carlo samples) and broadcast with the levers.
+        ev_share = np.asarray(ev_share, dtype=np.float64)
+        grid_factor = np.asarray(self.defaults.grid_emission_factor_kg_per_kwh, dtype=np.float64)
+        if grid_emission_factor_kg_per_kwh is not None:
+            given = np.asarray(grid_emission_factor_kg_per_kwh, dtype=np.float64)
+            grid_factor = np.where(given > 0, given, grid_factor)
+
+        ice_kwh_per_vkm = (self.defaults.petrol_mj_per_vkm / self.defaults.mj_per_kwh)
+        ev_kwh_per_vkm = self.defaults.ev_kwh_per_vkm
+
+        ice_energy_kwh = passenger_vehicle_km * (1.0 - ev_share) * ice_kwh_per_vkm
+        ev_energy_kwh = passenger_vehicle_km * ev_share * ev_kwh_per_vkm
+        ice_co2_kg = ice_energy_kwh * self.defaults.ice_co2_kg_per_kwh
+        ev_co2_kg = ev_energy_kwh * self.ev_grid_factor(grid_factor)
+
+        return {
+            "ice_energy_kwh": ice_energy_kwh,
+            "ev_energy_kwh": ev_energy_kwh,
+            "total_energy_kwh": ice_energy_kwh + ev_energy_kwh,
+            "ice_co2_kg": ice_co2_kg,
+            "ev_co2_kg": ev_co2_kg,
+            "total_co2_kg": ice_co2_kg + ev_co2_kg,
+        }
+
+    def project_fleet(
+        self,
+        ev_sales_share: np.ndarray,
+        grid_emission_factor_kg_per_kwh: np.ndarray | float | None = None,
+        passenger_vehicle_km: float | None = None,
+    ) -> FleetProjection:
+        """Multi-year pathways (``FleetSettings`` horizon) for EV sales-share trajectories.
+
+        ``ev_sales_share`` and the grid factor are per year, optionally per scenario (years x
+        scenarios); the grid factor defaults to today's, held constant. Unlike ``evaluate``, the EV
+        share of vehicle-km follows fleet turnover rather than the sales share. EV energy is priced
+        through ``ev_grid_factor``, as in ``evaluate``.
+        """
+        grid = self.defaults.grid_emission_factor_kg_per_kwh
+        if grid_emission_factor_kg_per_kwh is not None:
+            grid = grid_emission_factor_kg_per_kwh
+        grid = self.ev_grid_factor(np.asarray(grid, dtype=np.float64))
+        return project_fleet(self.fleet, self.defaults, ev_sales_share, grid, passenger_vehicle_km)
+
+    def evaluate_hourly(
+        self,
+        annual_ev_kwh: np.ndarray | float,
+        grid_emission_factor_kg_per_kwh: np.ndarray | float | None = None,
+        managed_share: np.ndarray | float | None = None,
+        base_load_kw: np.ndarray | None = None,
+        hourly: bool = False,
+    ) -> Dict[str, np.ndarray]:
+        """Hourly charging load, peak demand and average/marginal CO₂ per scenario over ``self.grid``.
+
+        See ``transport_system.utils.charging.hourly_charging``; the grid factor, when given, rescales
+        the hourly series to that mean.
+        """
+        return hourly_charging(
+            self.charging,
+            self.grid,
+            annual_ev_kwh,
+            grid_factor=grid_emission_factor_kg_per_kwh,
+            managed_share=managed_share,
+            base_load_kw=base_load_kw,
+            hourly=hourly,
+        )
@@ -1,9 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Mapping, Tuple
 
-import pandas as pd
+import numpy as np
+
+from transport_system.agents.emissions_agent import EmissionFactors
+from transport_system.config import FreightModeCosts, IndiaDefaults
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.transportation import TransportationSolution, TransportationSolver
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass
@@ -13,8 +21,35 @@ class FreightOutputs:
     empty_trip_reduction: float
 
 
+@dataclass
+class FreightFlowPlan:
+    flows: pd.DataFrame
+    totals: Dict[str, float]
+    # Transportation problems solved (more than one when a mode capacity binds).
+    solves: int
+
+
+MODES = ("road", "rail")
+
+
 class FreightOptimizationAgent:
-    """Applies simple freight decarbonization logic (Avoid–Shift–Improve for freight)."""
+    """Applies simple freight decarbonization logic (Avoid–Shift–Improve for freight).
+
+    ``freight_shipments`` may be the raw shipment log or the aggregated flow table produced by
+    ``transport_system.utils.freight_stream``; only the ``tonnes`` totals are read here.
+    """
+
+    def __init__(
+        self,
+        defaults: IndiaDefaults | None = None,
+        mode_costs: FreightModeCosts | None = None,
+        factors: EmissionFactors | None = None,
+    ) -> None:
+        self.defaults = defaults or IndiaDefaults()
+        self.mode_costs = mode_costs or FreightModeCosts()
+        self.factors = factors or EmissionFactors()
+        # Keeps the last optimal basis, so re-planning with changed costs starts next to the optimum.
+        self.flow_solver = TransportationSolver()
 
     def optimize(
         self,
@@ -23,7 +58,7 @@ class FreightOptimizationAgent:
         efficiency_gain: float = 0.0,
     ) -> Dict[str, float]:
         total_tonnes = freight_shipments["tonnes"].sum()
-        baseline_empty_trip_share = 0.25
+        baseline_empty_trip_share = self.defaults.freight_empty_trip_share
         improved_empty_trip_share = baseline_empty_trip_share * (1.0 - efficiency_gain)
 
         road_share = max(1.0 - shift_road_to_rail, 0.0)
@@ -36,3 +71,157 @@ class FreightOptimizationAgent:
             "freight_empty_trip_share": float(improved_empty_trip_share),
         }
 
+    def optimize_batch(
+        self,
+        freight_shipments: pd.DataFrame,
+        shift_road_to_rail: np.ndarray,
+        efficiency_gain: np.ndarray,
+    ) -> Dict[str, np.ndarray]:
+        shift_road_to_rail = np.asarray(shift_road_to_rail, dtype=np.float64)
+        efficiency_gain = np.asarray(efficiency_gain, dtype=np.float64)
+        total_tonnes = float(freight_shipments["tonnes"].sum())
+        baseline_empty_trip_share = self.defaults.freight_empty_trip_share
+
+        road_share = np.maximum(1.0 - shift_road_to_rail, 0.0)
+
+        return {
+            "freight_total_tonnes": np.full(road_share.shape, total_tonnes),
+            "freight_road_share": road_share,
+            "freight_rail_share": 1.0 - road_share,
+            "freight_empty_trip_share": baseline_empty_trip_share * (1.0 - efficiency_gain),
+        }
+
+    def mode_costs_per_tonne(self, distance_km: np.ndarray, objective: str = "cost") -> Tuple[np.ndarray, np.ndarray]:
+        """Road and rail cost per tonne over ``distance_km``: INR (plus the carbon charge) or kg CO2."""
+        road_co2 = self.factors.freight_road_g_per_tkm / 1000.0 * distance_km
+        rail_co2 = self.factors.freight_rail_g_per_tkm / 1000.0 * distance_km
+        if objective == "co2":
+            return road_co2, rail_co2
+        if objective != "cost":
+            raise ValueError(f"unknown objective {objective!r}; expected 'cost' or 'co2'")
+        c = self.mode_costs
+        road = c.road_inr_per_tkm * distance_km + c.carbon_inr_per_kg * road_co2
+        rail = c.rail_inr_per_tkm * distance_km + c.rail_terminal_inr_per_t + c.carbon_inr_per_kg * rail_co2
+        return road, rail
+
+    def plan_flows(
+        self,
+        freight_shipments: pd.DataFrame,
+        links: LinkTable | pd.DataFrame | None = None,
+        objective: str = "cost",
+        mode_capacity: Mapping[str, float] | None = None,
+        distance_km: np.ndarray | None = None,
+    ) -> FreightFlowPlan:
+        """Re-plan which origin serves which destination, and by which mode, at least cost or CO2.
+
+        Each origin supplies, and each destination demands, the tonnes shipped from or to it; the
+        flows between them are then an (uncapacitated) transportation problem over the cheaper mode
+        per pair. Distances are shortest paths over ``links`` or the given ``distance_km`` matrix
+        (origins x destinations, labels in sorted order); pairs without one use the average haul.
+
+        ``mode_capacity`` caps the tonnes per mode, e.g. ``{"rail": 500.0}``. A binding cap adds a
+        price per tonne to that mode, found by bisection over warm-started solves; the two plans
+        bracketing the cap are blended so it is met exactly, and the price is reported as
+        ``freight_capacity_price``.
+        """
+        origin = np.asarray(freight_shipments["origin"]).astype(str)
+        destination = np.asarray(freight_shipments["destination"]).astype(str)
+        tonnes = np.asarray(freight_shipments["tonnes"], dtype=np.float64)
+        origins, oi = np.unique(origin, return_inverse=True)
+        destinations, di = np.unique(destination, return_inverse=True)
+        supply = np.bincount(oi, tonnes, len(origins))
+        demand = np.bincount(di, tonnes, len(destinations))
+
+        if distance_km is None:
+            distance_km = np.full((len(origins), len(destinations)), np.nan)
+            if links is not None:
+                from transport_system.utils.freight_stream import network_distance_matrix
+
+                distance_km = network_distance_matrix(LinkTable.coerce(links), origins, destinations)
+        distance = np.where(np.isnan(distance_km), self.factors.freight_avg_haul_km, distance_km)
+        road, rail = self.mode_costs_per_tonne(distance, objective)
+
+        caps = {mode: float(cap) for mode, cap in (mode_capacity or {}).items()}
+        if set(caps) - set(MODES):
+            raise ValueError(f"mode_capacity keys must be among {MODES}")
+        total = float(supply.sum())
+        if len(caps) == len(MODES) and sum(caps.values()) < total:
+            raise ValueError(f"mode capacities ({sum(caps.values()):g} t) are below the {total:g} t to move")
+
+        def solve(mode: str | None, price: float) -> Tuple[float, TransportationSolution, np.ndarray]:
+            road_p = road + price if mode == "road" else road
+            rail_p = rail + price if mode == "rail" else rail
+            use_rail = rail_p < road_p
+            sol = self.flow_solver.solve(np.minimum(road_p, rail_p), supply, demand)
+            return 1.0, sol, use_rail
+
+        def moved(plan, mode: str) -> float:
+            _, sol, use_rail = plan
+            on_rail = use_rail[sol.rows, sol.cols]
+            return float(sol.flow[on_rail if mode == "rail" else ~on_rail].sum())
+
+        plans = [solve(None, 0.0)]
+        solves = 1
+        price = 0.0
+        # The modes share every tonne, so with feasible caps at most one of them binds.
+        binding = [(mode, cap) for mode, cap in caps.items() if moved(plans[0], mode) > cap * (1 + 1e-12)]
+        if binding:
+            mode, cap = binding[0]
+            own, other = (rail, road) if mode == "rail" else (road, rail)
+            lo, hi = 0.0, max(float((other - own).max()), 0.0) + 1.0
+            low, high = plans[0], solve(mode, hi)
+            solves += 1
+            while hi - lo > 1e-9 * hi:
+                mid = 0.5 * (lo + hi)
+                trial = solve(mode, mid)
+                solves += 1
+                if moved(trial, mode) > cap:
+                    lo, low = mid, trial
+                else:
+                    hi, high = mid, trial
+            t_low, t_high = moved(low, mode), moved(high, mode)
+            w = (cap - t_high) / (t_low - t_high)
+            plans = [(w,) + low[1:], (1.0 - w,) + high[1:]]
+            price = hi
+
+        flows = self._flow_table(plans, origins, destinations, distance)
+        t = flows["tonnes"].to_numpy()
+        on_rail = (flows["mode"] == "rail").to_numpy()
+        moved_t = max(float(t.sum()), 1e-12)
+        totals = {
+            "freight_total_tonnes": float(t.sum()),
+            "freight_tonne_km": float(flows["tonne_km"].sum()),
+            "freight_road_share": float(t[~on_rail].sum()) / moved_t,
+            "freight_rail_share": float(t[on_rail].sum()) / moved_t,
+            "freight_cost_inr": float(flows["cost_inr"].sum()),
+            "freight_total_co2_kg": float(flows["co2_kg"].sum()),
+            "freight_capacity_price": price,
+        }
+        return FreightFlowPlan(flows=flows, totals=totals, solves=solves)
+
+    def _flow_table(self, plans, origins: np.ndarray, destinations: np.ndarray, distance: np.ndarray) -> pd.DataFrame:
+        import pandas as pd
+
+        c = self.mode_costs
+        parts = [
+            pd.DataFrame({"o": sol.rows, "d": sol.cols, "rail": use_rail[sol.rows, sol.cols], "tonnes": w * sol.flow})
+            for w, sol, use_rail in plans
+        ]
+        flows = pd.concat(parts, ignore_index=True)
+        flows = flows[flows["tonnes"] > 0].groupby(["o", "d", "rail"], as_index=False)["tonnes"].sum()
+        o, d, rail, t = (flows[col].to_numpy() for col in ("o", "d", "rail", "tonnes"))
+        km = distance[o, d]
+        per_t_cost = np.where(rail, c.rail_inr_per_tkm * km + c.rail_terminal_inr_per_t, c.road_inr_per_tkm * km)
+        g_per_tkm = np.where(rail, self.factors.freight_rail_g_per_tkm, self.factors.freight_road_g_per_tkm)
+        return pd.DataFrame(
+            {
+                "origin": origins[o],
+                "destination": destinations[d],
+                "mode": np.where(rail, "rail", "road"),
+                "tonnes": t,
+                "distance_km": km,
+                "tonne_km": t * km,
+                "cost_inr": t * per_t_cost,
+                "co2_kg": t * km * g_per_tkm / 1000.0,
+            }
+        )
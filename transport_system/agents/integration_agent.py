@@ -1,78 +1,119 @@
 from __future__ import annotations
 
+import hashlib
 from typing import Dict, List
 
+import numpy as np
 import pandas as pd
 
-from transport_system.agents.data_agent import DataAgent
+from transport_system.agents.data_agent import DATASETS, DataAgent
 from transport_system.agents.emissions_agent import EmissionsAgent
 from transport_system.agents.energy_agent import EnergySystemAgent
 from transport_system.agents.freight_agent import FreightOptimizationAgent
+from transport_system.agents.pipeline import _LEVERS_FOR_POLICY, ScenarioPipeline, _policy
 from transport_system.agents.policy_agent import PolicyAgent
 from transport_system.agents.sustainability_agent import SustainabilityAgent
 from transport_system.agents.transport_agent import TransportSimulationAgent
-from transport_system.schemas import RunResult, Scenario
+from transport_system.core import evaluate_levers
+from transport_system.profiling import DEFAULT_REGISTRY, MetricsRegistry, Profiler
+from transport_system.schemas import LEVERS, KpiRecord, RunResult, Scenario, ScenarioBatch, ScenarioResult, kpi_frame
+from transport_system.utils.result_store import MODEL_VERSION, ResultStore, canonical_levers, result_key
 
 
 class IntegrationAgent:
-    """Coordinator that runs the full multi-agent pipeline for a given scenario."""
-
-    def __init__(self, data_agent: DataAgent | None = None) -> None:
+    """Coordinator that runs the full multi-agent pipeline for a given scenario.
+
+    With a ``store``, ``run_scenario`` and ``run_batch`` look results up in the persistent
+    ``ResultStore`` first and write back what they compute, so repeated scenarios are served from
+    disk across restarts. Entries are keyed by ``config_version()`` and the data version.
+    """
+
+    def __init__(
+        self,
+        data_agent: DataAgent | None = None,
+        profiling: bool = False,
+        trace_memory: bool = False,
+        metrics: MetricsRegistry = DEFAULT_REGISTRY,
+        store: ResultStore | None = None,
+    ) -> None:
         self.data_agent = data_agent or DataAgent()
+        self.store = store
+        # Opt-in instrumentation: with profiling off no Profiler is created and runs are untouched.
+        self.profiling = profiling
+        self.trace_memory = trace_memory
+        self.metrics = metrics
         self.emissions_agent = EmissionsAgent()
         self.transport_agent = TransportSimulationAgent()
         self.freight_agent = FreightOptimizationAgent()
         self.energy_agent = EnergySystemAgent()
         self.sustainability_agent = SustainabilityAgent()
         self.policy_agent = PolicyAgent()
+        self.pipeline = ScenarioPipeline()
 
-    def run_scenario(self, scenario: Scenario) -> RunResult:
-        bundle = self.data_agent.load()
-
-        # Transport simulation with ASI levers
-        t_out = self.transport_agent.simulate(
-            traffic_links=bundle.traffic_links,
-            passenger_demand=bundle.passenger_demand,
-            avoid_factor=scenario.avoid_demand_reduction,
-            shift_to_public=scenario.shift_to_public_transport,
-            improve_efficiency_factor=scenario.improve_efficiency,
+    def config_version(self) -> str:
+        """Hash of everything besides levers and data that determines KPIs: the model version, each
+        pipeline stage's config token and how freight is loaded."""
+        tokens = (MODEL_VERSION, self.data_agent.stream_freight) + tuple(
+            stage.config(self) if stage.config else None for stage in self.pipeline.stages
         )
-
-        # Freight optimization and related emissions
-        freight_out = self.freight_agent.optimize(
-            freight_shipments=bundle.freight_shipments,
-            shift_road_to_rail=scenario.freight_shift_road_to_rail,
-            efficiency_gain=scenario.improve_efficiency,
-        )
-
-        freight_emis = self.emissions_agent.freight_emissions(
-            freight_shipments=bundle.freight_shipments,
-            road_share=freight_out["freight_road_share"],
-        )
-
-        # Passenger emissions and energy system interaction
-        pass_emis = self.emissions_agent.passenger_emissions(bundle.passenger_demand)
-
-        energy_out = self.energy_agent.evaluate(
-            passenger_vehicle_km=pass_emis["passenger_vehicle_km"],
-            ev_share=scenario.ev_adoption,
-            grid_emission_factor_kg_per_kwh=scenario.grid_emission_factor_kg_per_kwh,
-        )
-
-        total_co2_kg = (
-            pass_emis["passenger_co2_kg"]
-            + freight_emis["freight_total_co2_kg"]
-            + energy_out["total_co2_kg"]
-        )
-
-        sust = self.sustainability_agent.compute(
-            total_co2_kg=total_co2_kg,
-            congestion_index=t_out["congestion_index"],
-            avg_travel_time_min=t_out["avg_travel_time_min"],
-            opportunities=bundle.opportunities,
-        )
-
-        policy = self.policy_agent.recommend(scenario=scenario, kpis={})
+        return hashlib.blake2b(repr(tokens).encode(), digest_size=16).hexdigest()
+
+    def _profiler(self, profile: bool | None) -> Profiler | None:
+        enabled = self.profiling if profile is None else profile
+        return Profiler(self.trace_memory) if enabled else None
+
+    def _observe(self, profiler: Profiler) -> dict:
+        profile = profiler.to_dict()
+        self.metrics.observe(profile)
+        return profile
+
+    def run_scenario(
+        self, scenario: Scenario, profile: bool | None = None, compact: bool = False
+    ) -> RunResult | ScenarioResult:
+        """Run every agent for ``scenario``; ``profile`` overrides the agent's ``profiling`` setting.
+
+        ``compact`` returns a ``ScenarioResult`` (array-backed KPIs, tables built on access) instead
+        of a ``RunResult``; use it when collecting many results.
+        """
+        profiler = self._profiler(profile)
+        if profiler is None:
+            bundle = self.data_agent.load()
+        else:
+            with profiler.stage("data_load") as record:
+                bundle = self.data_agent.load()
+            record.input_rows = sum(len(getattr(bundle, name)) for name in DATASETS)
+
+        # Hand-assembled bundles have no version to key on, so they bypass the store.
+        key = None
+        if self.store is not None and bundle.version:
+            config_version = self.config_version()
+            key = result_key(canonical_levers(scenario), config_version, bundle.version)
+            if profiler is None:
+                stored = self.store.get(key)
+            else:
+                with profiler.stage("result_store"):
+                    stored = self.store.get(key)
+            if stored is not None:
+                policy = _policy(self, bundle, {n: getattr(scenario, n) for n in _LEVERS_FOR_POLICY}, {})
+                result = ScenarioResult(
+                    scenario=scenario,
+                    kpis=stored,
+                    policy=policy,
+                    bundle=bundle,
+                    profile=None if profiler is None else self._observe(profiler),
+                )
+                return result if compact else result.to_run_result()
+
+        # Agent calls run as a memoised DAG: only stages downstream of changed inputs re-execute.
+        out = self.pipeline.run(self, bundle, scenario, profiler)
+        t_out = out["transport"]
+        freight_out = out["freight"]
+        freight_emis = out["freight_emissions"]
+        pass_emis = out["passenger_emissions"]
+        energy_out = out["energy"]
+        sust = {k: v for k, v in out["sustainability"].items() if k != "system_total_co2_kg"}
+        total_co2_kg = out["sustainability"]["system_total_co2_kg"]
+        policy = out["policy"]
 
         kpis: Dict[str, float] = {
             # Transport
@@ -88,26 +129,99 @@ class IntegrationAgent:
             **sust,
             # Totals
             "system_total_co2_kg": float(total_co2_kg),
+            # Daily totals (time-of-day mode only)
+            **out["daily"],
         }
 
-        tables: Dict[str, pd.DataFrame] = {
-            "traffic_links": bundle.traffic_links,
-            "passenger_demand": bundle.passenger_demand,
-            "freight_shipments": bundle.freight_shipments,
-            "opportunities": bundle.opportunities,
-            "scenario_summary": pd.DataFrame([kpis]),
-        }
-
-        # Attach policy text as a small single-row table to surface in dashboards.
-        tables["policy"] = pd.DataFrame([policy])
-
-        return RunResult(scenario=scenario, kpis=kpis, tables=tables)
+        record = KpiRecord.from_dict(kpis)
+        if key is not None:
+            self.store.put(key, record, bundle.version, config_version)
+        result = ScenarioResult(
+            scenario=scenario,
+            kpis=record,
+            policy=policy,
+            bundle=bundle,
+            profile=None if profiler is None else self._observe(profiler),
+        )
+        if compact:
+            return result
+        return RunResult(scenario=scenario, kpis=kpis, tables=result.tables, profile=result.profile)
+
+    def run_batch(self, batch: ScenarioBatch) -> pd.DataFrame:
+        """Evaluate every scenario of ``batch`` in one broadcasted pass; returns one KPI row per scenario."""
+        profiler = self._profiler(None)
+        if profiler is None:
+            return pd.DataFrame({"scenario": batch.names, **self._stored_levers(batch.levers())})
+        # The batch path is one fused pass, so it is recorded as a single stage.
+        with profiler.stage("run_batch", len(batch)):
+            table = pd.DataFrame({"scenario": batch.names, **self._stored_levers(batch.levers())})
+        self._observe(profiler)
+        return table
+
+    def _stored_levers(self, levers: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """``evaluate_levers`` through the result store: one bulk lookup, the misses evaluated
+        together and written back in one transaction."""
+        version = self.data_agent.load().version
+        if self.store is None or not version:
+            return self.evaluate_levers(levers)
+        config_version = self.config_version()
+        rows = np.column_stack([np.asarray(levers[name], dtype=np.float64) for name in LEVERS])
+        keys = [result_key(row, config_version, version) for row in rows]
+        stored = self.store.get_many(keys)
+        missing = np.array([i for i, r in enumerate(stored) if r is None], dtype=np.int64)
+        if len(missing) == len(keys):
+            computed = self.evaluate_levers(levers)
+        elif len(missing):
+            computed = self.evaluate_levers({name: rows[missing, j] for j, name in enumerate(LEVERS)})
+        else:
+            computed = None
+
+        if computed is not None:
+            names = tuple(computed)
+            values = np.column_stack([np.broadcast_to(computed[name], len(missing)) for name in names])
+            self.store.put_many(
+                ((keys[i], KpiRecord(names, v)) for i, v in zip(missing.tolist(), values)), version, config_version
+            )
+            if len(missing) == len(keys):
+                return computed
+        else:
+            names = stored[0].names
+
+        table = np.empty((len(keys), len(names)))
+        hits = [i for i, r in enumerate(stored) if r is not None]
+        table[hits] = np.vstack([stored[i].values for i in hits])
+        if len(missing):
+            table[missing] = values
+        return {name: table[:, j] for j, name in enumerate(names)}
+
+    def evaluate_levers(
+        self,
+        levers: Dict[str, np.ndarray],
+        transport_out: Dict[str, np.ndarray] | None = None,
+    ) -> Dict[str, np.ndarray]:
+        """Core of ``run_batch``: lever arrays in, KPI columns out.
+
+        Agent configs (emission factors, defaults, weights) may hold arrays of the same length as
+        the levers; they broadcast per scenario, which is how the Monte Carlo mode samples them.
+        ``transport_out`` lets callers that already simulated the transport levers (the costly,
+        links-sized part) skip re-running it.
+        """
+        bundle = self.data_agent.load()
+        social_score = self.sustainability_agent.social_score(bundle.opportunities, bundle.link_table)
+        return evaluate_levers(
+            self,
+            bundle.link_table,
+            bundle.passenger_demand,
+            bundle.freight_shipments,
+            social_score,
+            levers,
+            transport_out,
+        )
 
     def compare_scenarios(self, scenarios: List[Scenario]) -> pd.DataFrame:
-        rows = []
-        for sc in scenarios:
-            res = self.run_scenario(sc)
-            row = {"scenario": sc.name} | res.kpis
-            rows.append(row)
-        return pd.DataFrame(rows)
+        # The closed-form uniform model can evaluate the whole list in one pass.
+        if self.transport_agent.settings.mode == "uniform":
+            return self.run_batch(ScenarioBatch.from_scenarios(scenarios))
 
+        records = [self.run_scenario(sc, compact=True).kpis for sc in scenarios]
+        return kpi_frame(records, scenario=[sc.name for sc in scenarios])
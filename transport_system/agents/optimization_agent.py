@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.schemas import LEVERS, Scenario, lever_bounds
+from transport_system.utils.pareto import ParetoFrontier
+
+# Direction of the built-in objectives; any other KPI needs an explicit ``sense``.
+OBJECTIVES = {"sustainability_index": "max", "system_total_co2_kg": "min"}
+
+# Default trade-off for ``pareto``; "lever_cost" is the spend on lever moves, not a KPI.
+TRADE_OFF = (("system_total_co2_kg", "min"), ("avg_travel_time_min", "min"), ("lever_cost", "min"))
+
+# Levers a policy can move; the grid factor is an exogenous assumption and stays fixed by default.
+POLICY_LEVERS = tuple(name for name in LEVERS if name != "grid_emission_factor_kg_per_kwh")
+
+
+@dataclass(frozen=True)
+class LeverCost:
+    """Cost of moving one lever away from its value in the base scenario.
+
+    Spend is ``per_unit * |lever - base|``; ``budget`` caps the spend on this lever alone.
+    """
+
+    per_unit: float
+    budget: float = float("inf")
+
+
+@dataclass
+class OptimizationResult:
+    scenario: Scenario
+    kpis: Dict[str, float]
+    objective: float
+    cost: float
+    feasible: bool
+    evaluations: int
+    cache_hits: int
+    # Best objective after each generation.
+    history: List[float] = field(default_factory=list)
+
+
+def _search_space(
+    base: Scenario,
+    levers: Sequence[str],
+    bounds: Dict[str, Tuple[float, float]] | None,
+    costs: Dict[str, LeverCost] | None,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Base lever vector, search box and per-unit lever costs, in ``LEVERS`` order."""
+    unknown = (set(levers) | set(bounds or {}) | set(costs or {})) - set(LEVERS)
+    if unknown:
+        raise ValueError(f"Unknown levers: {sorted(unknown)}")
+
+    x0 = np.array([getattr(base, name) for name in LEVERS], dtype=np.float64)
+    lo = x0.copy()
+    hi = x0.copy()
+    per_unit = np.zeros(len(LEVERS))
+    scenario_bounds = lever_bounds()
+    for j, name in enumerate(LEVERS):
+        if name not in levers:
+            continue
+        lo[j], hi[j] = scenario_bounds[name]
+        if bounds and name in bounds:
+            lo[j], hi[j] = max(lo[j], bounds[name][0]), min(hi[j], bounds[name][1])
+        cost = (costs or {}).get(name)
+        if cost is not None:
+            per_unit[j] = cost.per_unit
+            # A per-lever budget is a box around the base value.
+            if cost.per_unit > 0 and np.isfinite(cost.budget):
+                reach = cost.budget / cost.per_unit
+                lo[j], hi[j] = max(lo[j], x0[j] - reach), min(hi[j], x0[j] + reach)
+        if lo[j] > hi[j]:
+            raise ValueError(f"Empty search range for {name}: [{lo[j]}, {hi[j]}]")
+    return x0, lo, hi, per_unit
+
+
+class OptimizationAgent:
+    """Searches lever space for the scenario that best meets one KPI objective under cost budgets.
+
+    Candidates are scored a generation at a time through ``IntegrationAgent.evaluate_levers``
+    (differential evolution, rand/1/bin), so each generation is one vectorised pass. The model has
+    kinks (clipping, shares, maxima), so a population method is used rather than gradients.
+    Constraint handling follows Deb's rules: feasible beats infeasible, and infeasible candidates
+    are ranked by how far they overspend. Scored lever vectors are kept in an LRU keyed on the data
+    version, so repeated or overlapping searches reuse earlier evaluations.
+    """
+
+    def __init__(self, integration_agent: IntegrationAgent | None = None, cache_size: int = 200_000) -> None:
+        self.integration_agent = integration_agent or IntegrationAgent()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, np.ndarray]" = OrderedDict()
+        self._kpi_names: Tuple[str, ...] = ()
+        self._cache_version = ""
+
+    def evaluate(self, levers: np.ndarray) -> Tuple[Dict[str, np.ndarray], int]:
+        """KPI columns for an (N, len(LEVERS)) array of lever values, plus the number of cache hits."""
+        version = self.integration_agent.data_agent.load().version
+        if version != self._cache_version:
+            self._cache.clear()
+            self._cache_version = version
+
+        keys = [tuple(row) for row in np.round(levers, 9).tolist()]
+        rows: List[np.ndarray | None] = [self._cache.get(k) for k in keys]
+        missing = {}
+        for i, (key, row) in enumerate(zip(keys, rows)):
+            if row is None:
+                missing.setdefault(key, []).append(i)
+            else:
+                self._cache.move_to_end(key)
+        hits = len(keys) - sum(len(v) for v in missing.values())
+
+        if missing:
+            todo = np.array(list(missing), dtype=np.float64)
+            kpis = self._evaluate_uncached(todo)
+            self._kpi_names = tuple(kpis)
+            table = np.column_stack([np.broadcast_to(np.asarray(kpis[k], dtype=np.float64), len(todo)) for k in kpis])
+            for key, values in zip(missing, table):
+                for i in missing[key]:
+                    rows[i] = values
+                self._cache[key] = values
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+        table = np.vstack(rows) if rows else np.empty((0, len(self._kpi_names)))
+        return {name: table[:, j] for j, name in enumerate(self._kpi_names)}, hits
+
+    def _evaluate_uncached(self, levers: np.ndarray) -> Dict[str, np.ndarray]:
+        agent = self.integration_agent
+        columns = {name: levers[:, j] for j, name in enumerate(LEVERS)}
+        if agent.transport_agent.settings.mode == "uniform":
+            return agent.evaluate_levers(columns)
+        # Routed assignment has no batch form; fall back to the memoised per-scenario pipeline.
+        runs = [
+            agent.run_scenario(Scenario(**{name: float(v) for name, v in zip(LEVERS, row)}), compact=True).kpis
+            for row in levers
+        ]
+        values = np.vstack([r.values for r in runs])
+        return {name: values[:, j] for j, name in enumerate(runs[0].names)}
+
+    def optimize(
+        self,
+        base: Scenario | None = None,
+        objective: str = "sustainability_index",
+        sense: str | None = None,
+        levers: Sequence[str] = POLICY_LEVERS,
+        bounds: Dict[str, Tuple[float, float]] | None = None,
+        costs: Dict[str, LeverCost] | None = None,
+        budget: float = float("inf"),
+        population: int = 64,
+        max_evaluations: int = 4_000,
+        mutation: float = 0.6,
+        crossover: float = 0.8,
+        seed: int | None = 0,
+        tol: float = 1e-9,
+        patience: int = 15,
+    ) -> OptimizationResult:
+        """Best scenario found for ``objective`` ("max"/"min" per ``sense``).
+
+        Only ``levers`` are searched; the rest keep their values in ``base``. ``bounds`` narrows the
+        ``Scenario`` field bounds, ``costs`` prices lever moves from ``base`` (levers without a cost
+        are free) and ``budget`` caps the total spend. Stops after ``max_evaluations`` candidates or
+        ``patience`` generations without an improvement larger than ``tol``.
+        """
+        base = base or Scenario()
+        sense = sense or OBJECTIVES.get(objective)
+        if sense not in ("max", "min"):
+            raise ValueError(f"Pass sense='max' or 'min' for objective {objective!r}")
+        x0, lo, hi, per_unit = _search_space(base, levers, bounds, costs)
+        free = np.flatnonzero(hi > lo)
+        sign = 1.0 if sense == "max" else -1.0
+
+        rng = np.random.default_rng(seed)
+        evaluations = hits = 0
+
+        def score(x: np.ndarray):
+            nonlocal evaluations, hits
+            kpis, h = self.evaluate(x)
+            evaluations += len(x)
+            hits += h
+            spend = np.abs(x - x0) @ per_unit
+            return sign * kpis[objective], spend, np.maximum(spend - budget, 0.0)
+
+        def better(fa, va, fb, vb):
+            # Deb's rules: lower violation wins; between equally (in)feasible candidates, the objective.
+            return (va < vb) | ((va == vb) & (fa > fb))
+
+        n_pop = max(population, 4)
+        pop = np.tile(x0, (n_pop, 1))
+        pop[1:, free] = rng.uniform(lo[free], hi[free], (n_pop - 1, free.size))
+        fit, spend, viol = score(pop)
+        history: List[float] = []
+        stale = 0
+        best_f = -np.inf
+
+        while free.size and evaluations + n_pop <= max_evaluations and stale < patience:
+            # rand/1 mutation with three distinct partners per member, then binomial crossover.
+            idx = np.argsort(rng.random((n_pop, n_pop - 1)), axis=1)[:, :3]
+            idx += idx >= np.arange(n_pop)[:, None]
+            a, b, c = pop[idx[:, 0]], pop[idx[:, 1]], pop[idx[:, 2]]
+            mutant = np.clip(a + mutation * (b - c), lo, hi)
+            cross = rng.random(pop.shape) < crossover
+            cross[np.arange(n_pop), rng.choice(free, n_pop)] = True
+            # Fixed levers have lo == hi, so the clipped mutant already holds their base value.
+            trial = np.where(cross, mutant, pop)
+
+            t_fit, t_spend, t_viol = score(trial)
+            win = better(t_fit, t_viol, fit, viol)
+            pop[win], fit[win], spend[win], viol[win] = trial[win], t_fit[win], t_spend[win], t_viol[win]
+
+            feasible = viol == 0
+            gen_best = fit[feasible].max() if feasible.any() else -np.inf
+            stale = stale + 1 if gen_best <= best_f + tol else 0
+            best_f = max(best_f, gen_best)
+            history.append(float(sign * best_f))
+
+        order = np.lexsort((-fit, viol))
+        best = pop[order[0]]
+        kpis, _ = self.evaluate(best[None, :])
+        scenario = base.model_copy(
+            update={"name": f"optimized-{objective}", **{name: float(v) for name, v in zip(LEVERS, best)}}
+        )
+        return OptimizationResult(
+            scenario=scenario,
+            kpis={k: float(v[0]) for k, v in kpis.items()},
+            objective=float(sign * fit[order[0]]),
+            cost=float(spend[order[0]]),
+            feasible=bool(viol[order[0]] == 0),
+            evaluations=evaluations,
+            cache_hits=hits,
+            history=history,
+        )
+
+    def pareto(
+        self,
+        base: Scenario | None = None,
+        objectives: Sequence[Tuple[str, str]] = TRADE_OFF,
+        levers: Sequence[str] = POLICY_LEVERS,
+        bounds: Dict[str, Tuple[float, float]] | None = None,
+        costs: Dict[str, LeverCost] | None = None,
+        budget: float = float("inf"),
+        n_evaluations: int = 100_000,
+        block: int = 20_000,
+        refine: float = 0.5,
+        step: float = 0.05,
+        seed: int | None = 0,
+    ) -> pd.DataFrame:
+        """Non-dominated scenarios for several (KPI, "min"/"max") objectives, as a columnar table.
+
+        The first block samples the search box uniformly; after that a ``refine`` share of each
+        block perturbs random frontier members by ``step`` of each lever's range, densifying the
+        front. Every block streams into a ``ParetoFrontier``, so ``n_evaluations`` can run into the
+        millions. Without ``costs`` every searched lever costs 1 per unit; candidates over
+        ``budget`` are discarded. Blocks go straight to ``evaluate_levers`` rather than the
+        optimizer's LRU, whose per-row keys would dominate at this volume.
+
+        Returns one row per frontier scenario: the ``LEVERS`` values, then each objective.
+        """
+        base = base or Scenario()
+        if costs is None:
+            costs = {name: LeverCost(1.0) for name in levers}
+        for name, sense in objectives:
+            if sense not in ("max", "min"):
+                raise ValueError(f"Objective {name!r} needs sense 'max' or 'min', got {sense!r}")
+        x0, lo, hi, per_unit = _search_space(base, levers, bounds, costs)
+        free = np.flatnonzero(hi > lo)
+        signs = {name: 1.0 if sense == "min" else -1.0 for name, sense in objectives}
+        frontier = ParetoFrontier([name for name, _ in objectives], LEVERS)
+        rng = np.random.default_rng(seed)
+
+        done = 0
+        while done < n_evaluations:
+            n = min(block, n_evaluations - done)
+            x = np.tile(x0, (n, 1))
+            x[:, free] = rng.uniform(lo[free], hi[free], (n, free.size))
+            n_local = int(n * refine) if len(frontier) else 0
+            if n_local:
+                parents = frontier.data[rng.integers(0, len(frontier), n_local)]
+                jitter = rng.normal(0.0, step, (n_local, free.size)) * (hi[free] - lo[free])
+                x[:n_local, free] = np.clip(parents[:, free] + jitter, lo[free], hi[free])
+            done += n
+
+            spend = np.abs(x - x0) @ per_unit
+            within = spend <= budget
+            x, spend = x[within], spend[within]
+            if not len(x):
+                continue
+            kpis = self._evaluate_uncached(x)
+            kpis["lever_cost"] = spend
+            values = np.column_stack(
+                [np.broadcast_to(np.asarray(kpis[name], dtype=np.float64), len(x)) * signs[name] for name, _ in objectives]
+            )
+            frontier.add(values, x)
+
+        table = frontier.to_frame(signs)
+        table.attrs["evaluations"] = done
+        return table
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import astuple, dataclass
+from typing import TYPE_CHECKING, Any, Callable, Dict, Hashable, Tuple
+
+from transport_system.agents.data_agent import DataBundle
+from transport_system.profiling import Profiler
+from transport_system.schemas import Scenario
+from transport_system.utils.time_of_day import daily_totals
+
+if TYPE_CHECKING:
+    from transport_system.agents.integration_agent import IntegrationAgent
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One node of the scenario DAG.
+
+    ``params`` are the ``Scenario`` fields the stage reads and ``deps`` the upstream stages whose
+    outputs it consumes; ``config`` returns a hashable token of the agent settings it depends on.
+    A stage re-executes only when one of these changes (or the data version does). ``inputs``
+    names the bundle tables it reads, for the input sizes in run profiles.
+    """
+
+    name: str
+    params: Tuple[str, ...]
+    deps: Tuple[str, ...]
+    fn: Callable[..., Dict[str, Any]]
+    config: Callable[["IntegrationAgent"], Hashable] | None = None
+    uses_data: bool = True
+    inputs: Tuple[str, ...] = ()
+
+
+def _transport(agent, bundle, p, deps):
+    return agent.transport_agent.simulate(
+        traffic_links=bundle.link_table,
+        passenger_demand=bundle.passenger_demand,
+        avoid_factor=p["avoid_demand_reduction"],
+        shift_to_public=p["shift_to_public_transport"],
+        improve_efficiency_factor=p["improve_efficiency"],
+    )
+
+
+def _freight(agent, bundle, p, deps):
+    return agent.freight_agent.optimize(
+        freight_shipments=bundle.freight_shipments,
+        shift_road_to_rail=p["freight_shift_road_to_rail"],
+        efficiency_gain=p["improve_efficiency"],
+    )
+
+
+def _freight_emissions(agent, bundle, p, deps):
+    return agent.emissions_agent.freight_emissions(
+        freight_shipments=bundle.freight_shipments,
+        road_share=deps["freight"]["freight_road_share"],
+    )
+
+
+def _passenger_emissions(agent, bundle, p, deps):
+    return agent.emissions_agent.passenger_emissions(bundle.passenger_demand)
+
+
+def _energy(agent, bundle, p, deps):
+    return agent.energy_agent.evaluate(
+        passenger_vehicle_km=deps["passenger_emissions"]["passenger_vehicle_km"],
+        ev_share=p["ev_adoption"],
+        grid_emission_factor_kg_per_kwh=p["grid_emission_factor_kg_per_kwh"],
+    )
+
+
+def _sustainability(agent, bundle, p, deps):
+    total_co2_kg = (
+        deps["passenger_emissions"]["passenger_co2_kg"]
+        + deps["freight_emissions"]["freight_total_co2_kg"]
+        + deps["energy"]["total_co2_kg"]
+    )
+    sust = agent.sustainability_agent.compute(
+        total_co2_kg=total_co2_kg,
+        congestion_index=deps["transport"]["congestion_index"],
+        avg_travel_time_min=deps["transport"]["avg_travel_time_min"],
+        opportunities=bundle.opportunities,
+        traffic_links=bundle.link_table,
+    )
+    return {**sust, "system_total_co2_kg": float(total_co2_kg)}
+
+
+def _daily(agent, bundle, p, deps):
+    transport = deps["transport"]
+    if "daily_demand_factor" not in transport:
+        return {}
+    totals = daily_totals(
+        transport["daily_demand_factor"],
+        deps["passenger_emissions"]["passenger_co2_kg"],
+        deps["energy"]["total_energy_kwh"],
+        deps["energy"]["total_co2_kg"],
+        deps["freight_emissions"]["freight_total_co2_kg"],
+    )
+    return {k: float(v) for k, v in totals.items()}
+
+
+def _policy(agent, bundle, p, deps):
+    return agent.policy_agent.recommend(scenario=Scenario(**p), kpis={})
+
+
+# Config tokens: module-level (not lambdas) so pipelines pickle with their agent.
+def _transport_config(agent):
+    return agent.transport_agent.settings, agent.transport_agent.time_of_day
+
+
+def _freight_config(agent):
+    return agent.freight_agent.defaults
+
+
+def _emissions_config(agent):
+    return astuple(agent.emissions_agent.factors)
+
+
+def _energy_config(agent):
+    energy = agent.energy_agent
+    if energy.charging.mode == "annual":
+        return energy.defaults
+    return energy.defaults, energy.charging, energy.grid.version
+
+
+def _sustainability_config(agent):
+    return agent.sustainability_agent.weights, agent.sustainability_agent.access
+
+
+_LEVERS_FOR_POLICY = (
+    "avoid_demand_reduction",
+    "shift_to_public_transport",
+    "improve_efficiency",
+    "ev_adoption",
+    "freight_shift_road_to_rail",
+)
+
+# Topologically ordered.
+STAGES: Tuple[Stage, ...] = (
+    Stage(
+        "transport",
+        ("avoid_demand_reduction", "shift_to_public_transport", "improve_efficiency"),
+        (),
+        _transport,
+        config=_transport_config,
+        inputs=("traffic_links", "passenger_demand"),
+    ),
+    Stage(
+        "freight",
+        ("freight_shift_road_to_rail", "improve_efficiency"),
+        (),
+        _freight,
+        config=_freight_config,
+        inputs=("freight_shipments",),
+    ),
+    Stage(
+        "freight_emissions",
+        (),
+        ("freight",),
+        _freight_emissions,
+        config=_emissions_config,
+        inputs=("freight_shipments",),
+    ),
+    Stage(
+        "passenger_emissions",
+        (),
+        (),
+        _passenger_emissions,
+        config=_emissions_config,
+        inputs=("passenger_demand",),
+    ),
+    Stage(
+        "energy",
+        ("ev_adoption", "grid_emission_factor_kg_per_kwh"),
+        ("passenger_emissions",),
+        _energy,
+        config=_energy_config,
+        uses_data=False,
+    ),
+    Stage(
+        "sustainability",
+        (),
+        ("transport", "passenger_emissions", "freight_emissions", "energy"),
+        _sustainability,
+        config=_sustainability_config,
+        inputs=("opportunities", "traffic_links"),
+    ),
+    Stage(
+        "daily",
+        (),
+        ("transport", "passenger_emissions", "freight_emissions", "energy"),
+        _daily,
+        uses_data=False,
+    ),
+    Stage("policy", _LEVERS_FOR_POLICY, (), _policy, uses_data=False),
+)
+
+
+def _input_rows(bundle: DataBundle, stage: Stage) -> int:
+    return sum(len(getattr(bundle, name)) for name in stage.inputs)
+
+
+class ScenarioPipeline:
+    """Memoised DAG of the per-scenario agent calls behind ``IntegrationAgent.run_scenario``.
+
+    Each stage output is cached under a key built from its scenario inputs, agent config, the data
+    version and the keys of its upstream stages, so moving one lever only re-runs the stages
+    downstream of it (e.g. the grid factor re-runs ``energy`` and ``sustainability`` only).
+    """
+
+    def __init__(self, stages: Tuple[Stage, ...] = STAGES, max_entries: int = 256) -> None:
+        self.stages = stages
+        self.max_entries = max_entries
+        self._memo: Dict[str, "OrderedDict[Hashable, Dict[str, Any]]"] = {s.name: OrderedDict() for s in stages}
+        self._counts: Dict[str, Dict[str, int]] = {s.name: {"hits": 0, "misses": 0} for s in stages}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Ship the definition, not the cache or the lock, when an agent is pickled to a worker.
+        return {"stages": self.stages, "max_entries": self.max_entries}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    def run(
+        self,
+        agent: "IntegrationAgent",
+        bundle: DataBundle,
+        scenario: Scenario,
+        profiler: Profiler | None = None,
+    ) -> Dict[str, Dict[str, Any]]:
+        """Return every stage's output for ``scenario``, executing only the stale stages.
+
+        With a ``profiler``, each stage is recorded as executed (timed) or served from the memo.
+        """
+        data_key = bundle.version or id(bundle)
+        outputs: Dict[str, Dict[str, Any]] = {}
+        keys: Dict[str, Hashable] = {}
+        for stage in self.stages:
+            params = {name: getattr(scenario, name) for name in stage.params}
+            key = (
+                tuple(params.values()),
+                stage.config(agent) if stage.config else None,
+                data_key if stage.uses_data else None,
+                tuple(keys[d] for d in stage.deps),
+            )
+            memo = self._memo[stage.name]
+            with self._lock:
+                out = memo.get(key)
+                if out is not None:
+                    memo.move_to_end(key)
+                    self._counts[stage.name]["hits"] += 1
+            if out is None:
+                dep_out = {d: outputs[d] for d in stage.deps}
+                if profiler is None:
+                    out = stage.fn(agent, bundle, params, dep_out)
+                else:
+                    with profiler.stage(stage.name, _input_rows(bundle, stage)):
+                        out = stage.fn(agent, bundle, params, dep_out)
+                with self._lock:
+                    self._counts[stage.name]["misses"] += 1
+                    memo[key] = out
+                    while len(memo) > self.max_entries:
+                        memo.popitem(last=False)
+            elif profiler is not None:
+                profiler.cached(stage.name, _input_rows(bundle, stage))
+            outputs[stage.name] = out
+            keys[stage.name] = key
+        return outputs
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(c) for name, c in self._counts.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            for memo in self._memo.values():
+                memo.clear()
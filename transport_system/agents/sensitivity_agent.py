@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.agents.uncertainty_agent import (
+    _DEFAULT_FIELDS,
+    _FACTOR_FIELDS,
+    _WEIGHT_FIELDS,
+    parameter_names,
+    sampled_agent,
+)
+from transport_system.schemas import LEVERS, Scenario, lever_bounds
+
+DEFAULT_OUTPUTS = ("system_total_co2_kg", "congestion_index", "sustainability_index")
+
+
+def factor_ranges(
+    agent: IntegrationAgent, names: Sequence[str] | None = None, spread: float = 0.2
+) -> Dict[str, Tuple[float, float]]:
+    """Uniform ranges for sensitivity inputs: the full ``Scenario`` bounds for levers and
+    ``±spread`` around the agent's current value for config fields."""
+    bounds = lever_bounds()
+    ranges = {}
+    for name in names or parameter_names():
+        if name in LEVERS:
+            ranges[name] = bounds[name]
+            continue
+        if name in _FACTOR_FIELDS:
+            value = getattr(agent.emissions_agent.factors, name)
+        elif name in _DEFAULT_FIELDS:
+            value = getattr(agent.energy_agent.defaults, name)
+        elif name in _WEIGHT_FIELDS:
+            value = getattr(agent.sustainability_agent.weights, name)
+        else:
+            raise ValueError(f"Unknown sensitivity input: {name!r}")
+        ranges[name] = (value * (1.0 - spread), value * (1.0 + spread))
+    return ranges
+
+
+def _interval(samples: np.ndarray, confidence: float) -> Tuple[np.ndarray, np.ndarray]:
+    tail = (1.0 - confidence) / 2.0
+    return np.nanquantile(samples, tail, axis=-1), np.nanquantile(samples, 1.0 - tail, axis=-1)
+
+
+class SensitivityAgent:
+    """Global sensitivity of KPIs to levers and config factors (Sobol and Morris).
+
+    Designs are evaluated in blocks through ``IntegrationAgent.evaluate_levers`` with array-valued
+    configs, the same vectorised path as the Monte Carlo mode, so the N x (k + 2) Saltelli runs
+    never go through ``run_scenario``. Like that mode it needs the uniform assignment.
+    """
+
+    def __init__(self, integration_agent: IntegrationAgent | None = None, block_size: int = 100_000) -> None:
+        self.integration_agent = integration_agent or IntegrationAgent()
+        self.block_size = block_size
+
+    def evaluate(
+        self, scenario: Scenario, names: Sequence[str], x: np.ndarray, outputs: Sequence[str]
+    ) -> Dict[str, np.ndarray]:
+        """``outputs`` for each row of ``x`` (one column per name in ``names``); the rest stay at
+        the scenario or config value. Levers are clipped to the ``Scenario`` bounds."""
+        bounds = lever_bounds()
+        result = {name: np.empty(len(x)) for name in outputs}
+        for start in range(0, len(x), self.block_size):
+            block = x[start : start + self.block_size]
+            samples = {name: block[:, j] for j, name in enumerate(names)}
+            levers = {
+                name: np.clip(samples[name], *bounds[name]) if name in samples else np.full(len(block), getattr(scenario, name))
+                for name in LEVERS
+            }
+            kpis = sampled_agent(self.integration_agent, samples).evaluate_levers(levers)
+            for name in outputs:
+                result[name][start : start + len(block)] = kpis[name]
+        return result
+
+    def sobol(
+        self,
+        factors: Dict[str, Tuple[float, float]],
+        scenario: Scenario | None = None,
+        outputs: Sequence[str] = DEFAULT_OUTPUTS,
+        n: int = 1024,
+        n_bootstrap: int = 200,
+        confidence: float = 0.95,
+        seed: int | None = 0,
+    ) -> pd.DataFrame:
+        """First-order (S1) and total-order (ST) Sobol indices with bootstrap confidence intervals.
+
+        ``factors`` maps inputs (see ``parameter_names()``) to uniform (low, high) ranges. Uses a
+        scrambled Sobol' sequence for the Saltelli design (``n`` is rounded up to a power of two;
+        cost ``n * (k + 2)`` evaluations), the Saltelli (2010) S1 and Jansen ST estimators, and
+        ``n_bootstrap`` resamples of the base rows for the intervals.
+        """
+        from scipy.stats import qmc
+
+        names = list(factors)
+        k = len(names)
+        lo = np.array([factors[name][0] for name in names], dtype=np.float64)
+        hi = np.array([factors[name][1] for name in names], dtype=np.float64)
+        u = qmc.Sobol(2 * k, scramble=True, seed=seed).random_base2(max(math.ceil(math.log2(max(n, 2))), 1))
+        n = len(u)
+        a = lo + u[:, :k] * (hi - lo)
+        b = lo + u[:, k:] * (hi - lo)
+        # Rows: A, B, then A with column i taken from B, for each i.
+        ab = np.repeat(a[None], k, axis=0)
+        ab[np.arange(k), :, np.arange(k)] = b.T
+        design = np.concatenate([a, b, ab.reshape(-1, k)])
+
+        y = self.evaluate(scenario or Scenario(), names, design, outputs)
+        rng = np.random.default_rng(seed)
+        resample = rng.integers(0, n, (n_bootstrap, n))
+        rows = []
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for output in outputs:
+                f_a, f_b = y[output][:n], y[output][n : 2 * n]
+                f_ab = y[output][2 * n :].reshape(k, n)
+                var = np.var(np.concatenate([f_a, f_b]), ddof=1)
+                s1 = np.mean(f_b * (f_ab - f_a), axis=1) / var
+                st = 0.5 * np.mean((f_a - f_ab) ** 2, axis=1) / var
+                ra, rb = f_a[resample], f_b[resample]
+                r_var = np.var(np.concatenate([ra, rb], axis=1), axis=1, ddof=1)
+                for i, name in enumerate(names):
+                    rab = f_ab[i][resample]
+                    s1_lo, s1_hi = _interval(np.mean(rb * (rab - ra), axis=1) / r_var, confidence)
+                    st_lo, st_hi = _interval(0.5 * np.mean((ra - rab) ** 2, axis=1) / r_var, confidence)
+                    rows.append(
+                        {
+                            "output": output,
+                            "parameter": name,
+                            "S1": s1[i],
+                            "S1_low": s1_lo,
+                            "S1_high": s1_hi,
+                            "ST": st[i],
+                            "ST_low": st_lo,
+                            "ST_high": st_hi,
+                        }
+                    )
+        table = pd.DataFrame(rows).set_index(["output", "parameter"])
+        table.attrs["evaluations"] = len(design)
+        return table
+
+    def morris(
+        self,
+        factors: Dict[str, Tuple[float, float]],
+        scenario: Scenario | None = None,
+        outputs: Sequence[str] = DEFAULT_OUTPUTS,
+        trajectories: int = 50,
+        levels: int = 4,
+        n_bootstrap: int = 200,
+        confidence: float = 0.95,
+        seed: int | None = 0,
+    ) -> pd.DataFrame:
+        """Morris elementary-effects screening: mu, mu* (with a bootstrap interval) and sigma.
+
+        Each trajectory starts on a ``levels``-point grid and moves one factor at a time by
+        ``levels / (2 (levels - 1))`` of its range, in random order; cost ``trajectories * (k + 1)``
+        evaluations. Effects are per unit of each factor's range, so they compare across factors.
+        """
+        names = list(factors)
+        k = len(names)
+        lo = np.array([factors[name][0] for name in names], dtype=np.float64)
+        hi = np.array([factors[name][1] for name in names], dtype=np.float64)
+        rng = np.random.default_rng(seed)
+        delta = levels / (2.0 * (levels - 1))
+
+        start = rng.integers(0, levels, (trajectories, k)) / (levels - 1)
+        step = np.where(start + delta <= 1.0, delta, -delta)
+        order = np.argsort(rng.random((trajectories, k)), axis=1)
+        # Point j of a trajectory has the first j factors of its order moved.
+        moved = np.zeros((trajectories, k + 1, k), dtype=bool)
+        rank = np.argsort(order, axis=1)
+        moved[:, 1:, :] = rank[:, None, :] < np.arange(1, k + 1)[None, :, None]
+        unit = start[:, None, :] + moved * step[:, None, :]
+        design = (lo + unit * (hi - lo)).reshape(-1, k)
+
+        y = self.evaluate(scenario or Scenario(), names, design, outputs)
+        resample = rng.integers(0, trajectories, (n_bootstrap, trajectories))
+        rows = []
+        for output in outputs:
+            f = y[output].reshape(trajectories, k + 1)
+            effects = np.empty((trajectories, k))
+            t = np.arange(trajectories)[:, None]
+            effects[t, order] = np.diff(f, axis=1) / step[t, order]
+            mu_star = np.abs(effects).mean(axis=0)
+            low, high = _interval(np.abs(effects)[resample].mean(axis=1).T, confidence)
+            for i, name in enumerate(names):
+                rows.append(
+                    {
+                        "output": output,
+                        "parameter": name,
+                        "mu": effects[:, i].mean(),
+                        "mu_star": mu_star[i],
+                        "mu_star_low": low[i],
+                        "mu_star_high": high[i],
+                        "sigma": effects[:, i].std(ddof=1) if trajectories > 1 else np.nan,
+                    }
+                )
+        table = pd.DataFrame(rows).set_index(["output", "parameter"])
+        table.attrs["evaluations"] = len(design)
+        return table
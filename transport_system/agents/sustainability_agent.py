@@ -1,16 +1,75 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Sequence
 
-from transport_system.config import SustainabilityWeights
-from transport_system.utils.math_models import accessibility
+import numpy as np
+
+from transport_system.config import AccessibilitySettings, SustainabilityWeights
+from transport_system.utils.accessibility import gravity_accessibility, network_cost_blocks
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.skims import SkimStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+OPPORTUNITY_TYPES = ("jobs", "schools", "hospitals")
 
 
 class SustainabilityAgent:
     """Computes a composite sustainability index from environmental, economic, social, performance KPIs."""
 
-    def __init__(self, weights: SustainabilityWeights | None = None) -> None:
+    def __init__(
+        self, weights: SustainabilityWeights | None = None, access: AccessibilitySettings | None = None
+    ) -> None:
         self.weights = weights or SustainabilityWeights()
+        self.access = access or AccessibilitySettings()
+        # Holds the last social score; a dict so shallow copies of the agent share it.
+        self._social: Dict[str, tuple] = {}
+
+    def zone_accessibility(
+        self,
+        opportunities: pd.DataFrame,
+        traffic_links,
+        betas: Sequence[float] = (0.15,),
+        cost=None,
+    ) -> pd.DataFrame:
+        """Per-zone gravity accessibility to jobs, schools and hospitals, one column per type and beta.
+
+        Costs default to a generalized-cost skim over ``traffic_links`` (see ``AccessibilitySettings``),
+        persisted in a ``SkimStore`` when ``skim_dir`` is set; pass ``cost`` (a zones x zones matrix, e.g. a memmap, or row blocks) to use another skim.
+        """
+        import pandas as pd
+
+        zones = opportunities["zone_id"].astype(str).tolist()
+        types = [t for t in OPPORTUNITY_TYPES if t in opportunities]
+        if cost is None:
+            links = LinkTable.coerce(traffic_links)
+            link_cost = links.free_flow_time_min + self.access.minutes_per_km * links.length_km
+            if self.access.skim_dir:
+                cost = SkimStore(self.access.skim_dir, dtype=self.access.dtype).get(links, zones, link_cost).time
+            else:
+                cost = network_cost_blocks(links, zones, link_cost, block=self.access.block)
+        acc = gravity_accessibility(
+            cost, opportunities[types].to_numpy(), betas, block=self.access.block, dtype=self.access.dtype
+        )
+        columns = [f"{t}_access_b{beta:g}" for beta in betas for t in types]
+        return pd.DataFrame(acc.reshape(len(zones), -1), index=pd.Index(zones, name="zone_id"), columns=columns)
+
+    def social_score(self, opportunities: pd.DataFrame, traffic_links, beta_access: float = 0.15) -> float:
+        """Regional score in [0, 1]: the mean over zones and opportunity types of the distance-decayed
+        share of the region's opportunities each zone reaches."""
+        # Levers never move the skim, so reuse the score while the same tables are passed in.
+        key = (beta_access, self.access)
+        last = self._social.get("last")
+        if last is not None and last[0] is opportunities and last[1] is traffic_links and last[2] == key:
+            return last[3]
+
+        zone_acc = self.zone_accessibility(opportunities, traffic_links, betas=(beta_access,)).to_numpy(np.float64)
+        totals = opportunities[[t for t in OPPORTUNITY_TYPES if t in opportunities]].to_numpy(np.float64).sum(axis=0)
+        share = np.divide(zone_acc, totals, out=np.zeros_like(zone_acc), where=totals > 0)
+        score = float(share.mean()) if share.size else 0.0
+        self._social["last"] = (opportunities, traffic_links, key, score)
+        return score
 
     def compute(
         self,
@@ -19,6 +78,7 @@ class SustainabilityAgent:
         congestion_index: float,
         avg_travel_time_min: float,
         opportunities,
+        traffic_links,
         beta_access: float = 0.15,
     ) -> Dict[str, float]:
         # Environmental: lower emissions -> higher score
@@ -27,12 +87,8 @@ class SustainabilityAgent:
         # Economic: congestion as proxy for cost
         econ_score = 1.0 / (1.0 + (congestion_index - 1.0))
 
-        # Social: gravity-based accessibility to jobs
-        opp_jobs = opportunities["jobs"].tolist()
-        # Use a simple cost proxy from index
-        costs = [10 + i * 5 for i in range(len(opp_jobs))]
-        acc = accessibility(opp_jobs, beta=beta_access, costs=costs)
-        social_score = 1.0 - 1.0 / (1.0 + acc / 1e6)
+        # Social: per-zone gravity accessibility to jobs, schools and hospitals over the network skim
+        social_score = self.social_score(opportunities, traffic_links, beta_access)
 
         # Performance: travel time
         perf_score = 1.0 / (1.0 + avg_travel_time_min / 60.0)
@@ -50,3 +106,35 @@ class SustainabilityAgent:
             "sustainability_index": float(sustainability_index),
         }
 
+    def compute_batch(
+        self,
+        *,
+        total_co2_kg: np.ndarray,
+        congestion_index: np.ndarray,
+        avg_travel_time_min: np.ndarray,
+        opportunities,
+        traffic_links,
+        beta_access: float = 0.15,
+        social_score: float | None = None,
+    ) -> Dict[str, np.ndarray]:
+        # Vectorised compute(); the social score does not depend on the levers, so it is computed once
+        # (or passed in precomputed, in which case the tables are not read).
+        env_score = 1.0 / (1.0 + np.asarray(total_co2_kg) / 1e6)
+        econ_score = 1.0 / (1.0 + (np.asarray(congestion_index) - 1.0))
+        if social_score is None:
+            social_score = self.social_score(opportunities, traffic_links, beta_access)
+        social_score = np.full(env_score.shape, social_score)
+        perf_score = 1.0 / (1.0 + np.asarray(avg_travel_time_min) / 60.0)
+
+        w = self.weights
+        sustainability_index = (
+            w.w_env * env_score + w.w_econ * econ_score + w.w_social * social_score + w.w_perf * perf_score
+        )
+
+        return {
+            "env_score": env_score,
+            "econ_score": econ_score,
+            "social_score": social_score,
+            "perf_score": perf_score,
+            "sustainability_index": sustainability_index,
+        }
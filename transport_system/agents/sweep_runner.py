@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import copy
+import os
+import shutil
+import tempfile
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple
+
+import pandas as pd
+
+from transport_system.agents.data_agent import DataAgent
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.schemas import KpiRecord, Scenario, kpi_frame
+
+
+@dataclass
+class SweepItem:
+    index: int
+    scenario: str
+    kpis: KpiRecord | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+# Per-process agent, set up once by the pool initializer.
+_WORKER_AGENT: IntegrationAgent | None = None
+
+
+def _init_worker(template: IntegrationAgent, data_dir: str) -> None:
+    global _WORKER_AGENT
+    _WORKER_AGENT = template
+    # Memory-map the shared bundle instead of receiving a pickled copy.
+    _WORKER_AGENT.data_agent = DataAgent(data_dir)
+
+
+def _run_chunk(chunk: List[Tuple[int, Scenario]]) -> List[SweepItem]:
+    out = []
+    for index, scenario in chunk:
+        try:
+            kpis = _WORKER_AGENT.run_scenario(scenario, compact=True).kpis
+            out.append(SweepItem(index=index, scenario=scenario.name, kpis=kpis))
+        except Exception:  # noqa: BLE001 - one bad scenario must not sink the sweep
+            out.append(SweepItem(index=index, scenario=scenario.name, error=traceback.format_exc(limit=5)))
+    return out
+
+
+def _shared_tmp_root() -> str | None:
+    # tmpfs-backed on Linux, so the "files" are shared memory pages.
+    return "/dev/shm" if os.path.isdir("/dev/shm") else None
+
+
+class SweepRunner:
+    """Runs ``IntegrationAgent.run_scenario`` for many scenarios across a process pool.
+
+    For sweeps that have no closed form (routed assignment, per-link logic); closed-form sweeps
+    are much cheaper through ``IntegrationAgent.run_batch``. The input bundle is compiled once into
+    the columnar format under ``/dev/shm`` and every worker memory-maps it, so the data is shared
+    rather than pickled per task. Use as a context manager to release the shared copy.
+    """
+
+    def __init__(
+        self,
+        agent: IntegrationAgent | None = None,
+        max_workers: int | None = None,
+        chunk_size: int | None = None,
+    ) -> None:
+        self.agent = agent or IntegrationAgent()
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+        self._shared_dir: Path | None = None
+        self._owns_shared_dir = False
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "SweepRunner":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _data_dir(self) -> Path:
+        if self._shared_dir is None:
+            if self.agent.data_agent.compiled:
+                self._shared_dir = self.agent.data_agent.data_dir
+            else:
+                shared = Path(tempfile.mkdtemp(prefix="transport-bundle-", dir=_shared_tmp_root()))
+                try:
+                    self.agent.data_agent.compile(shared)
+                except BaseException:
+                    shutil.rmtree(shared, ignore_errors=True)
+                    raise
+                self._shared_dir = shared
+                self._owns_shared_dir = True
+        return self._shared_dir
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            template = copy.copy(self.agent)
+            template.data_agent = None
+            template.transport_agent = copy.copy(self.agent.transport_agent)
+            template.transport_agent._graph = None
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(template, str(self._data_dir())),
+            )
+        return self._executor
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self._owns_shared_dir and self._shared_dir is not None:
+            shutil.rmtree(self._shared_dir, ignore_errors=True)
+            self._shared_dir = None
+            self._owns_shared_dir = False
+
+    def _chunks(self, scenarios: List[Scenario]) -> List[List[Tuple[int, Scenario]]]:
+        # Default: ~4 chunks per worker balances scheduling overhead against stragglers.
+        size = self.chunk_size or max(1, len(scenarios) // (self.max_workers * 4))
+        indexed = list(enumerate(scenarios))
+        return [indexed[i : i + size] for i in range(0, len(indexed), size)]
+
+    def run(self, scenarios: Iterable[Scenario], ordered: bool = True) -> Iterator[SweepItem]:
+        """Stream results as chunks finish, in input order when ``ordered``.
+
+        A scenario that raises yields an item with ``error`` set. If a worker process dies, the
+        pool is discarded and the scenarios that were still pending are yielded as errors, so
+        completed results are never lost.
+        """
+        chunks = self._chunks(list(scenarios))
+        if not chunks:
+            return
+        pool = self._pool()
+        pending = {pool.submit(_run_chunk, chunk): i for i, chunk in enumerate(chunks)}
+        done_chunks: Dict[int, List[SweepItem]] = {}
+        next_chunk = 0
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in finished:
+                i = pending.pop(fut)
+                try:
+                    items = fut.result()
+                except BrokenProcessPool as exc:
+                    if self._executor is not None:
+                        self._executor.shutdown(wait=False, cancel_futures=True)
+                        self._executor = None
+                    items = [SweepItem(index=j, scenario=sc.name, error=f"worker died: {exc}") for j, sc in chunks[i]]
+                if ordered:
+                    done_chunks[i] = items
+                else:
+                    yield from items
+            if ordered:
+                while next_chunk in done_chunks:
+                    yield from done_chunks.pop(next_chunk)
+                    next_chunk += 1
+
+    def run_frame(self, scenarios: Iterable[Scenario]) -> Tuple[pd.DataFrame, List[SweepItem]]:
+        """Collect a sweep into a KPI table (as ``compare_scenarios``) plus the failed items."""
+        names, records, failed = [], [], []
+        for item in self.run(scenarios, ordered=True):
+            if item.ok:
+                names.append(item.scenario)
+                records.append(item.kpis)
+            else:
+                failed.append(item)
+        return kpi_frame(records, scenario=names), failed
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict
+from typing import TYPE_CHECKING, Dict, Tuple
 
-import pandas as pd
+import numpy as np
 
-from transport_system.utils.math_models import bpr_travel_time, efficiency
+from transport_system.config import AssignmentSettings, TimeOfDaySettings
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.math_models import bpr_travel_time_array, efficiency, efficiency_array
+from transport_system.utils.time_of_day import day_kpis, default_profile, simulate_day
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 @dataclass
@@ -19,9 +25,88 @@ class TransportOutputs:
 class TransportSimulationAgent:
     """Very lightweight traffic simulation using a BPR-style volume–delay function."""
 
+    def __init__(
+        self, settings: AssignmentSettings | None = None, time_of_day: TimeOfDaySettings | None = None
+    ) -> None:
+        self.settings = settings or AssignmentSettings()
+        # When set, each run also simulates the whole day (see ``simulate_day``) and adds daily KPIs.
+        self.time_of_day = time_of_day
+        self._graph = None
+
+    def day_profile(self) -> np.ndarray:
+        tod = self.time_of_day
+        if tod.profile:
+            return np.asarray(tod.profile, dtype=np.float64)
+        return default_profile(int(round(24 * 60 / tod.interval_minutes)))
+
+    def _day(self, links: LinkTable, peak_volume, motorized_trips, improve_efficiency_factor):
+        profile = self.day_profile()
+        minutes = self.time_of_day.interval_minutes
+        day = simulate_day(links, peak_volume, profile, minutes, improve_efficiency_factor)
+        day_factor = float(profile.sum()) * minutes / 60.0
+        return {
+            **day_kpis(day, minutes),
+            "daily_trips": motorized_trips * day_factor,
+            "daily_demand_factor": np.full(np.shape(motorized_trips), day_factor),
+        }
+
+    def _link_graph(self, links: LinkTable, passenger_demand: pd.DataFrame):
+        # SciPy (and pandas) are only needed for equilibrium assignment, so keep them off the default import path.
+        import pandas as pd
+
+        from transport_system.utils.assignment import LinkGraph
+
+        # Reuse the CSR graph while the same link table is passed in; only weights change per run.
+        if self._graph is not None and self._graph[0] is links:
+            graph = self._graph[1]
+            zones = pd.concat([passenger_demand["origin"], passenger_demand["destination"]]).astype(str)
+            if zones.isin(graph.node_index.keys()).all():
+                return graph
+        zones = np.concatenate([passenger_demand["origin"].to_numpy(), passenger_demand["destination"].to_numpy()])
+        graph = LinkGraph(links, extra_nodes=zones)
+        self._graph = (links, graph)
+        return graph
+
+    def assign_equilibrium(self, links: LinkTable, passenger_demand: pd.DataFrame, demand_factor: float = 1.0):
+        """Route OD trips (scaled by ``demand_factor``) over the link graph to user equilibrium."""
+        from transport_system.utils.assignment import frank_wolfe_assignment
+
+        graph = self._link_graph(links, passenger_demand)
+        index = graph.node_index
+        origins = np.fromiter((index[str(o)] for o in passenger_demand["origin"]), dtype=np.int64)
+        destinations = np.fromiter((index[str(d)] for d in passenger_demand["destination"]), dtype=np.int64)
+        trips = passenger_demand["peak_hour_trips"].to_numpy(dtype=np.float64) * demand_factor
+        return frank_wolfe_assignment(
+            links,
+            graph,
+            origins,
+            destinations,
+            trips,
+            relative_gap=self.settings.relative_gap,
+            max_iterations=self.settings.max_iterations,
+            origin_block=self.settings.origin_block,
+        )
+
+    @staticmethod
+    def link_performance(
+        links: LinkTable,
+        volume,
+        improve_efficiency_factor: float = 0.0,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Per-link travel time (min), speed (km/h) and congestion ratio as whole arrays."""
+        tt = bpr_travel_time_array(links.free_flow_time_min, volume, links.capacity_vph)
+        # Apply "Improve" lever as a reduction in generalized travel time.
+        tt = tt * (1.0 - 0.3 * improve_efficiency_factor)
+        # speed = distance / time
+        hr = tt / 60.0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            speeds = np.where(hr > 0, links.length_km / hr, 0.0)
+            congestion = tt / links.free_flow_time_min
+        return tt, speeds, congestion
+
     def simulate(
         self,
-        traffic_links: pd.DataFrame,
+        traffic_links: pd.DataFrame | LinkTable,
         passenger_demand: pd.DataFrame,
         avoid_factor: float = 0.0,
         shift_to_public: float = 0.0,
@@ -32,31 +117,32 @@ class TransportSimulationAgent:
         reduced_trips = base_trips * (1.0 - avoid_factor)
         motorized_trips = reduced_trips * (1.0 - shift_to_public)
 
-        # Allocate volume evenly across links for this simple prototype.
-        num_links = max(len(traffic_links), 1)
-        volume_per_link = motorized_trips / num_links
+        links = LinkTable.coerce(traffic_links)
+        extra: Dict[str, float] = {}
+        if self.settings.mode == "equilibrium":
+            ue = self.assign_equilibrium(links, passenger_demand, (1.0 - avoid_factor) * (1.0 - shift_to_public))
+            volume = ue.link_volume
+            extra = {
+                "assignment_relative_gap": ue.relative_gap,
+                "assignment_iterations": float(ue.iterations),
+                "unassigned_trips": ue.unassigned_trips,
+            }
+        elif self.settings.mode == "uniform":
+            # Allocate volume evenly across links for this simple prototype.
+            num_links = max(len(links), 1)
+            volume = motorized_trips / num_links
+        else:
+            raise ValueError(f"Unknown assignment mode: {self.settings.mode!r}")
 
-        times = []
-        speeds = []
-        congestion = []
-
-        for _, row in traffic_links.iterrows():
-            tt = bpr_travel_time(
-                free_flow_time=row["free_flow_time_min"],
-                volume=volume_per_link,
-                capacity=row["capacity_vph"],
-            )
-            # Apply "Improve" lever as a reduction in generalized travel time.
-            tt *= 1.0 - 0.3 * improve_efficiency_factor
-            times.append(tt)
-            # speed = distance / time
-            hr = tt / 60.0
-            speeds.append(row["length_km"] / hr if hr > 0 else 0.0)
-            congestion.append(tt / row["free_flow_time_min"])
-
-        avg_time = float(sum(times) / len(times)) if times else 0.0
-        avg_speed = float(sum(speeds) / len(speeds)) if speeds else 0.0
-        congestion_index = float(sum(congestion) / len(congestion)) if congestion else 1.0
+        times, speeds, congestion = self.link_performance(links, volume, improve_efficiency_factor)
+        if self.time_of_day is not None and len(links):
+            peak_volume = np.broadcast_to(np.asarray(volume, dtype=np.float64), (len(links),))
+            day = self._day(links, peak_volume, motorized_trips, improve_efficiency_factor)
+            extra.update({k: float(v) for k, v in day.items()})
+
+        avg_time = float(times.mean()) if times.size else 0.0
+        avg_speed = float(speeds.mean()) if speeds.size else 0.0
+        congestion_index = float(congestion.mean()) if congestion.size else 1.0
 
         eff = efficiency(
             output=motorized_trips,
@@ -71,5 +157,90 @@ class TransportSimulationAgent:
             "congestion_index": congestion_index,
             "transport_efficiency": float(eff),
             "peak_hour_trips_effective": float(motorized_trips),
+            **extra,
         }
 
+    def simulate_batch(
+        self,
+        traffic_links: pd.DataFrame | LinkTable,
+        passenger_demand: pd.DataFrame,
+        avoid_factor: np.ndarray,
+        shift_to_public: np.ndarray,
+        improve_efficiency_factor: np.ndarray,
+        max_cells: int = 4_000_000,
+    ) -> Dict[str, np.ndarray]:
+        """Vectorised ``simulate`` over N scenarios, evaluated as (scenarios x links) arrays.
+
+        Only the uniform allocation has a closed form; routed modes go through ``simulate``.
+        ``max_cells`` bounds the size of each scenarios x links (x intervals, with time of day) block.
+        """
+        if self.settings.mode != "uniform":
+            raise ValueError("simulate_batch only supports the uniform assignment mode")
+
+        avoid_factor = np.asarray(avoid_factor, dtype=np.float64)
+        shift_to_public = np.asarray(shift_to_public, dtype=np.float64)
+        improve_efficiency_factor = np.asarray(improve_efficiency_factor, dtype=np.float64)
+        n = avoid_factor.shape[0]
+
+        base_trips = float(passenger_demand["peak_hour_trips"].sum())
+        motorized_trips = base_trips * (1.0 - avoid_factor) * (1.0 - shift_to_public)
+
+        links = LinkTable.coerce(traffic_links)
+        num_links = max(len(links), 1)
+        volume_per_link = motorized_trips / num_links
+
+        avg_time = np.zeros(n)
+        avg_speed = np.zeros(n)
+        congestion_index = np.ones(n)
+        fft, cap = links.free_flow_time_min, links.capacity_vph
+        if len(links) and (cap > 0).all() and (fft > 0).all():
+            # Every link carries the same volume v, so BPR time is fft + v^4 * (alpha fft / c^4) and
+            # the time and congestion means are closed form; only the speed mean needs a links pass.
+            scale = 1.0 - 0.3 * improve_efficiency_factor
+            v4 = np.square(np.square(volume_per_link))
+            w = 0.15 * fft / np.square(np.square(cap))
+            avg_time = (fft.mean() + v4 * w.mean()) * scale
+            congestion_index = (1.0 + v4 * (w / fft).mean()) * scale
+            # Small blocks reused in place stay cache-resident; this pass is memory-bound otherwise.
+            step = max(min(max_cells, 65_536) // len(links), 1)
+            km_per_link = links.length_km * (60.0 / len(links))
+            buf = np.empty((min(step, n), len(links)))
+            for lo in range(0, n, step):
+                block = buf[: min(step, n - lo)]
+                np.multiply.outer(v4[lo : lo + step], w, out=block)
+                block += fft
+                np.reciprocal(block, out=block)
+                avg_speed[lo : lo + step] = block @ km_per_link / scale[lo : lo + step]
+        elif len(links):
+            step = max(max_cells // len(links), 1)
+            for lo in range(0, n, step):
+                sl = slice(lo, lo + step)
+                times, speeds, congestion = self.link_performance(
+                    links, volume_per_link[sl, None], improve_efficiency_factor[sl, None]
+                )
+                avg_time[sl] = times.mean(axis=1)
+                avg_speed[sl] = speeds.mean(axis=1)
+                congestion_index[sl] = congestion.mean(axis=1)
+
+        eff = efficiency_array(output=motorized_trips, energy=1.0, time=avg_time, cost=congestion_index)
+
+        out = {
+            "avg_travel_time_min": avg_time,
+            "avg_speed_kmph": avg_speed,
+            "congestion_index": congestion_index,
+            "transport_efficiency": eff,
+            "peak_hour_trips_effective": motorized_trips,
+        }
+        if self.time_of_day is not None and len(links):
+            step = max(max_cells // (len(links) * len(self.day_profile())), 1)
+            parts = [
+                self._day(
+                    links,
+                    np.broadcast_to(volume_per_link[lo : lo + step, None], (min(step, n - lo), len(links))),
+                    motorized_trips[lo : lo + step],
+                    improve_efficiency_factor[lo : lo + step],
+                )
+                for lo in range(0, n, step)
+            ]
+            out.update({k: np.concatenate([p[k] for p in parts]) for k in parts[0]})
+        return out
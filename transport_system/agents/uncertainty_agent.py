@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import copy
+from dataclasses import dataclass, fields, replace
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from transport_system.agents.emissions_agent import EmissionFactors, EmissionsAgent
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.config import IndiaDefaults, SustainabilityWeights
+from transport_system.schemas import LEVERS, Scenario, lever_bounds
+from transport_system.utils.sketches import StreamingHistogram
+
+
+@dataclass(frozen=True)
+class Distribution:
+    """Sampling distribution for one uncertain parameter."""
+
+    kind: str
+    a: float
+    b: float = 0.0
+    c: float = 0.0
+
+    @classmethod
+    def fixed(cls, value: float) -> "Distribution":
+        return cls("fixed", value)
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "Distribution":
+        return cls("uniform", low, high)
+
+    @classmethod
+    def normal(cls, mean: float, sd: float) -> "Distribution":
+        return cls("normal", mean, sd)
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "Distribution":
+        return cls("lognormal", median, sigma)
+
+    @classmethod
+    def triangular(cls, low: float, mode: float, high: float) -> "Distribution":
+        return cls("triangular", low, mode, high)
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.kind == "fixed":
+            return np.full(n, self.a)
+        if self.kind == "uniform":
+            return rng.uniform(self.a, self.b, n)
+        if self.kind == "normal":
+            return rng.normal(self.a, self.b, n)
+        if self.kind == "lognormal":
+            return self.a * np.exp(rng.normal(0.0, self.b, n))
+        if self.kind == "triangular":
+            return rng.triangular(self.a, self.b, self.c, n)
+        raise ValueError(f"Unknown distribution kind: {self.kind!r}")
+
+
+# Where each uncertain parameter lives. Scenario levers win over the config field of the same name
+# (grid_emission_factor_kg_per_kwh), because that is the value the pipeline actually uses.
+_FACTOR_FIELDS = {f.name for f in fields(EmissionFactors)}
+_DEFAULT_FIELDS = {f.name for f in fields(IndiaDefaults)}
+_WEIGHT_FIELDS = {f.name for f in fields(SustainabilityWeights)}
+
+
+def parameter_names() -> Sequence[str]:
+    return tuple(LEVERS) + tuple(sorted(_FACTOR_FIELDS | _DEFAULT_FIELDS | _WEIGHT_FIELDS))
+
+
+def sampled_agent(base: IntegrationAgent, samples: Dict[str, np.ndarray]) -> IntegrationAgent:
+    """Shallow copy of ``base`` whose agent configs hold the sampled (array-valued) parameters.
+
+    Lever samples are ignored here; they are passed to ``evaluate_levers`` directly.
+    """
+    agent = copy.copy(base)
+    factor_kw = {k: v for k, v in samples.items() if k in _FACTOR_FIELDS}
+    default_kw = {k: v for k, v in samples.items() if k in _DEFAULT_FIELDS and k not in LEVERS}
+    weight_kw = {k: v for k, v in samples.items() if k in _WEIGHT_FIELDS}
+    if factor_kw:
+        agent.emissions_agent = EmissionsAgent(replace(base.emissions_agent.factors, **factor_kw))
+    if default_kw:
+        # Copies keep the rest of each agent's configuration (charging mode, grid, fleet, mode costs).
+        agent.energy_agent = copy.copy(base.energy_agent)
+        agent.energy_agent.defaults = replace(base.energy_agent.defaults, **default_kw)
+        agent.freight_agent = copy.copy(base.freight_agent)
+        agent.freight_agent.defaults = replace(base.freight_agent.defaults, **default_kw)
+    if weight_kw:
+        agent.sustainability_agent = copy.copy(base.sustainability_agent)
+        agent.sustainability_agent.weights = replace(base.sustainability_agent.weights, **weight_kw)
+    return agent
+
+
+class UncertaintyAgent:
+    """Monte Carlo propagation of parameter uncertainty through the vectorised pipeline.
+
+    Samples are drawn and evaluated in blocks through ``IntegrationAgent.evaluate_levers`` with
+    array-valued configs, and each KPI is reduced into a ``StreamingHistogram``, so memory depends
+    on the block size and sketch resolution but not on the number of samples.
+    """
+
+    def __init__(self, integration_agent: IntegrationAgent | None = None) -> None:
+        self.integration_agent = integration_agent or IntegrationAgent()
+
+    def run(
+        self,
+        scenario: Scenario,
+        distributions: Dict[str, Distribution],
+        n_samples: int = 1_000_000,
+        block_size: int = 100_000,
+        seed: int | None = 0,
+        quantiles: Sequence[float] = (0.05, 0.5, 0.95),
+        bins: int = 4096,
+    ) -> pd.DataFrame:
+        """P5/P50/P95 (or the given ``quantiles``) and mean of every KPI, one row per KPI.
+
+        ``distributions`` maps parameter names (see ``parameter_names()``) to distributions;
+        everything else stays at the scenario or config value. Sampled levers are clipped to the
+        ``Scenario`` bounds.
+        """
+        unknown = set(distributions) - set(parameter_names())
+        if unknown:
+            raise ValueError(f"Unknown uncertain parameters: {sorted(unknown)}")
+
+        rng = np.random.default_rng(seed)
+        bounds = lever_bounds()
+        sketches: Dict[str, StreamingHistogram] = {}
+
+        for start in range(0, n_samples, block_size):
+            n = min(block_size, n_samples - start)
+            samples = {name: dist.sample(rng, n) for name, dist in distributions.items()}
+            levers = {}
+            for name in LEVERS:
+                if name in samples:
+                    levers[name] = np.clip(samples[name], *bounds[name])
+                else:
+                    levers[name] = np.full(n, getattr(scenario, name))
+
+            kpis = sampled_agent(self.integration_agent, samples).evaluate_levers(levers)
+            for name, values in kpis.items():
+                sketches.setdefault(name, StreamingHistogram(bins)).update(values)
+
+        rows = []
+        for name, sketch in sketches.items():
+            row = {"kpi": name, "mean": sketch.mean}
+            row.update({f"p{round(q * 100):g}": sketch.quantile(q) for q in quantiles})
+            rows.append(row)
+        return pd.DataFrame(rows).set_index("kpi")
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Tuple
 
 
 @dataclass(frozen=True)
@@ -17,6 +18,69 @@ class IndiaDefaults:
     # Convert MJ -> kWh
     mj_per_kwh: float = 3.6
 
+    # Typical EV car consumption (~0.15–0.2 kWh/km).
+    ev_kwh_per_vkm: float = 0.18
+    # Tank-to-wheel CO2 per kWh of ICE fuel energy (approx).
+    ice_co2_kg_per_kwh: float = 0.25
+
+    # Share of freight truck trips running empty before any efficiency gains.
+    freight_empty_trip_share: float = 0.25
+
+
+@dataclass(frozen=True)
+class FreightModeCosts:
+    # Shipper cost per mode (INR) for routing freight between zones; road is cheaper on short
+    # hauls until the rail terminal charge is amortised (break-even near 250 km by default).
+    road_inr_per_tkm: float = 2.8
+    rail_inr_per_tkm: float = 1.6
+    # Handling at both rail terminals, per tonne.
+    rail_terminal_inr_per_t: float = 300.0
+    # Added per kg CO2 when planning flows by cost; 0 ignores emissions.
+    carbon_inr_per_kg: float = 0.0
+
+
+@dataclass(frozen=True)
+class FleetSettings:
+    # Projection horizon; the stock also carries vintages up to max_age years before start_year.
+    start_year: int = 2025
+    end_year: int = 2050
+    max_age: int = 30
+    # Passenger vehicles on the road in start_year, and the yearly growth of new-vehicle sales.
+    base_stock: float = 1.0e6
+    sales_growth: float = 0.03
+    # EV share of the vintages sold before start_year.
+    initial_ev_share: float = 0.01
+    # Weibull survival curve: half of a vintage is scrapped by survival_median_years.
+    survival_median_years: float = 15.0
+    survival_shape: float = 3.0
+    # Annual vehicle-km of a new vehicle, falling by mileage_decline per year of age.
+    vkm_per_vehicle: float = 10_000.0
+    mileage_decline: float = 0.03
+    # Energy per vehicle-km falls by these fractions per model year after start_year.
+    ev_efficiency_gain: float = 0.01
+    ice_efficiency_gain: float = 0.015
+
+
+@dataclass(frozen=True)
+class ChargingSettings:
+    # "annual" prices EV energy at one grid factor; "hourly" weights an hourly grid intensity
+    # series by when vehicles charge (see transport_system.utils.charging).
+    mode: str = "annual"
+    # Shares of charging energy at home, at fleet depots and at fast chargers.
+    home_share: float = 0.6
+    depot_share: float = 0.25
+    fast_share: float = 0.15
+    # Shares of home and depot energy that managed charging may move within the plug-in window.
+    home_flexible: float = 0.6
+    depot_flexible: float = 0.8
+    # Managed charging, and what it minimises: "co2" or "peak" (flattens the load).
+    managed: bool = False
+    objective: str = "co2"
+    # Intensity CO2 is priced at, and that charging avoids under objective="co2": "average" or "marginal".
+    intensity: str = "average"
+    # Managed charging draws at most this multiple (at least 1) of the mean plugged-in power in any hour.
+    max_power_ratio: float = 3.0
+
 
 @dataclass(frozen=True)
 class SustainabilityWeights:
@@ -25,3 +89,34 @@ class SustainabilityWeights:
     w_social: float = 0.2
     w_perf: float = 0.2
 
+
+@dataclass(frozen=True)
+class AssignmentSettings:
+    # "uniform" spreads peak-hour trips evenly across links (the original prototype);
+    # "equilibrium" routes OD demand over the link graph to user equilibrium (Frank–Wolfe).
+    mode: str = "uniform"
+    relative_gap: float = 1e-4
+    max_iterations: int = 100
+    # Number of origins whose shortest-path trees are grown together in one batch.
+    origin_block: int = 256
+
+
+@dataclass(frozen=True)
+class AccessibilitySettings:
+    # Generalized cost per link = free-flow minutes + minutes_per_km * length (out-of-pocket
+    # cost over value of time); 0 keeps it pure travel time.
+    minutes_per_km: float = 0.0
+    # Origin zones per skim block; peak memory is block x zones costs.
+    block: int = 1024
+    # "float32" halves the working set of large skims.
+    dtype: str = "float64"
+    # When set, skims are taken from (and persisted to) a SkimStore at this directory.
+    skim_dir: str | None = None
+
+
+@dataclass(frozen=True)
+class TimeOfDaySettings:
+    # Hourly demand rate per interval relative to peak_hour_trips; empty uses
+    # transport_system.utils.time_of_day.default_profile for a full day of intervals.
+    profile: Tuple[float, ...] = ()
+    interval_minutes: float = 15.0
@@ -0,0 +1,203 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+
+import numpy as np
+
+from transport_system.agents.emissions_agent import EmissionsAgent
+from transport_system.agents.energy_agent import EnergySystemAgent
+from transport_system.agents.freight_agent import FreightOptimizationAgent
+from transport_system.agents.sustainability_agent import SustainabilityAgent
+from transport_system.agents.transport_agent import TransportSimulationAgent
+from transport_system.utils.columnar import MANIFEST, read_columns
+from transport_system.utils.io import read_json, write_json
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.time_of_day import daily_totals
+
+# Lever-independent values baked next to a compiled dataset. Computing them needs pandas and SciPy,
+# so cold-started processes read them instead.
+CORE_FILE = "core.json"
+CORE_VERSION = 1
+CORE_DATASETS = ("traffic_links", "passenger_demand", "freight_shipments")
+# Distance decay the KPI path uses for the social score (``SustainabilityAgent.compute_batch``).
+BETA_ACCESS = 0.15
+
+
+def evaluate_levers(
+    agents: Any,
+    links: LinkTable,
+    passenger_demand: Any,
+    freight_shipments: Any,
+    social_score: float,
+    levers: Mapping[str, np.ndarray],
+    transport_out: Dict[str, np.ndarray] | None = None,
+) -> Dict[str, np.ndarray]:
+    """Lever arrays in, KPI columns out, over already loaded inputs.
+
+    ``agents`` holds the transport, freight, emissions, energy and sustainability agents (an
+    ``IntegrationAgent`` or a ``CoreModel``). The tables may be DataFrames or mappings of column
+    arrays; only column reductions are taken from them.
+    """
+    n = len(levers["avoid_demand_reduction"])
+
+    t_out = transport_out or agents.transport_agent.simulate_batch(
+        traffic_links=links,
+        passenger_demand=passenger_demand,
+        avoid_factor=levers["avoid_demand_reduction"],
+        shift_to_public=levers["shift_to_public_transport"],
+        improve_efficiency_factor=levers["improve_efficiency"],
+    )
+
+    freight_out = agents.freight_agent.optimize_batch(
+        freight_shipments=freight_shipments,
+        shift_road_to_rail=levers["freight_shift_road_to_rail"],
+        efficiency_gain=levers["improve_efficiency"],
+    )
+
+    freight_emis = agents.emissions_agent.freight_emissions_batch(
+        freight_shipments=freight_shipments,
+        road_share=freight_out["freight_road_share"],
+    )
+
+    pass_emis = agents.emissions_agent.passenger_emissions_batch(passenger_demand, n)
+
+    energy_out = agents.energy_agent.evaluate_batch(
+        passenger_vehicle_km=pass_emis["passenger_vehicle_km"],
+        ev_share=levers["ev_adoption"],
+        grid_emission_factor_kg_per_kwh=levers["grid_emission_factor_kg_per_kwh"],
+    )
+
+    total_co2_kg = (
+        pass_emis["passenger_co2_kg"]
+        + freight_emis["freight_total_co2_kg"]
+        + energy_out["total_co2_kg"]
+    )
+
+    sust = agents.sustainability_agent.compute_batch(
+        total_co2_kg=total_co2_kg,
+        congestion_index=t_out["congestion_index"],
+        avg_travel_time_min=t_out["avg_travel_time_min"],
+        opportunities=None,
+        traffic_links=links,
+        social_score=social_score,
+    )
+
+    daily = {}
+    if "daily_demand_factor" in t_out:
+        daily = daily_totals(
+            t_out["daily_demand_factor"],
+            pass_emis["passenger_co2_kg"],
+            energy_out["total_energy_kwh"],
+            energy_out["total_co2_kg"],
+            freight_emis["freight_total_co2_kg"],
+        )
+
+    return {
+        **t_out,
+        **pass_emis,
+        **freight_out,
+        **freight_emis,
+        **energy_out,
+        **sust,
+        "system_total_co2_kg": total_co2_kg,
+        **daily,
+    }
+
+
+def _access_key(agent: SustainabilityAgent) -> str:
+    return repr((BETA_ACCESS, agent.access))
+
+
+class CoreModel:
+    """Uniform-mode KPIs over a baked dataset without pandas, pydantic or SciPy, for cold starts.
+
+    Opens the columns it needs from a compiled directory (memory-mapped) and the baked social score,
+    then evaluates levers with the same batch agent methods as ``IntegrationAgent.evaluate_levers``
+    under default agent settings. Build the artifact with ``bake`` (``python -m transport_system.core``).
+    """
+
+    def __init__(self, compiled_dir: str | Path = "data/compiled") -> None:
+        self.compiled_dir = Path(compiled_dir)
+        self.transport_agent = TransportSimulationAgent()
+        self.freight_agent = FreightOptimizationAgent()
+        self.emissions_agent = EmissionsAgent()
+        self.energy_agent = EnergySystemAgent()
+        self.sustainability_agent = SustainabilityAgent()
+
+        tables, manifest = read_columns(self.compiled_dir, CORE_DATASETS)
+        baked = read_json(self.compiled_dir / CORE_FILE)
+        if baked.get("core_version") != CORE_VERSION:
+            raise ValueError(f"{self.compiled_dir / CORE_FILE} has an unsupported layout; re-run the bake")
+        if baked.get("data_version") != manifest["data_version"]:
+            raise ValueError(f"{self.compiled_dir / CORE_FILE} was baked for other data; re-run the bake")
+        if baked.get("access") != _access_key(self.sustainability_agent):
+            raise ValueError(f"{self.compiled_dir / CORE_FILE} was baked with other accessibility settings")
+        self.data_version: str = manifest["data_version"]
+        self.social_score = float(baked["social_score"])
+        # Lever bounds from ``Scenario``, so requests can be checked without importing pydantic.
+        self.bounds: Dict[str, Tuple[float, float]] = {name: tuple(b) for name, b in baked["levers"].items()}
+        self.links = LinkTable.from_columns(tables["traffic_links"])
+        self.passenger_demand = tables["passenger_demand"]
+        self.freight_shipments = tables["freight_shipments"]
+
+    @staticmethod
+    def available(compiled_dir: str | Path = "data/compiled") -> bool:
+        root = Path(compiled_dir)
+        return (root / MANIFEST).is_file() and (root / CORE_FILE).is_file()
+
+    def in_bounds(self, levers: Mapping[str, float]) -> bool:
+        """Whether ``levers`` names every lever once, each within its ``Scenario`` bounds."""
+        return levers.keys() == self.bounds.keys() and all(
+            lo <= levers[name] <= hi for name, (lo, hi) in self.bounds.items()
+        )
+
+    def evaluate(self, levers: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+        """KPI columns for lever values (scalars or equal-length arrays, one entry per lever)."""
+        arrays = np.broadcast_arrays(*(np.atleast_1d(np.asarray(v, dtype=np.float64)) for v in levers.values()))
+        return evaluate_levers(
+            self,
+            self.links,
+            self.passenger_demand,
+            self.freight_shipments,
+            self.social_score,
+            dict(zip(levers, arrays)),
+        )
+
+    def evaluate_one(self, levers: Mapping[str, float]) -> Dict[str, float]:
+        return {name: float(values[0]) for name, values in self.evaluate(levers).items()}
+
+
+def bake(src: str | Path = "data", dst: str | Path = "data/compiled") -> Dict[str, Any]:
+    """Compile ``src`` into the columnar format at ``dst`` and write the values ``CoreModel`` needs."""
+    from transport_system.agents.data_agent import DataAgent
+    from transport_system.schemas import lever_bounds
+
+    data_agent = DataAgent(src)
+    manifest = data_agent.compile(dst)
+    bundle = data_agent.load()
+    sustainability = SustainabilityAgent()
+    baked = {
+        "core_version": CORE_VERSION,
+        "data_version": manifest["data_version"],
+        "access": _access_key(sustainability),
+        "social_score": sustainability.social_score(bundle.opportunities, bundle.link_table, BETA_ACCESS),
+        "levers": {name: list(bounds) for name, bounds in lever_bounds().items()},
+    }
+    write_json(Path(dst) / CORE_FILE, baked)
+    return baked
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Bake the compiled dataset and derived values for CoreModel")
+    parser.add_argument("src", nargs="?", default="data", help="directory with the CSV layout of data/")
+    parser.add_argument("dst", nargs="?", default="data/compiled", help="output directory")
+    args = parser.parse_args(argv)
+
+    baked = bake(args.src, args.dst)
+    print(f"baked {args.src} -> {args.dst} (data_version={baked['data_version']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.schemas import LEVERS, Scenario
+
+# The transport simulation is the only links-sized stage and reads just these levers.
+TRANSPORT_LEVERS = ("avoid_demand_reduction", "shift_to_public_transport", "improve_efficiency")
+
+
+def slider_axis(lo: float, hi: float, step: float) -> np.ndarray:
+    return np.round(np.arange(lo, hi + step / 2, step), 10)
+
+
+def coarsen_axes(axes: Dict[str, np.ndarray], max_cells: int) -> Dict[str, np.ndarray]:
+    """Drop every other point (keeping both ends) of the longest axis until the grid fits ``max_cells``."""
+    axes = {k: np.asarray(v, dtype=np.float64) for k, v in axes.items()}
+    while int(np.prod([len(v) for v in axes.values()])) > max_cells:
+        name = max(axes, key=lambda k: len(axes[k]))
+        ax = axes[name]
+        if len(ax) <= 2:
+            break
+        axes[name] = np.unique(np.concatenate([ax[::2], ax[-1:]]))
+    return axes
+
+
+class LeverGrid:
+    """Precomputed KPI tensor over the six scenario levers.
+
+    ``lookup`` returns exact grid values when every lever sits on a grid node, a multilinear
+    interpolation between the surrounding nodes when ``interpolate`` is set, and ``None`` when a
+    lever is out of range (callers then fall back to ``IntegrationAgent.run_scenario``).
+    The transport stage is evaluated once over its own three axes and broadcast, so building costs
+    ``transport cells x links + grid cells`` rather than ``grid cells x links``.
+    """
+
+    def __init__(self, agent: IntegrationAgent, axes: Dict[str, Sequence[float]], block: int = 200_000) -> None:
+        missing = set(LEVERS) - set(axes)
+        if missing:
+            raise ValueError(f"Missing grid axes for: {sorted(missing)}")
+        self.agent = agent
+        self.axes = {name: np.asarray(sorted(axes[name]), dtype=np.float64) for name in LEVERS}
+        self.block = block
+        self.kpi_names: List[str] = []
+        self.values: np.ndarray | None = None
+        self.data_version = ""
+        self.ready = threading.Event()
+        self.error: BaseException | None = None
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(self.axes[name]) for name in LEVERS)
+
+    def build(self) -> "LeverGrid":
+        try:
+            self._build()
+        except BaseException as exc:
+            self.error = exc
+            raise
+        finally:
+            self.ready.set()
+        return self
+
+    def build_in_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self._background, name="lever-grid-build", daemon=True)
+        thread.start()
+        return thread
+
+    def _background(self) -> None:
+        try:
+            self.build()
+        except Exception:  # noqa: BLE001 - surfaced through self.error; lookups fall back to exact runs
+            pass
+
+    def _build(self) -> None:
+        agent = self.agent
+        bundle = agent.data_agent.load()
+
+        t_shape = tuple(len(self.axes[name]) for name in TRANSPORT_LEVERS)
+        t_mesh = np.meshgrid(*[self.axes[name] for name in TRANSPORT_LEVERS], indexing="ij")
+        t_out = agent.transport_agent.simulate_batch(
+            traffic_links=bundle.link_table,
+            passenger_demand=bundle.passenger_demand,
+            avoid_factor=t_mesh[0].ravel(),
+            shift_to_public=t_mesh[1].ravel(),
+            improve_efficiency_factor=t_mesh[2].ravel(),
+        )
+
+        shape = self.shape
+        total = int(np.prod(shape))
+        t_pos = [LEVERS.index(name) for name in TRANSPORT_LEVERS]
+        values = None
+        for start in range(0, total, self.block):
+            flat = np.arange(start, min(start + self.block, total))
+            idx = np.unravel_index(flat, shape)
+            levers = {name: self.axes[name][idx[i]] for i, name in enumerate(LEVERS)}
+            t_flat = np.ravel_multi_index(tuple(idx[p] for p in t_pos), t_shape)
+            kpis = agent.evaluate_levers(levers, transport_out={k: v[t_flat] for k, v in t_out.items()})
+            if values is None:
+                self.kpi_names = list(kpis)
+                values = np.empty((total, len(kpis)))
+            values[flat] = np.column_stack([kpis[k] for k in self.kpi_names])
+
+        self.values = values.reshape(shape + (len(self.kpi_names),))
+        self.data_version = bundle.version
+
+    def lookup(self, scenario: Scenario, interpolate: bool = True, tol: float = 1e-9) -> Dict[str, float] | None:
+        if not self.ready.is_set() or self.values is None:
+            return None
+        if self.agent.data_agent.load().version != self.data_version:
+            return None
+
+        corners = []
+        for name in LEVERS:
+            ax = self.axes[name]
+            v = float(getattr(scenario, name))
+            if v < ax[0] - tol or v > ax[-1] + tol:
+                return None
+            i = int(np.clip(np.searchsorted(ax, v - tol), 0, len(ax) - 1))
+            if abs(ax[i] - v) <= tol:
+                corners.append(((i, 1.0),))
+            elif not interpolate:
+                return None
+            else:
+                lo = i - 1
+                t = (v - ax[lo]) / (ax[i] - ax[lo])
+                corners.append(((lo, 1.0 - t), (i, t)))
+
+        row = np.zeros(len(self.kpi_names))
+        for combo in itertools.product(*corners):
+            weight = float(np.prod([w for _, w in combo]))
+            if weight:
+                row += weight * self.values[tuple(i for i, _ in combo)]
+        return dict(zip(self.kpi_names, row.tolist()))
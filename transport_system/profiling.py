@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterator, List
+
+
+@dataclass
+class StageProfile:
+    name: str
+    wall_s: float = 0.0
+    cpu_s: float = 0.0
+    # Peak traced allocations during the stage (0 unless memory tracing is on).
+    peak_bytes: int = 0
+    input_rows: int = 0
+    # Served from the pipeline memo instead of executed.
+    cached: bool = False
+
+
+class Profiler:
+    """Collects per-stage timings for one run. Only created when profiling is switched on, so
+    the disabled path costs a ``None`` check per stage.
+
+    ``trace_memory`` uses ``tracemalloc`` (several times slower while active); peaks are
+    process-wide, so concurrent runs see each other's allocations.
+    """
+
+    def __init__(self, trace_memory: bool = False) -> None:
+        self.trace_memory = trace_memory
+        self.stages: List[StageProfile] = []
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str, input_rows: int = 0) -> Iterator[StageProfile]:
+        record = StageProfile(name=name, input_rows=int(input_rows))
+        owns_trace = self.trace_memory and not tracemalloc.is_tracing()
+        if owns_trace:
+            tracemalloc.start()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        w0, c0 = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        finally:
+            record.wall_s = time.perf_counter() - w0
+            record.cpu_s = time.thread_time() - c0
+            if self.trace_memory:
+                record.peak_bytes = max(tracemalloc.get_traced_memory()[1] - base, 0)
+            if owns_trace:
+                tracemalloc.stop()
+            self.stages.append(record)
+
+    def cached(self, name: str, input_rows: int = 0) -> None:
+        self.stages.append(StageProfile(name=name, input_rows=int(input_rows), cached=True))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_wall_s": time.perf_counter() - self._started,
+            "trace_memory": self.trace_memory,
+            "stages": [asdict(s) for s in self.stages],
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe per-stage aggregates of run profiles, rendered in the Prometheus text format."""
+
+    PREFIX = "transport_stage"
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Dict[str, float]] = {}
+        self.runs = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Agents are pickled to sweep workers; each process aggregates into its own empty registry.
+        return {}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()
+
+    def observe(self, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self.runs += 1
+            for s in profile["stages"]:
+                agg = self._stages.setdefault(
+                    s["name"], {"calls": 0, "cached": 0, "wall": 0.0, "cpu": 0.0, "peak": 0, "rows": 0}
+                )
+                if s["cached"]:
+                    agg["cached"] += 1
+                    continue
+                agg["calls"] += 1
+                agg["wall"] += s["wall_s"]
+                agg["cpu"] += s["cpu_s"]
+                agg["peak"] = max(agg["peak"], s["peak_bytes"])
+                agg["rows"] = s["input_rows"]
+
+    def render(self, extra_gauges: Dict[str, float] | None = None) -> str:
+        p = self.PREFIX
+        series = [
+            ("calls_total", "counter", "Stage executions", "calls"),
+            ("cache_hits_total", "counter", "Stage results served from the pipeline memo", "cached"),
+            ("wall_seconds_total", "counter", "Wall time spent in the stage", "wall"),
+            ("cpu_seconds_total", "counter", "CPU time spent in the stage", "cpu"),
+            ("peak_bytes_max", "gauge", "Largest traced allocation peak of one execution", "peak"),
+            ("input_rows", "gauge", "Input rows seen by the last execution", "rows"),
+        ]
+        with self._lock:
+            lines = ["# HELP transport_runs_total Profiled runs", "# TYPE transport_runs_total counter"]
+            lines.append(f"transport_runs_total {self.runs}")
+            for suffix, kind, help_text, key in series:
+                lines.append(f"# HELP {p}_{suffix} {help_text}")
+                lines.append(f"# TYPE {p}_{suffix} {kind}")
+                for name in sorted(self._stages):
+                    lines.append(f'{p}_{suffix}{{stage="{name}"}} {float(self._stages[name][key])!r}')
+        for name, value in sorted((extra_gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {float(value)!r}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stages.clear()
+            self.runs = 0
+
+
+# Profiles from every IntegrationAgent are aggregated here unless an agent is given its own registry.
+DEFAULT_REGISTRY = MetricsRegistry()
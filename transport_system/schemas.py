@@ -1,7 +1,17 @@
 from __future__ import annotations
 
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Tuple
+
+import numpy as np
 from pydantic import BaseModel, Field
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from transport_system.agents.data_agent import DataBundle
+
 
 class Scenario(BaseModel):
     name: str = "baseline"
@@ -23,3 +33,189 @@ class RunResult(BaseModel):
     scenario: Scenario
     kpis: dict
     tables: dict
+    # Per-stage timings (see transport_system.profiling); only set when profiling is enabled.
+    profile: dict | None = None
+
+
+# One (names, index) pair per KPI layout, shared by every record with that layout.
+_KPI_SCHEMAS: Dict[Tuple[str, ...], Tuple[Tuple[str, ...], Dict[str, int]]] = {}
+
+
+class KpiRecord(Mapping):
+    """Read-only KPI mapping stored as one float64 array.
+
+    The names tuple and its index are interned per layout, so a record costs its values plus a
+    small fixed overhead instead of a dict of float objects.
+    """
+
+    __slots__ = ("_schema", "values")
+
+    def __init__(self, names: Tuple[str, ...], values: np.ndarray) -> None:
+        names = tuple(names)
+        schema = _KPI_SCHEMAS.get(names)
+        if schema is None:
+            schema = _KPI_SCHEMAS.setdefault(names, (names, {n: i for i, n in enumerate(names)}))
+        self._schema = schema
+        self.values = np.asarray(values, dtype=np.float64)
+
+    @classmethod
+    def from_dict(cls, kpis: Dict[str, float]) -> "KpiRecord":
+        return cls(tuple(kpis), np.fromiter(kpis.values(), dtype=np.float64, count=len(kpis)))
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        return self._schema[0]
+
+    def __getitem__(self, key: str) -> float:
+        return float(self.values[self._schema[1][key]])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._schema[0])
+
+    def __len__(self) -> int:
+        return len(self._schema[0])
+
+    def __reduce__(self):
+        return (KpiRecord, (self.names, self.values))
+
+    def to_dict(self) -> Dict[str, float]:
+        return dict(zip(self._schema[0], self.values.tolist()))
+
+
+def kpi_frame(records: List[KpiRecord], **leading: List[Any]) -> pd.DataFrame:
+    """Stack records into one KPI table (columns of the first record's layout), after ``leading`` columns."""
+    import pandas as pd
+
+    if not records:
+        return pd.DataFrame(leading)
+    names = records[0].names
+    if any(r.names != names for r in records):
+        return pd.DataFrame([{**{k: v[i] for k, v in leading.items()}, **r} for i, r in enumerate(records)])
+    values = np.vstack([r.values for r in records])
+    return pd.DataFrame({**leading, **{name: values[:, j] for j, name in enumerate(names)}})
+
+
+class ScenarioResult:
+    """Compact counterpart of ``RunResult`` for sweeps: a ``KpiRecord``, the policy text and a
+    reference to the shared, versioned input bundle. ``tables`` are built on access, so holding
+    many results costs memory per KPI, not per input row."""
+
+    __slots__ = ("scenario", "kpis", "policy", "bundle", "profile")
+
+    def __init__(
+        self,
+        scenario: Scenario,
+        kpis: KpiRecord,
+        policy: Dict[str, str],
+        bundle: "DataBundle",
+        profile: dict | None = None,
+    ) -> None:
+        self.scenario = scenario
+        self.kpis = kpis
+        self.policy = policy
+        self.bundle = bundle
+        self.profile = profile
+
+    @property
+    def data_version(self) -> str:
+        return self.bundle.version
+
+    @property
+    def tables(self) -> Dict[str, pd.DataFrame]:
+        import pandas as pd
+
+        bundle = self.bundle
+        return {
+            "traffic_links": bundle.traffic_links,
+            "passenger_demand": bundle.passenger_demand,
+            "freight_shipments": bundle.freight_shipments,
+            "opportunities": bundle.opportunities,
+            "scenario_summary": pd.DataFrame([self.kpis.to_dict()]),
+            # Policy text as a small single-row table to surface in dashboards.
+            "policy": pd.DataFrame([self.policy]),
+        }
+
+    def to_run_result(self) -> RunResult:
+        return RunResult(scenario=self.scenario, kpis=self.kpis.to_dict(), tables=self.tables, profile=self.profile)
+
+
+LEVERS = (
+    "avoid_demand_reduction",
+    "shift_to_public_transport",
+    "improve_efficiency",
+    "ev_adoption",
+    "freight_shift_road_to_rail",
+    "grid_emission_factor_kg_per_kwh",
+)
+
+
+def lever_bounds() -> Dict[str, Tuple[float, float]]:
+    """(lower, upper) bounds of each lever, read from the Field constraints on ``Scenario``."""
+    bounds = {}
+    for name in LEVERS:
+        lo, hi = -np.inf, np.inf
+        for meta in Scenario.model_fields[name].metadata:
+            lo = getattr(meta, "ge", lo)
+            hi = getattr(meta, "le", hi)
+        bounds[name] = (float(lo), float(hi))
+    return bounds
+
+
+@dataclass
+class ScenarioBatch:
+    """N scenarios as one array per lever, for evaluating whole sweeps in a single vectorised pass.
+
+    Levers left as ``None`` take the ``Scenario`` default; scalars broadcast to the batch length.
+    """
+
+    avoid_demand_reduction: Any = None
+    shift_to_public_transport: Any = None
+    improve_efficiency: Any = None
+    ev_adoption: Any = None
+    freight_shift_road_to_rail: Any = None
+    grid_emission_factor_kg_per_kwh: Any = None
+    names: Any = None
+
+    def __post_init__(self) -> None:
+        bounds = lever_bounds()
+        values = []
+        for name in LEVERS:
+            value = getattr(self, name)
+            if value is None:
+                value = Scenario.model_fields[name].default
+            values.append(np.atleast_1d(np.asarray(value, dtype=np.float64)))
+        for name, arr in zip(LEVERS, np.broadcast_arrays(*values)):
+            lo, hi = bounds[name]
+            if arr.size and (arr.min() < lo or arr.max() > hi):
+                raise ValueError(f"{name} must lie in [{lo}, {hi}]")
+            setattr(self, name, np.ascontiguousarray(arr))
+        n = len(self)
+        if self.names is None:
+            self.names = np.array([f"scenario-{i}" for i in range(n)], dtype=object)
+        else:
+            self.names = np.asarray(self.names, dtype=object)
+            if self.names.shape != (n,):
+                raise ValueError("names must have one entry per scenario")
+
+    def __len__(self) -> int:
+        return int(self.avoid_demand_reduction.shape[0])
+
+    @classmethod
+    def from_scenarios(cls, scenarios: List[Scenario]) -> "ScenarioBatch":
+        return cls(
+            **{name: [getattr(sc, name) for sc in scenarios] for name in LEVERS},
+            names=[sc.name for sc in scenarios],
+        )
+
+    @classmethod
+    def grid(cls, **axes) -> "ScenarioBatch":
+        """Full factorial grid over the given lever axes; other levers keep their defaults."""
+        names = list(axes)
+        mesh = np.meshgrid(*[np.asarray(axes[n], dtype=np.float64) for n in names], indexing="ij")
+        return cls(**{n: m.ravel() for n, m in zip(names, mesh)})
+
+    def scenario(self, i: int) -> Scenario:
+        return Scenario(name=str(self.names[i]), **{name: float(getattr(self, name)[i]) for name in LEVERS})
+
+    def levers(self) -> Dict[str, np.ndarray]:
+        return {name: getattr(self, name) for name in LEVERS}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Dict, Hashable, List, Tuple
+
+from transport_system.agents.integration_agent import IntegrationAgent
+from transport_system.schemas import LEVERS, Scenario, ScenarioBatch
+
+
+class ScenarioService:
+    """Warm, thread-safe front end over one ``IntegrationAgent`` for long-lived servers.
+
+    KPIs are cached in an LRU keyed on the canonical scenario (its lever values; the name does not
+    affect results) and the data version, and concurrent requests for the same uncached scenario
+    are coalesced so it is computed once.
+    """
+
+    def __init__(self, agent: IntegrationAgent | None = None, cache_size: int = 4096) -> None:
+        self.agent = agent or IntegrationAgent()
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Hashable, Dict[str, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def data_version(self) -> str:
+        return self.agent.data_agent.load().version
+
+    @staticmethod
+    def canonical_key(scenario: Scenario, data_version: str) -> Tuple:
+        return (data_version,) + tuple(float(getattr(scenario, name)) for name in LEVERS)
+
+    def _cache_get(self, key: Hashable) -> Dict[str, float] | None:
+        kpis = self._cache.get(key)
+        if kpis is not None:
+            self._cache.move_to_end(key)
+        return kpis
+
+    def _cache_put(self, key: Hashable, kpis: Dict[str, float]) -> None:
+        self._cache[key] = kpis
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def evaluate(self, scenario: Scenario) -> Dict[str, float]:
+        key = self.canonical_key(scenario, self.data_version())
+        with self._lock:
+            kpis = self._cache_get(key)
+            if kpis is not None:
+                self._stats["hits"] += 1
+                return kpis
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+                self._stats["misses"] += 1
+            else:
+                self._stats["coalesced"] += 1
+
+        if not owner:
+            return fut.result()
+
+        try:
+            kpis = self.agent.run_scenario(scenario, compact=True).kpis.to_dict()
+        except BaseException as exc:
+            with self._lock:
+                self._inflight.pop(key, None)
+            fut.set_exception(exc)
+            raise
+        with self._lock:
+            self._cache_put(key, kpis)
+            self._inflight.pop(key, None)
+        fut.set_result(kpis)
+        return kpis
+
+    def evaluate_many(self, scenarios: List[Scenario]) -> List[Dict[str, float]]:
+        """Cached lookups for the whole list; misses go through one vectorised ``run_batch`` when possible."""
+        version = self.data_version()
+        keys = [self.canonical_key(sc, version) for sc in scenarios]
+        results: List[Dict[str, float] | None] = [None] * len(scenarios)
+        with self._lock:
+            for i, key in enumerate(keys):
+                results[i] = self._cache_get(key)
+            self._stats["hits"] += sum(r is not None for r in results)
+
+        missing = [i for i, r in enumerate(results) if r is None]
+        if not missing:
+            return results
+
+        if self.agent.transport_agent.settings.mode == "uniform":
+            # Deduplicate before evaluating: identical scenarios in one request are computed once.
+            first: Dict[Hashable, int] = {}
+            for i in missing:
+                first.setdefault(keys[i], i)
+            unique = list(first)
+            batch = ScenarioBatch.from_scenarios([scenarios[first[k]] for k in unique])
+            table = self.agent.run_batch(batch).drop(columns="scenario")
+            computed = {k: {c: float(v) for c, v in row.items()} for k, row in zip(unique, table.to_dict("records"))}
+            with self._lock:
+                self._stats["misses"] += len(unique)
+                for k, kpis in computed.items():
+                    self._cache_put(k, kpis)
+            for i in missing:
+                results[i] = computed[keys[i]]
+        else:
+            for i in missing:
+                results[i] = self.evaluate(scenarios[i])
+        return results
+
+    def stats(self) -> Dict[str, float]:
+        store = self.agent.store.stats() if self.agent.store is not None else {}
+        with self._lock:
+            return {**{k: float(v) for k, v in self._stats.items()}, "cache_entries": float(len(self._cache)), **store}
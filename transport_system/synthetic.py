@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import argparse
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from transport_system.agents.data_agent import DATASETS, DataBundle
+from transport_system.utils.io import ensure_dir
+
+
+@dataclass(frozen=True)
+class CitySpec:
+    """Size and shape of a synthetic city; the same spec and seed always give the same city."""
+
+    n_links: int = 10_000
+    seed: int = 0
+    # Spacing of the street grid and share of intersections that act as zone centroids.
+    block_km: float = 0.6
+    zone_fraction: float = 0.1
+    # Every arterial_every-th street (in both directions) is an arterial.
+    arterial_every: int = 6
+    od_per_zone: int = 12
+    shipments_per_zone: int = 20
+    # Residents per zone and peak-hour trip rate per resident.
+    mean_population: float = 20_000.0
+    peak_trip_rate: float = 0.08
+
+
+def generate_city(spec: CitySpec = CitySpec()) -> DataBundle:
+    """Jittered street grid with arterials, CBD-weighted jobs, gravity OD demand and freight shipments.
+
+    Tables follow the schemas of the CSVs in ``data/``; zones are a subset of the intersections.
+    """
+    rng = np.random.default_rng(spec.seed)
+
+    # Street grid: a bidirectional side x side lattice has 4 * side * (side - 1) directed links.
+    side = max(2, int(round(0.5 + math.sqrt(spec.n_links / 4.0 + 0.25))))
+    ids = np.arange(side * side).reshape(side, side)
+    xy = np.stack(np.meshgrid(np.arange(side), np.arange(side), indexing="ij"), axis=-1).reshape(-1, 2)
+    xy = (xy + rng.uniform(-0.3, 0.3, xy.shape)) * spec.block_km
+
+    tails, heads, arterial = [], [], []
+    for a, b, line in ((ids[:, :-1], ids[:, 1:], ids[:, :-1] // side), (ids[:-1, :], ids[1:, :], ids[:-1, :] % side)):
+        is_art = (line % spec.arterial_every == 0).ravel()
+        tails += [a.ravel(), b.ravel()]
+        heads += [b.ravel(), a.ravel()]
+        arterial += [is_art, is_art]
+    tail = np.concatenate(tails)
+    head = np.concatenate(heads)
+    arterial = np.concatenate(arterial)
+    m = tail.shape[0]
+
+    length = np.linalg.norm(xy[tail] - xy[head], axis=1) * rng.uniform(1.0, 1.15, m)
+    speed = np.where(arterial, rng.uniform(35.0, 55.0, m), rng.uniform(15.0, 30.0, m))
+    lanes = np.where(arterial, rng.choice([2, 3], m), rng.choice([1, 2], m, p=[0.7, 0.3]))
+    node_names = np.char.add("N", ids.ravel().astype(str)).astype(object)
+    traffic_links = pd.DataFrame(
+        {
+            "link_id": np.char.add("L", np.arange(m).astype(str)).astype(object),
+            "from_node": node_names[tail],
+            "to_node": node_names[head],
+            "length_km": np.round(length, 3),
+            "free_flow_time_min": np.round(length / speed * 60.0, 3),
+            "capacity_vph": (lanes * np.where(arterial, 900.0, 600.0)).astype(float),
+        }
+    )
+
+    # Zones: intersections drawn without replacement; population and jobs peak towards the centre.
+    n_zones = max(2, int(round(side * side * spec.zone_fraction)))
+    zone_nodes = np.sort(rng.choice(side * side, n_zones, replace=False))
+    zxy = xy[zone_nodes]
+    centre = xy.mean(axis=0)
+    r = np.linalg.norm(zxy - centre, axis=1) / max(np.linalg.norm(xy - centre, axis=1).max(), 1e-9)
+    population = spec.mean_population * rng.lognormal(0.0, 0.5, n_zones) * (1.3 - 0.6 * r)
+    jobs = population * 0.45 * rng.lognormal(0.0, 0.6, n_zones) * np.exp(-2.0 * r) * 2.5
+    opportunities = pd.DataFrame(
+        {
+            "zone_id": node_names[zone_nodes],
+            "jobs": np.round(jobs).astype(np.int64),
+            "schools": rng.poisson(population / 1_500.0),
+            "hospitals": rng.poisson(population / 20_000.0),
+        }
+    )
+
+    # Passenger OD pairs: destinations drawn by a gravity model on jobs and straight-line distance.
+    k = min(spec.od_per_zone, n_zones - 1)
+    origins = np.repeat(np.arange(n_zones), k)
+    dest = np.empty_like(origins)
+    for z in range(n_zones):
+        d = np.linalg.norm(zxy - zxy[z], axis=1)
+        w = (jobs + 1.0) * np.exp(-d / 4.0)
+        w[z] = 0.0
+        dest[z * k : (z + 1) * k] = rng.choice(n_zones, k, replace=False, p=w / w.sum())
+    trip_km = np.linalg.norm(zxy[origins] - zxy[dest], axis=1) * 1.3
+    trips = population[origins] * spec.peak_trip_rate / k * rng.uniform(0.5, 1.5, origins.shape[0])
+    passenger_demand = pd.DataFrame(
+        {
+            "od_id": np.char.add("OD", np.arange(origins.shape[0]).astype(str)).astype(object),
+            "origin": node_names[zone_nodes[origins]],
+            "destination": node_names[zone_nodes[dest]],
+            "peak_hour_trips": np.round(trips).astype(np.int64),
+            "avg_trip_km": np.round(np.maximum(trip_km, 0.5), 2),
+        }
+    )
+
+    # Freight: shipments leave the outer (industrial) ring more often than the centre.
+    n_ship = n_zones * spec.shipments_per_zone
+    p_origin = (0.2 + r) / (0.2 + r).sum()
+    freight_shipments = pd.DataFrame(
+        {
+            "shipment_id": np.char.add("S", np.arange(n_ship).astype(str)).astype(object),
+            "origin": node_names[zone_nodes[rng.choice(n_zones, n_ship, p=p_origin)]],
+            "destination": node_names[zone_nodes[rng.integers(0, n_zones, n_ship)]],
+            "tonnes": np.round(rng.lognormal(3.0, 0.8, n_ship), 1),
+            "mode": np.where(rng.random(n_ship) < 0.85, "road", "rail").astype(object),
+        }
+    )
+
+    return DataBundle(
+        traffic_links=traffic_links,
+        passenger_demand=passenger_demand,
+        freight_shipments=freight_shipments,
+        opportunities=opportunities,
+        version=f"synthetic-{spec.n_links}-{spec.seed}",
+    )
+
+
+def write_city(bundle: DataBundle, out_dir: str | Path) -> Path:
+    """Write a bundle as the CSV layout ``DataAgent`` reads."""
+    out = ensure_dir(out_dir)
+    for name in DATASETS:
+        getattr(bundle, name).to_csv(out / f"{name}.csv", index=False)
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a seeded synthetic city as DataAgent CSVs")
+    parser.add_argument("out_dir")
+    parser.add_argument("--links", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    bundle = generate_city(CitySpec(n_links=args.links, seed=args.seed))
+    write_city(bundle, args.out_dir)
+    sizes = ", ".join(f"{name}={len(getattr(bundle, name))}" for name in DATASETS)
+    print(f"Wrote {args.out_dir}: {sizes}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from typing import Iterable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from transport_system.utils.link_table import LinkTable
+
+# A cost source is either a full (origins x destinations) matrix (which may be a np.memmap) or an
+# iterable of ``(first_row, rows)`` blocks covering the origins in order.
+CostBlocks = Iterable[Tuple[int, np.ndarray]]
+
+
+def matrix_blocks(cost: np.ndarray, block: int) -> Iterator[Tuple[int, np.ndarray]]:
+    for start in range(0, cost.shape[0], block):
+        yield start, cost[start : start + block]
+
+
+def network_cost_blocks(
+    links: LinkTable,
+    zones: Sequence[str],
+    link_cost: np.ndarray,
+    block: int = 1024,
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """Zone-to-zone shortest-path costs over the link graph, one block of origin zones at a time.
+
+    Only ``block x zones`` costs exist at once. Zones absent from the network reach nothing but
+    themselves (intrazonal cost 0), as do unconnected pairs (cost ``inf``).
+    """
+    from transport_system.utils.assignment import LinkGraph
+
+    zones = [str(z) for z in zones]
+    graph = LinkGraph(links, extra_nodes=np.asarray(zones, dtype=object))
+    graph.reweight(np.asarray(link_cost, dtype=np.float64))
+    node = np.fromiter((graph.node_index[z] for z in zones), dtype=np.int64, count=len(zones))
+    for start in range(0, len(zones), block):
+        rows = graph.shortest_distances(node[start : start + block])
+        yield start, rows[:, node]
+
+
+def gravity_accessibility(
+    cost: np.ndarray | CostBlocks,
+    opportunities: np.ndarray,
+    betas: Sequence[float],
+    block: int = 1024,
+    dtype: np.dtype | str = np.float64,
+) -> np.ndarray:
+    """Per-origin gravity accessibility ``A[i] = Σ_j O[j] · exp(-β · c[i, j])``.
+
+    ``opportunities`` is ``(destinations,)`` or ``(destinations, types)``; the result is
+    ``(origins, len(betas), types)``. Costs are consumed block by block, so peak memory is
+    ``block x destinations`` per beta regardless of the zone count, and each cost block is
+    reused for every beta. ``dtype=np.float32`` halves the working set.
+    """
+    dtype = np.dtype(dtype)
+    opp = np.asarray(opportunities, dtype=dtype)
+    if opp.ndim == 1:
+        opp = opp[:, None]
+    betas = np.asarray(betas, dtype=dtype)
+    blocks = matrix_blocks(cost, block) if isinstance(cost, np.ndarray) else cost
+
+    parts = []
+    for start, rows in blocks:
+        rows = np.asarray(rows, dtype=dtype)
+        out = np.empty((rows.shape[0], len(betas), opp.shape[1]), dtype=dtype)
+        weight = np.empty_like(rows)
+        for b, beta in enumerate(betas):
+            np.multiply(rows, -beta, out=weight)
+            np.exp(weight, out=weight)  # exp(-inf) == 0: unreachable pairs drop out
+            out[:, b, :] = weight @ opp
+        parts.append((start, out))
+
+    n = sum(p.shape[0] for _, p in parts)
+    result = np.empty((n, len(betas), opp.shape[1]), dtype=dtype)
+    for start, out in parts:
+        result[start : start + out.shape[0]] = out
+    return result
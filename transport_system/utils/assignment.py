@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.math_models import bpr_travel_time_array
+
+# Dijkstra treats explicit zeros as missing edges, so costs are clamped just above zero.
+_MIN_COST = 1e-9
+
+
+class LinkGraph:
+    """Directed link graph in CSR form, built once and re-weighted in place on every iteration.
+
+    Parallel links between the same node pair collapse onto one CSR entry; the cheapest link of
+    each pair under the current costs carries the all-or-nothing flow.
+    """
+
+    def __init__(self, links: LinkTable, extra_nodes: Iterable = ()) -> None:
+        labels = np.concatenate([links.from_node, links.to_node, np.asarray(list(extra_nodes), dtype=object)])
+        nodes, inverse = np.unique(labels.astype(str), return_inverse=True)
+        m = len(links)
+        self.nodes = nodes
+        self.node_index: Dict[str, int] = {str(n): i for i, n in enumerate(nodes)}
+        self.num_nodes = int(nodes.shape[0])
+        self.num_links = m
+        self.tail = inverse[:m].astype(np.int64)
+        self.head = inverse[m : 2 * m].astype(np.int64)
+
+        keys = self.tail * self.num_nodes + self.head
+        self._order = np.argsort(keys, kind="stable")
+        self.pair_keys, self._group_start, counts = np.unique(keys[self._order], return_index=True, return_counts=True)
+        self._group_of_sorted = np.repeat(np.arange(self.pair_keys.shape[0]), counts)
+        self._has_parallel = bool((counts > 1).any())
+
+        pair_tail = self.pair_keys // self.num_nodes
+        pair_head = self.pair_keys % self.num_nodes
+        self._matrix = csr_matrix(
+            (np.ones(self.pair_keys.shape[0]), (pair_tail, pair_head)),
+            shape=(self.num_nodes, self.num_nodes),
+        )
+        self._matrix.sort_indices()
+        # np.unique sorts pair keys row-major, which is exactly canonical CSR order.
+        self._pair_link = self._order[self._group_start]
+
+    def reweight(self, cost: np.ndarray) -> None:
+        """Update edge weights from per-link costs without rebuilding the graph structure."""
+        sorted_cost = np.maximum(cost[self._order], _MIN_COST)
+        if self._has_parallel:
+            pair_cost = np.minimum.reduceat(sorted_cost, self._group_start)
+            is_min = sorted_cost <= pair_cost[self._group_of_sorted]
+            first = np.flatnonzero(is_min)
+            _, pick = np.unique(self._group_of_sorted[first], return_index=True)
+            self._pair_link = self._order[first[pick]]
+        else:
+            pair_cost = sorted_cost
+        self._matrix.data[:] = pair_cost
+
+    def shortest_trees(self, origins: np.ndarray):
+        return dijkstra(self._matrix, directed=True, indices=origins, return_predecessors=True)
+
+    def shortest_distances(self, origins: np.ndarray) -> np.ndarray:
+        """Shortest-path cost from each origin node to every node (``inf`` where unreachable)."""
+        return dijkstra(self._matrix, directed=True, indices=origins)
+
+    def tree_links(self, pred: np.ndarray, node: np.ndarray) -> np.ndarray:
+        """Link index of the tree edge ``pred -> node`` for each entry."""
+        group = np.searchsorted(self.pair_keys, pred * self.num_nodes + node)
+        return self._pair_link[group]
+
+
+@dataclass
+class EquilibriumResult:
+    link_volume: np.ndarray
+    link_time: np.ndarray
+    relative_gap: float
+    iterations: int
+    converged: bool
+    unassigned_trips: float
+
+
+def _tree_depth(flat_pred: np.ndarray) -> np.ndarray:
+    # Pointer jumping: O(log depth) whole-array passes instead of walking each path.
+    # ``flat_pred`` indexes into the flattened (origins x nodes) block, -1 marks roots.
+    depth = (flat_pred >= 0).astype(np.int32)
+    anc = flat_pred
+    active = np.flatnonzero(anc >= 0)
+    while active.size:
+        up = anc[active]
+        depth[active] += depth[up]
+        anc = anc.copy()
+        anc[active] = anc[up]
+        active = active[anc[active] >= 0]
+    return depth
+
+
+def all_or_nothing(
+    graph: LinkGraph,
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    trips: np.ndarray,
+    origin_block: int = 256,
+) -> tuple[np.ndarray, float, float]:
+    """Load OD trips onto shortest paths under the graph's current weights.
+
+    One shortest-path tree is grown per origin and shared by all of its destinations; demand is
+    pushed from the leaves towards the root level by level, so no individual path is traced.
+    Returns link volumes, total shortest-path cost and trips with no path.
+    """
+    n = graph.num_nodes
+    volume = np.zeros(graph.num_links)
+    sp_cost = 0.0
+    unassigned = 0.0
+
+    uniq_origins, od_row = np.unique(origins, return_inverse=True)
+    for start in range(0, uniq_origins.shape[0], origin_block):
+        block = uniq_origins[start : start + origin_block]
+        sel = (od_row >= start) & (od_row < start + block.shape[0])
+        rows = od_row[sel] - start
+
+        dist, pred = graph.shortest_trees(block)
+        # int32 flat indices halve memory traffic in the gather-heavy passes below.
+        itype = np.int32 if block.shape[0] * n < np.iinfo(np.int32).max else np.int64
+        rows_off = (np.arange(block.shape[0], dtype=itype) * n)[:, None]
+        flat_pred = np.where(pred >= 0, pred.astype(itype) + rows_off, -1).ravel()
+
+        acc = np.zeros((block.shape[0], n))
+        np.add.at(acc, (rows, destinations[sel]), trips[sel])
+        reachable = np.isfinite(dist)
+        unassigned += float(acc[~reachable].sum())
+        acc[~reachable] = 0.0
+        sp_cost += float((acc[reachable] * dist[reachable]).sum())
+
+        depth = _tree_depth(flat_pred)
+        # Depth fits int16 on any realistic network, which lets numpy use a linear-time radix sort.
+        key = -depth.astype(np.int16) if depth.max(initial=0) < np.iinfo(np.int16).max else -depth
+        order = np.argsort(key, kind="stable")
+        level_sizes = np.bincount(depth, minlength=1)[::-1]
+        flat_acc = acc.ravel()
+        pos = 0
+        for size in level_sizes[:-1]:  # depth 0 are the roots and unreachable nodes
+            idx = order[pos : pos + size]
+            pos += size
+            np.add.at(flat_acc, flat_pred[idx], flat_acc[idx])
+
+        loaded = np.flatnonzero((flat_pred >= 0) & (flat_acc > 0))
+        link = graph.tree_links(flat_pred[loaded] % n, loaded % n)
+        volume += np.bincount(link, weights=flat_acc[loaded], minlength=graph.num_links)
+
+    return volume, sp_cost, unassigned
+
+
+def _line_search(links: LinkTable, x: np.ndarray, d: np.ndarray, steps: int = 30) -> float:
+    # Bisection on the derivative of the Beckmann objective along x + λd.
+    lo, hi = 0.0, 1.0
+    if np.dot(bpr_travel_time_array(links.free_flow_time_min, x + d, links.capacity_vph), d) <= 0:
+        return 1.0
+    for _ in range(steps):
+        mid = 0.5 * (lo + hi)
+        t = bpr_travel_time_array(links.free_flow_time_min, x + mid * d, links.capacity_vph)
+        if np.dot(t, d) > 0:
+            hi = mid
+        else:
+            lo = mid
+    return 0.5 * (lo + hi)
+
+
+def frank_wolfe_assignment(
+    links: LinkTable,
+    graph: LinkGraph,
+    origins: np.ndarray,
+    destinations: np.ndarray,
+    trips: np.ndarray,
+    relative_gap: float = 1e-4,
+    max_iterations: int = 100,
+    origin_block: int = 256,
+) -> EquilibriumResult:
+    """User-equilibrium assignment with the BPR volume–delay function.
+
+    Stops once the relative gap ``(t·x - t·y) / t·x`` between current flows ``x`` and the
+    all-or-nothing flows ``y`` drops below ``relative_gap``.
+    """
+    t = bpr_travel_time_array(links.free_flow_time_min, 0.0, links.capacity_vph)
+    graph.reweight(t)
+    x, _, unassigned = all_or_nothing(graph, origins, destinations, trips, origin_block)
+
+    gap = float("inf")
+    it = 0
+    for it in range(1, max_iterations + 1):
+        t = bpr_travel_time_array(links.free_flow_time_min, x, links.capacity_vph)
+        graph.reweight(t)
+        y, sp_cost, _ = all_or_nothing(graph, origins, destinations, trips, origin_block)
+        total_cost = float(np.dot(t, x))
+        gap = (total_cost - sp_cost) / total_cost if total_cost > 0 else 0.0
+        if gap <= relative_gap:
+            break
+        step = _line_search(links, x, y - x)
+        x = x + step * (y - x)
+
+    return EquilibriumResult(
+        link_volume=x,
+        link_time=bpr_travel_time_array(links.free_flow_time_min, x, links.capacity_vph),
+        relative_gap=float(gap),
+        iterations=it,
+        converged=gap <= relative_gap,
+        unassigned_trips=unassigned,
+    )
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Tuple
+
+import numpy as np
+
+from transport_system.config import ChargingSettings
+
+HOURS_PER_DAY = 24
+# Scenarios per block of the hours x scenarios arrays (8760 x 256 float64 is about 18 MB).
+_BLOCK = 256
+
+LOCATIONS = ("home", "depot", "fast")
+
+
+def _daily(*peaks: Tuple[float, float, float], base: float = 0.0) -> np.ndarray:
+    # Wrapped Gaussian bumps (weight, hour, width) over hourly bins, normalised to one day's energy.
+    hours = np.arange(HOURS_PER_DAY) + 0.5
+    shape = np.full(HOURS_PER_DAY, base)
+    for weight, centre, width in peaks:
+        gap = (hours - centre + 12.0) % 24.0 - 12.0
+        shape += weight * np.exp(-0.5 * (gap / width) ** 2)
+    return shape / shape.sum()
+
+
+def _window(first: int, last: int) -> np.ndarray:
+    # Hours first..last inclusive, wrapping past midnight.
+    hours = np.arange(HOURS_PER_DAY)
+    return (hours >= first) | (hours <= last) if first > last else (hours >= first) & (hours <= last)
+
+
+def default_profiles() -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Illustrative unmanaged charging per location: (share of a day's energy per hour, hours when the
+    vehicle is plugged in and charging may be moved). Home charging starts on the evening arrival,
+    depot fleets charge overnight and are also parked over midday, and fast charging follows daytime
+    traffic."""
+    return {
+        "home": (_daily((1.0, 20.5, 2.0), base=0.01), _window(18, 7)),
+        "depot": (_daily((1.0, 23.5, 2.5), (0.25, 13.5, 1.0)), _window(21, 5) | _window(11, 15)),
+        "fast": (_daily((1.0, 10.0, 2.0), (0.8, 14.5, 2.0), (1.0, 18.5, 1.5), base=0.02), np.zeros(HOURS_PER_DAY, bool)),
+    }
+
+
+@dataclass
+class GridIntensity:
+    """Hourly grid CO₂ intensity (kg/kWh) over one year: the average of generation and the marginal
+    unit's. The length must be a whole number of days (8760, or 8784 in a leap year)."""
+
+    average: np.ndarray
+    marginal: np.ndarray
+    version: str = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.average = np.asarray(self.average, dtype=np.float64)
+        self.marginal = np.asarray(self.marginal, dtype=np.float64)
+        if self.average.shape != self.marginal.shape or self.average.ndim != 1 or len(self.average) % HOURS_PER_DAY:
+            raise ValueError("average and marginal intensity must be equal-length hourly series of whole days")
+        h = hashlib.blake2b(digest_size=8)
+        h.update(self.average.tobytes())
+        h.update(self.marginal.tobytes())
+        self.version = h.hexdigest()
+
+    @property
+    def days(self) -> int:
+        return len(self.average) // HOURS_PER_DAY
+
+    @classmethod
+    def default(cls, mean_kg_per_kwh: float = 0.72, hours: int = 8760) -> "GridIntensity":
+        """Illustrative coal-heavy grid with solar: a midday dip deepest in the dry season, and coal
+        on the margin except when solar is plentiful. The average is scaled to ``mean_kg_per_kwh``."""
+        h = np.arange(hours)
+        hour, day = h % HOURS_PER_DAY + 0.5, h // HOURS_PER_DAY
+        solar = np.clip(np.sin(np.pi * (hour - 6.0) / 12.0), 0.0, None)
+        season = 1.0 + 0.25 * np.cos(2.0 * np.pi * (day - 100) / 365.0)
+        evening = np.exp(-0.5 * ((hour - 20.0) / 1.5) ** 2)
+        average = 0.82 - 0.28 * solar * season + 0.04 * evening
+        marginal = 0.98 - 0.45 * solar * season
+        return cls(average * mean_kg_per_kwh / average.mean(), marginal)
+
+    @classmethod
+    def from_csv(cls, path: str | Path) -> "GridIntensity":
+        """Read ``average_kg_per_kwh`` (and optionally ``marginal_kg_per_kwh``) per hour from a CSV."""
+        import pandas as pd
+
+        df = pd.read_csv(path)
+        average = df["average_kg_per_kwh"].to_numpy(dtype=np.float64)
+        marginal = df["marginal_kg_per_kwh"].to_numpy(dtype=np.float64) if "marginal_kg_per_kwh" in df else average
+        return cls(average, marginal)
+
+
+def water_fill(base: np.ndarray, energy: np.ndarray) -> np.ndarray:
+    """Spread ``energy`` over the hours of each day to flatten ``base + allocation`` (valley filling).
+
+    ``base`` is (..., days, 24) with ``inf`` in hours that may not be used; ``energy`` is (..., days).
+    The fill level of each day follows from the sorted base in one pass: with the k lowest hours
+    filled, the level is ``(energy + their base) / k``, valid while it exceeds the k-th base.
+    """
+    ordered = np.sort(base, axis=-1)
+    with np.errstate(invalid="ignore"):
+        level = (energy[..., None] + np.cumsum(ordered, axis=-1)) / np.arange(1, HOURS_PER_DAY + 1)
+        filled = (ordered < level).sum(axis=-1)
+    top = np.take_along_axis(level, np.maximum(filled - 1, 0)[..., None], axis=-1)
+    top = np.where(filled[..., None] > 0, top, -np.inf)
+    return np.clip(top - base, 0.0, None)
+
+
+def greedy_fill(priority: np.ndarray, available: np.ndarray, power_ratio: float) -> np.ndarray:
+    """Share of a day's flexible energy per hour when it goes to the lowest-``priority`` plugged-in
+    hours first, each taking at most ``power_ratio`` times the mean over the plugged-in hours
+    (optimal for a linear objective such as CO₂). ``priority`` is (days, 24)."""
+    n_open = int(available.sum())
+    if n_open == 0:
+        return np.zeros_like(priority)
+    cap = min(power_ratio, float(n_open)) / n_open
+    order = np.argsort(np.where(available, priority, np.inf), axis=-1, kind="stable")
+    ranked = np.clip(1.0 - cap * np.arange(HOURS_PER_DAY), 0.0, cap)
+    out = np.empty_like(priority)
+    np.put_along_axis(out, order, np.broadcast_to(ranked, priority.shape), axis=-1)
+    return out
+
+
+def _mix(settings: ChargingSettings) -> Dict[str, Tuple[float, float]]:
+    # Per location: share of all charging energy, and the part of it managed charging may move.
+    shares = {"home": settings.home_share, "depot": settings.depot_share, "fast": settings.fast_share}
+    flexible = {"home": settings.home_flexible, "depot": settings.depot_flexible, "fast": 0.0}
+    total = sum(shares.values())
+    return {loc: (shares[loc] / total, flexible[loc]) for loc in LOCATIONS}
+
+
+def charging_shapes(settings: ChargingSettings, grid: GridIntensity) -> Tuple[np.ndarray, np.ndarray]:
+    """Unmanaged and managed charging load per hour of the year, per kWh of annual charging energy.
+
+    Managed charging moves each location's flexible share within its day and plug-in window: to the
+    lowest-intensity hours (``objective="co2"``, by ``settings.intensity``), or to flatten the EV
+    load (``objective="peak"``), locations in turn.
+    """
+    if settings.objective not in ("co2", "peak") or settings.intensity not in ("average", "marginal"):
+        raise ValueError("charging objective must be 'co2' or 'peak' and intensity 'average' or 'marginal'")
+    if settings.max_power_ratio < 1.0:
+        raise ValueError("max_power_ratio must be at least 1, or a day's flexible energy does not fit")
+    profiles = default_profiles()
+    mix = _mix(settings)
+    days = grid.days
+    unmanaged = np.zeros((days, HOURS_PER_DAY))
+    fixed = np.zeros((days, HOURS_PER_DAY))
+    for loc, (share, flexible) in mix.items():
+        unmanaged += share / days * profiles[loc][0]
+        fixed += share / days * (1.0 - flexible) * profiles[loc][0]
+
+    intensity = (grid.marginal if settings.intensity == "marginal" else grid.average).reshape(days, HOURS_PER_DAY)
+    managed = fixed.copy()
+    for loc, (share, flexible) in mix.items():
+        energy = share / days * flexible
+        if energy <= 0:
+            continue
+        available = profiles[loc][1]
+        if settings.objective == "peak":
+            managed += water_fill(np.where(available, managed, np.inf), np.full(days, energy))
+        else:
+            managed += energy * greedy_fill(intensity, available, settings.max_power_ratio)
+    return unmanaged.ravel(), managed.ravel()
+
+
+def effective_intensity(settings: ChargingSettings, grid: GridIntensity, managed: bool | None = None) -> float:
+    """CO₂ per kWh of the year's charging under the settings' profile mix, relative to a grid whose
+    mean average intensity is 1 (multiply by a grid factor to price EV energy)."""
+    unmanaged, managed_shape = charging_shapes(settings, grid)
+    use_managed = settings.managed if managed is None else managed
+    shape = managed_shape if use_managed else unmanaged
+    series = grid.marginal if settings.intensity == "marginal" else grid.average
+    return float(shape @ series) / float(grid.average.mean())
+
+
+def hourly_charging(
+    settings: ChargingSettings,
+    grid: GridIntensity,
+    annual_ev_kwh: np.ndarray,
+    grid_factor: np.ndarray | None = None,
+    managed_share: np.ndarray | float | None = None,
+    base_load_kw: np.ndarray | None = None,
+    hourly: bool = False,
+) -> Dict[str, np.ndarray]:
+    """Hourly EV charging load, peaks and CO₂ for each scenario over the grid's year.
+
+    ``annual_ev_kwh`` is per scenario. ``grid_factor`` rescales the hourly intensities so their
+    mean average equals it (a decarbonised or dirtier grid of the same shape). ``managed_share`` is
+    the share of flexible charging under managed control (default: all if ``settings.managed``).
+    ``base_load_kw`` (non-EV demand per hour) adds the system peak and, under ``objective="peak"``,
+    is what managed charging flattens. Work runs over blocks of scenarios as hours x scenarios
+    arrays; ``hourly=True`` also returns the load as ``ev_load_kw``.
+    """
+    energy = np.atleast_1d(np.asarray(annual_ev_kwh, dtype=np.float64))
+    n = len(energy)
+    if managed_share is None:
+        managed_share = 1.0 if settings.managed else 0.0
+    share = np.broadcast_to(np.asarray(managed_share, dtype=np.float64), (n,))
+    scale = np.ones(n)
+    if grid_factor is not None:
+        scale = np.broadcast_to(np.asarray(grid_factor, dtype=np.float64), (n,)) / grid.average.mean()
+
+    unmanaged, managed = charging_shapes(settings, grid)
+    base = None if base_load_kw is None else np.asarray(base_load_kw, dtype=np.float64)
+    if base is not None and base.shape != grid.average.shape:
+        raise ValueError("base_load_kw must have one value per hour of the grid series")
+
+    names = ("ev_peak_kw", "ev_peak_hour", "ev_co2_average_kg", "ev_co2_marginal_kg", "managed_shift_kwh")
+    out = {name: np.empty(n) for name in names}
+    if base is not None:
+        out["system_peak_kw"] = np.empty(n)
+    load_all = np.empty((len(unmanaged), n)) if hourly else None
+
+    for lo in range(0, n, _BLOCK):
+        hi = min(lo + _BLOCK, n)
+        e, m = energy[lo:hi], share[lo:hi]
+        if base is not None and settings.objective == "peak":
+            # Flattening the system load depends on absolute kW, so each scenario gets its own fill.
+            managed_block = _system_fill(settings, grid, base, e)
+        else:
+            managed_block = managed[:, None] * e
+        load = unmanaged[:, None] * (e * (1.0 - m)) + managed_block * m
+        out["ev_peak_kw"][lo:hi] = load.max(axis=0)
+        out["ev_peak_hour"][lo:hi] = load.argmax(axis=0)
+        out["ev_co2_average_kg"][lo:hi] = grid.average @ load * scale[lo:hi]
+        out["ev_co2_marginal_kg"][lo:hi] = grid.marginal @ load * scale[lo:hi]
+        out["managed_shift_kwh"][lo:hi] = 0.5 * np.abs(load - unmanaged[:, None] * e).sum(axis=0)
+        if base is not None:
+            out["system_peak_kw"][lo:hi] = (load + base[:, None]).max(axis=0)
+        if hourly:
+            load_all[:, lo:hi] = load
+
+    charged = np.maximum(energy, 1e-12)
+    out["ev_charging_kwh"] = energy
+    out["ev_average_intensity_kg_per_kwh"] = out["ev_co2_average_kg"] / charged
+    out["ev_marginal_intensity_kg_per_kwh"] = out["ev_co2_marginal_kg"] / charged
+    if hourly:
+        out["ev_load_kw"] = load_all
+    return out
+
+
+def _system_fill(settings: ChargingSettings, grid: GridIntensity, base: np.ndarray, energy: np.ndarray) -> np.ndarray:
+    # Managed load (hours x scenarios) that flattens base + EV load, for the scenarios' annual energy.
+    profiles = default_profiles()
+    mix = _mix(settings)
+    days = grid.days
+    day_energy = energy[:, None] / days
+    load = np.zeros((len(energy), days, HOURS_PER_DAY))
+    for loc, (share, flexible) in mix.items():
+        load += (day_energy * share * (1.0 - flexible))[..., None] * profiles[loc][0]
+    system = load + base.reshape(days, HOURS_PER_DAY)
+    for loc, (share, flexible) in mix.items():
+        if flexible <= 0:
+            continue
+        available = profiles[loc][1]
+        fill = water_fill(np.where(available, system, np.inf), day_energy * share * flexible)
+        load += fill
+        system += fill
+    return load.reshape(len(energy), -1).T
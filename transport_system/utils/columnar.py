@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Tuple
+
+import numpy as np
+
+from transport_system.utils.io import ensure_dir, read_json, write_json
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# A compiled dataset is a directory holding one ``.npy`` file per column and a manifest:
+#
+#   manifest.json                      schema, row counts and data version
+#   <dataset>/<column>.npy             numeric columns, loaded with mmap_mode="r"
+#   <dataset>/<column>.codes.npy       string columns, dictionary-encoded
+#   <dataset>/<column>.categories.npy  their categories, as a fixed-width unicode array
+#
+# Every process that opens the directory maps the same page-cached files, so loading is
+# near-constant time and nothing is copied into worker memory until it is touched. The manifest
+# stays O(columns): categories of per-row identifiers would otherwise make it grow with the rows.
+
+MANIFEST = "manifest.json"
+FORMAT = "transport-system-columnar"
+FORMAT_VERSION = 2
+
+
+def is_compiled(path: str | Path) -> bool:
+    return (Path(path) / MANIFEST).is_file()
+
+
+def write_columnar(frames: Dict[str, pd.DataFrame], out_dir: str | Path, data_version: str = "") -> Dict[str, Any]:
+    """Write DataFrames as typed column files plus a manifest; returns the manifest."""
+    import pandas as pd
+
+    out = ensure_dir(out_dir)
+    (out / MANIFEST).unlink(missing_ok=True)
+    datasets: Dict[str, Any] = {}
+    for name, df in frames.items():
+        ds_dir = ensure_dir(out / name)
+        columns = []
+        for col in df.columns:
+            series = df[col]
+            if pd.api.types.is_numeric_dtype(series):
+                arr = np.ascontiguousarray(series.to_numpy())
+                fname = f"{col}.npy"
+                np.save(ds_dir / fname, arr, allow_pickle=False)
+                columns.append({"name": col, "kind": "numeric", "dtype": arr.dtype.str, "file": fname})
+            else:
+                cat = pd.Categorical(series.astype(str))
+                fname = f"{col}.codes.npy"
+                cat_name = f"{col}.categories.npy"
+                np.save(ds_dir / fname, np.ascontiguousarray(cat.codes), allow_pickle=False)
+                np.save(ds_dir / cat_name, np.asarray(cat.categories, dtype=str), allow_pickle=False)
+                columns.append(
+                    {
+                        "name": col,
+                        "kind": "category",
+                        "dtype": cat.codes.dtype.str,
+                        "file": fname,
+                        "categories_file": cat_name,
+                    }
+                )
+        datasets[name] = {"rows": int(len(df)), "columns": columns}
+
+    manifest = {
+        "format": FORMAT,
+        "format_version": FORMAT_VERSION,
+        "data_version": data_version,
+        "datasets": datasets,
+    }
+    # Manifest last, so a half-written directory is never mistaken for a compiled dataset.
+    write_json(out / MANIFEST, manifest)
+    return manifest
+
+
+def _open(path: str | Path) -> Tuple[Path, Dict[str, Any]]:
+    root = Path(path)
+    manifest = read_json(root / MANIFEST)
+    if manifest.get("format") != FORMAT or manifest.get("format_version") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compiled dataset at {root}: {manifest.get('format')!r}")
+    return root, manifest
+
+
+def read_columns(
+    path: str | Path, datasets: Tuple[str, ...] | None = None
+) -> Tuple[Dict[str, Dict[str, np.ndarray]], Dict[str, Any]]:
+    """Memory-map a compiled dataset as plain column arrays, without importing pandas.
+
+    String columns are decoded to object arrays; ``datasets`` limits which tables are opened.
+    """
+    root, manifest = _open(path)
+    tables: Dict[str, Dict[str, np.ndarray]] = {}
+    for name, spec in manifest["datasets"].items():
+        if datasets is not None and name not in datasets:
+            continue
+        cols: Dict[str, np.ndarray] = {}
+        for col in spec["columns"]:
+            arr = np.load(root / name / col["file"], mmap_mode="r", allow_pickle=False)
+            if col["kind"] == "category":
+                categories = np.load(root / name / col["categories_file"], mmap_mode="r", allow_pickle=False)
+                arr = categories.astype(object)[arr]
+            cols[col["name"]] = arr
+        tables[name] = cols
+    return tables, manifest
+
+
+def read_columnar(path: str | Path) -> Tuple[Dict[str, pd.DataFrame], Dict[str, Any]]:
+    """Memory-map a compiled dataset; columns are read-only views over the column files."""
+    import pandas as pd
+
+    root, manifest = _open(path)
+    frames: Dict[str, pd.DataFrame] = {}
+    for name, spec in manifest["datasets"].items():
+        cols: Dict[str, Any] = {}
+        for col in spec["columns"]:
+            arr = np.load(root / name / col["file"], mmap_mode="r", allow_pickle=False)
+            if col["kind"] == "category":
+                categories = np.load(root / name / col["categories_file"], mmap_mode="r", allow_pickle=False)
+                dtype = pd.CategoricalDtype(pd.Index(categories.astype(object), copy=False))
+                cols[col["name"]] = pd.Categorical.from_codes(arr, dtype=dtype, validate=False)
+            else:
+                cols[col["name"]] = arr
+        frames[name] = pd.DataFrame(cols, copy=False)
+    return frames, manifest
+
+
+def main(argv: list[str] | None = None) -> None:
+    from transport_system.agents.data_agent import DataAgent
+
+    parser = argparse.ArgumentParser(description="Compile the CSV datasets into the memory-mappable columnar format")
+    parser.add_argument("src", nargs="?", default="data", help="directory with the CSV layout of data/")
+    parser.add_argument("dst", nargs="?", default="data/compiled", help="output directory")
+    args = parser.parse_args(argv)
+
+    manifest = DataAgent(args.src, cache=None).compile(args.dst)
+    rows = {name: spec["rows"] for name, spec in manifest["datasets"].items()}
+    print(f"compiled {args.src} -> {args.dst} (data_version={manifest['data_version']}, rows={rows})")
+
+
+if __name__ == "__main__":
+    main()
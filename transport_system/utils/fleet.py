@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict
+
+import numpy as np
+
+from transport_system.config import FleetSettings, IndiaDefaults
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def weibull_survival(ages: np.ndarray, median_years: float, shape: float) -> np.ndarray:
+    """Share of a vintage still on the road at each age (Weibull, 0.5 at ``median_years``)."""
+    scale = median_years / np.log(2.0) ** (1.0 / shape)
+    return np.exp(-((np.maximum(ages, 0.0) / scale) ** shape))
+
+
+def logistic_trajectory(years: np.ndarray, final: np.ndarray | float, midpoint: np.ndarray | float, steepness: np.ndarray | float = 0.35) -> np.ndarray:
+    """S-curve ``final / (1 + exp(-steepness * (year - midpoint)))`` as a years x scenarios array.
+
+    The parameters may be per-scenario arrays, e.g. EV sales shares reaching different final shares
+    at different speeds.
+    """
+    years = np.asarray(years, dtype=np.float64)[:, None]
+    final, midpoint, steepness = (np.atleast_1d(np.asarray(p, dtype=np.float64)) for p in (final, midpoint, steepness))
+    return final / (1.0 + np.exp(-steepness * (years - midpoint)))
+
+
+def linear_trajectory(years: np.ndarray, start: np.ndarray | float, end: np.ndarray | float) -> np.ndarray:
+    """Straight line from ``start`` in the first year to ``end`` in the last, as years x scenarios."""
+    years = np.asarray(years, dtype=np.float64)
+    t = (years - years[0]) / max(years[-1] - years[0], 1.0)
+    start, end = (np.atleast_1d(np.asarray(p, dtype=np.float64)) for p in (start, end))
+    return start + (end - start) * t[:, None]
+
+
+@dataclass
+class FleetProjection:
+    """Yearly fleet outputs, each a years x scenarios array in ``values``."""
+
+    years: np.ndarray
+    values: Dict[str, np.ndarray]
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.values[name]
+
+    def cumulative(self, name: str = "total_co2_kg") -> np.ndarray:
+        """Sum over the horizon per scenario, e.g. the cumulative CO₂ of each pathway."""
+        return self.values[name].sum(axis=0)
+
+    def to_frame(self) -> pd.DataFrame:
+        """Long table with one row per year and scenario."""
+        import pandas as pd
+
+        n_years, n_scenarios = next(iter(self.values.values())).shape
+        return pd.DataFrame(
+            {
+                "year": np.repeat(self.years, n_scenarios),
+                "scenario": np.tile(np.arange(n_scenarios), n_years),
+                **{name: v.ravel() for name, v in self.values.items()},
+            }
+        )
+
+
+def vintage_weights(
+    years: np.ndarray,
+    vintages: np.ndarray,
+    sales: np.ndarray,
+    survival: np.ndarray,
+    mileage: np.ndarray,
+) -> np.ndarray:
+    """Vehicle-km in each year driven by one sold vehicle's worth of each vintage, times its sales.
+
+    Entry ``[y, v]`` is ``sales[v] * survival[age] * mileage[age]`` with ``age = year - vintage``
+    (zero for vintages not yet sold), indexed by age into the per-age curves.
+    """
+    age = years[:, None] - vintages[None, :]
+    alive = (age >= 0) & (age < len(survival))
+    idx = np.clip(age, 0, len(survival) - 1)
+    return np.where(alive, sales[None, :] * survival[idx] * mileage[idx], 0.0)
+
+
+def project_fleet(
+    settings: FleetSettings,
+    defaults: IndiaDefaults,
+    ev_sales_share: np.ndarray,
+    grid_factor: np.ndarray | float,
+    base_vehicle_km: float | None = None,
+) -> FleetProjection:
+    """Stock-turnover projection of vehicle-km, energy and CO₂ by powertrain, per year and scenario.
+
+    Vintages are sold at a growing rate and retire along the survival curve; vintages sold before
+    ``settings.start_year`` make up the base-year stock and carry ``settings.initial_ev_share``, later
+    ones the EV share of sales in ``ev_sales_share`` (years, or years x scenarios). Energy per km
+    improves by model year. ``grid_factor`` (scalar, years, or years x scenarios) prices EV energy;
+    ICE energy uses the tank-to-wheel factor. With ``base_vehicle_km``, vehicle-km and energy are
+    scaled so the first year's total matches it.
+
+    The years x vintages x scenarios tensor is never materialised: its scenario dependence is only
+    the sales share, so every output is a (years x vintages) @ (vintages x scenarios) product.
+    """
+    start = settings.start_year
+    years = np.arange(start, settings.end_year + 1)
+    ages = np.arange(settings.max_age + 1)
+    vintages = np.arange(start - settings.max_age, settings.end_year + 1)
+
+    share = np.asarray(ev_sales_share, dtype=np.float64)
+    share = share[:, None] if share.ndim == 1 else share
+    if share.ndim != 2 or share.shape[0] != len(years):
+        raise ValueError(f"ev_sales_share needs one row per year {start}-{settings.end_year} ({len(years)})")
+    n_scenarios = share.shape[1]
+    past = np.full((settings.max_age, n_scenarios), settings.initial_ev_share)
+    ev_share = np.clip(np.vstack([past, share]), 0.0, 1.0)
+
+    survival = weibull_survival(ages, settings.survival_median_years, settings.survival_shape)
+    mileage = settings.vkm_per_vehicle * (1.0 - settings.mileage_decline) ** ages
+    # Sales grow at the same rate before and after the base year; their level makes the base-year
+    # stock (vintages start - max_age ... start, at ages max_age ... 0) equal base_stock.
+    growth = (1.0 + settings.sales_growth) ** (vintages - start)
+    sales = growth * settings.base_stock / float((growth[: settings.max_age + 1] * survival[::-1]).sum())
+
+    stock_w = vintage_weights(years, vintages, sales, survival, np.ones_like(mileage))
+    vkm_w = vintage_weights(years, vintages, sales, survival, mileage)
+    model_years = np.maximum(vintages - start, 0)
+    ev_kwh = defaults.ev_kwh_per_vkm * (1.0 - settings.ev_efficiency_gain) ** model_years
+    ice_kwh = defaults.petrol_mj_per_vkm / defaults.mj_per_kwh * (1.0 - settings.ice_efficiency_gain) ** model_years
+
+    scale = 1.0
+    if base_vehicle_km is not None:
+        scale = base_vehicle_km / float(vkm_w[0].sum())
+    vkm_w = vkm_w * scale
+    ev_energy_w = vkm_w * ev_kwh
+    ice_energy_w = vkm_w * ice_kwh
+
+    total_vkm = vkm_w.sum(axis=1)[:, None]
+    ev_vkm = vkm_w @ ev_share
+    ev_energy = ev_energy_w @ ev_share
+    ice_energy = ice_energy_w.sum(axis=1)[:, None] - ice_energy_w @ ev_share
+    stock = stock_w.sum(axis=1)[:, None]
+    ev_stock = stock_w @ ev_share
+
+    grid = np.asarray(grid_factor, dtype=np.float64)
+    grid = grid[:, None] if grid.ndim == 1 else grid
+    ev_co2 = ev_energy * grid
+    ice_co2 = ice_energy * defaults.ice_co2_kg_per_kwh
+
+    full = (len(years), n_scenarios)
+    values = {
+        "fleet_stock": stock,
+        "ev_stock": ev_stock,
+        "ev_stock_share": ev_stock / stock,
+        "ev_vehicle_km": ev_vkm,
+        "ice_vehicle_km": total_vkm - ev_vkm,
+        "ev_energy_kwh": ev_energy,
+        "ice_energy_kwh": ice_energy,
+        "total_energy_kwh": ev_energy + ice_energy,
+        "ev_co2_kg": ev_co2,
+        "ice_co2_kg": ice_co2,
+        "total_co2_kg": ev_co2 + ice_co2,
+    }
+    return FleetProjection(years=years, values={k: np.broadcast_to(v, full).copy() for k, v in values.items()})
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from transport_system.utils.link_table import LinkTable
+
+GROUP_KEYS = ["origin", "destination", "mode"]
+
+# Columns of the aggregated freight flow table that FreightOptimizationAgent and EmissionsAgent accept
+# in place of raw shipments. ``distance_km`` is NaN where no network distance is known; ``tonne_km``
+# covers the tonnes with a shipment or network distance, and ``unpriced_tonnes`` are those with neither.
+FLOW_COLUMNS = GROUP_KEYS + ["shipments", "tonnes", "distance_km", "tonne_km", "unpriced_tonnes"]
+
+
+def iter_shipment_chunks(source: str | Path | pd.DataFrame, chunksize: int = 1_000_000) -> Iterator[pd.DataFrame]:
+    """Yield shipments in bounded chunks from a CSV path or an (e.g. memory-mapped) DataFrame."""
+    if isinstance(source, pd.DataFrame):
+        for start in range(0, len(source), chunksize):
+            yield source.iloc[start : start + chunksize]
+        return
+    usecols = lambda c: c in {"origin", "destination", "mode", "tonnes", "distance_km"}  # noqa: E731
+    # Zone and mode labels repeat heavily; categoricals keep each chunk small and the group-by cheap.
+    dtype = {key: "category" for key in GROUP_KEYS}
+    yield from pd.read_csv(source, chunksize=chunksize, usecols=usecols, dtype=dtype)
+
+
+def aggregate_shipments(chunks: Iterable[pd.DataFrame]) -> pd.DataFrame:
+    """Stream chunks into per (origin, destination, mode) totals; memory grows with groups, not rows.
+
+    When shipments carry their own ``distance_km``, the tonnes and tonne-km of those that have one
+    are summed exactly per group (``known_tonnes``/``known_tonne_km``).
+    """
+    acc: pd.DataFrame | None = None
+    for chunk in chunks:
+        frame = pd.DataFrame(
+            {
+                "origin": chunk["origin"],
+                "destination": chunk["destination"],
+                "mode": chunk["mode"] if "mode" in chunk else "road",
+                "shipments": 1,
+                "tonnes": chunk["tonnes"].to_numpy(dtype=np.float64),
+            }
+        )
+        if "distance_km" in chunk:
+            distance = chunk["distance_km"].to_numpy(dtype=np.float64)
+            known = np.isfinite(distance)
+            frame["known_tonnes"] = np.where(known, frame["tonnes"], 0.0)
+            frame["known_tonne_km"] = np.where(known, frame["tonnes"] * distance, 0.0)
+        part = frame.groupby(GROUP_KEYS, sort=False, observed=True).sum()
+        part.index = part.index.set_levels([level.astype(str) for level in part.index.levels])
+        acc = part if acc is None else pd.concat([acc, part]).groupby(level=GROUP_KEYS, sort=False).sum()
+
+    if acc is None:
+        return pd.DataFrame(columns=GROUP_KEYS + ["shipments", "tonnes"])
+    return acc.reset_index()
+
+
+def network_distance_matrix(links: LinkTable, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """Shortest-path length (km) from every origin to every destination; NaN where unreachable/unknown."""
+    from transport_system.utils.assignment import LinkGraph
+
+    out = np.full((len(origins), len(destinations)), np.nan)
+    if not len(links) or not out.size:
+        return out
+    graph = LinkGraph(links)
+    graph.reweight(links.length_km)
+    index = graph.node_index
+    o = np.array([index.get(str(x), -1) for x in origins])
+    d = np.array([index.get(str(x), -1) for x in destinations])
+    rows, cols = np.flatnonzero(o >= 0), np.flatnonzero(d >= 0)
+    if not len(rows) or not len(cols):
+        return out
+    dist = graph.shortest_distances(o[rows])[:, d[cols]]
+    out[np.ix_(rows, cols)] = np.where(np.isfinite(dist), dist, np.nan)
+    return out
+
+
+def network_distances(links: LinkTable, origins: np.ndarray, destinations: np.ndarray) -> np.ndarray:
+    """Shortest-path length (km) over the link graph for each OD pair; NaN where unreachable/unknown."""
+    origin_labels, row = np.unique(np.asarray(origins).astype(str), return_inverse=True)
+    destination_labels, col = np.unique(np.asarray(destinations).astype(str), return_inverse=True)
+    return network_distance_matrix(links, origin_labels, destination_labels)[row, col]
+
+
+def freight_flows(
+    source: str | Path | pd.DataFrame,
+    links: LinkTable | pd.DataFrame | None = None,
+    chunksize: int = 1_000_000,
+) -> pd.DataFrame:
+    """Aggregate a shipment log into the flow table, with distances taken from the link network."""
+    flows = aggregate_shipments(iter_shipment_chunks(source, chunksize))
+    distance = np.full(len(flows), np.nan)
+    if links is not None and len(flows):
+        distance = network_distances(
+            LinkTable.coerce(links), flows["origin"].to_numpy(), flows["destination"].to_numpy()
+        )
+    flows["distance_km"] = distance
+    unknown = flows["tonnes"].to_numpy()
+    tonne_km = np.zeros(len(flows))
+    if "known_tonne_km" in flows:
+        # Shipment-level distances, where given, win over the network distance; the network distance
+        # only covers the tonnes of the group's shipments that had none.
+        unknown = unknown - flows["known_tonnes"].to_numpy()
+        tonne_km = flows["known_tonne_km"].to_numpy()
+        flows = flows.drop(columns=["known_tonnes", "known_tonne_km"])
+    unknown = np.maximum(unknown, 0.0)
+    routed = np.isfinite(distance)
+    flows["tonne_km"] = tonne_km + np.where(routed, unknown * np.nan_to_num(distance), 0.0)
+    flows["unpriced_tonnes"] = np.where(routed, 0.0, unknown)
+    return flows[FLOW_COLUMNS]
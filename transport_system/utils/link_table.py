@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Mapping
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class LinkTable:
+    """Struct-of-arrays view of ``traffic_links`` for whole-network array operations."""
+
+    link_id: np.ndarray
+    from_node: np.ndarray
+    to_node: np.ndarray
+    length_km: np.ndarray
+    free_flow_time_min: np.ndarray
+    capacity_vph: np.ndarray
+
+    @classmethod
+    def from_frame(cls, traffic_links: pd.DataFrame) -> "LinkTable":
+        def _num(col: str) -> np.ndarray:
+            return np.ascontiguousarray(traffic_links[col].to_numpy(dtype=np.float64))
+
+        def _obj(col: str) -> np.ndarray:
+            if col in traffic_links:
+                return traffic_links[col].to_numpy(dtype=object)
+            return np.empty(len(traffic_links), dtype=object)
+
+        return cls(
+            link_id=_obj("link_id"),
+            from_node=_obj("from_node"),
+            to_node=_obj("to_node"),
+            length_km=_num("length_km"),
+            free_flow_time_min=_num("free_flow_time_min"),
+            capacity_vph=_num("capacity_vph"),
+        )
+
+    @classmethod
+    def from_columns(cls, columns: Mapping[str, np.ndarray]) -> "LinkTable":
+        """Build from plain column arrays (e.g. ``read_columns`` output), without pandas."""
+        n = len(columns["length_km"])
+
+        def _obj(col: str) -> np.ndarray:
+            return np.asarray(columns[col], dtype=object) if col in columns else np.empty(n, dtype=object)
+
+        return cls(
+            link_id=_obj("link_id"),
+            from_node=_obj("from_node"),
+            to_node=_obj("to_node"),
+            length_km=np.ascontiguousarray(columns["length_km"], dtype=np.float64),
+            free_flow_time_min=np.ascontiguousarray(columns["free_flow_time_min"], dtype=np.float64),
+            capacity_vph=np.ascontiguousarray(columns["capacity_vph"], dtype=np.float64),
+        )
+
+    @classmethod
+    def coerce(cls, links: "LinkTable | pd.DataFrame") -> "LinkTable":
+        return links if isinstance(links, cls) else cls.from_frame(links)
+
+    def __len__(self) -> int:
+        return int(self.length_km.shape[0])
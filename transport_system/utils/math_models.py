@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-import math
+import numpy as np
 
 
 def emissions(activity: float, emission_factor: float) -> float:
@@ -29,15 +29,6 @@ def efficiency(output: float, energy: float, time: float, cost: float) -> float:
     return output / denom if denom > 0 else 0.0
 
 
-def accessibility(opportunities, beta: float, costs) -> float:
-    # Accessibility = Σ (Oj × e^(-βcij))
-    # opportunities and costs are aligned iterables.
-    total = 0.0
-    for oj, cij in zip(opportunities, costs, strict=False):
-        total += float(oj) * math.exp(-beta * float(cij))
-    return total
-
-
 def bpr_travel_time(
     free_flow_time: float, volume: float, capacity: float, alpha: float = 0.15, beta: float = 4.0
 ) -> float:
@@ -47,3 +38,30 @@ def bpr_travel_time(
     x = max(volume / capacity, 0.0)
     return free_flow_time * (1.0 + alpha * (x**beta))
 
+
+def bpr_travel_time_array(
+    free_flow_time: np.ndarray,
+    volume: np.ndarray | float,
+    capacity: np.ndarray,
+    alpha: float = 0.15,
+    beta: float = 4.0,
+) -> np.ndarray:
+    # Vectorised BPR over whole link arrays; same semantics as bpr_travel_time.
+    free_flow_time = np.asarray(free_flow_time, dtype=np.float64)
+    capacity = np.asarray(capacity, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x = np.maximum(volume / capacity, 0.0)
+        # The standard beta=4 is two squarings, several times cheaper than a generic power.
+        xb = np.square(np.square(x)) if beta == 4.0 else np.power(x, beta)
+        tt = free_flow_time * (1.0 + alpha * xb)
+    return np.where(capacity > 0, tt, np.inf)
+
+
+def efficiency_array(output, energy, time, cost) -> np.ndarray:
+    # Efficiency = Output / (Energy + Time + Cost), element-wise.
+    output = np.asarray(output, dtype=np.float64)
+    denom = np.asarray(energy, dtype=np.float64) + np.asarray(time, dtype=np.float64) + np.asarray(cost, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = output / denom
+    return np.where(denom > 0, out, 0.0)
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+def _dominated_by(points: np.ndarray, by: np.ndarray, chunk_cells: int = 4_000_000) -> np.ndarray:
+    """Mask of ``points`` weakly dominated (all objectives <=) by any row of ``by``."""
+    out = np.zeros(len(points), dtype=bool)
+    if not len(by) or not len(points):
+        return out
+    step = max(chunk_cells // (len(by) * points.shape[1]), 1)
+    for lo in range(0, len(points), step):
+        p = points[lo : lo + step, None, :]
+        out[lo : lo + step] = (by[None, :, :] <= p).all(axis=2).any(axis=1)
+    return out
+
+
+def nondominated(points: np.ndarray, chunk: int = 2_048) -> np.ndarray:
+    """Indices of the non-dominated rows of ``points`` (minimisation), duplicates kept once.
+
+    After a lexicographic sort no row can be dominated by a later one. Two objectives then reduce
+    to a running minimum and three to a sweep over a 2-D staircase (O(n log n)); more objectives
+    check each chunk against the rows kept so far (sort-filter-skyline).
+    """
+    n, k = points.shape
+    order = np.lexsort(points.T[::-1])
+    p = points[order]
+    if k == 1:
+        return order[:1]
+    if k == 2:
+        earlier = np.concatenate([[np.inf], np.minimum.accumulate(p[:-1, 1])])
+        return order[p[:, 1] < earlier]
+    if k == 3:
+        # Staircase of the kept (f2, f3) pairs: f2 strictly increasing, f3 strictly decreasing.
+        ys: list = []
+        zs: list = []
+        alive = np.zeros(n, dtype=bool)
+        for i, (y, z) in enumerate(zip(p[:, 1].tolist(), p[:, 2].tolist())):
+            j = bisect_right(ys, y)
+            if j and zs[j - 1] <= z:
+                continue
+            lo = hi = bisect_left(ys, y)
+            while hi < len(zs) and zs[hi] >= z:
+                hi += 1
+            ys[lo:hi] = [y]
+            zs[lo:hi] = [z]
+            alive[i] = True
+        return order[alive]
+
+    kept = np.empty(0, dtype=np.int64)
+    for lo in range(0, n, chunk):
+        idx = np.arange(lo, min(lo + chunk, n))
+        q = p[idx]
+        alive = ~_dominated_by(q, p[kept])
+        # Weak dominance within the chunk, restricted to earlier rows (lower triangle).
+        le = (q[None, :, :] <= q[:, None, :]).all(axis=2) & np.tri(len(q), k=-1, dtype=bool)
+        alive &= ~(le & alive[None, :]).any(axis=1)
+        kept = np.concatenate([kept, idx[alive]])
+    return order[kept]
+
+
+class ParetoFrontier:
+    """Non-dominated set of a stream of points, minimising every objective.
+
+    ``add`` takes blocks of (objectives, payload) rows. With two or three objectives, a grid over
+    all but the last objective stores, per cell, the lowest last objective among frontier points at
+    or below that cell, so most dominated candidates are rejected with one vectorised lookup; the
+    rest are merged with the frontier by ``nondominated``. Memory is the frontier plus one block,
+    regardless of how many points stream through.
+    """
+
+    def __init__(self, objectives: Sequence[str], payload: Sequence[str] = (), grid: int = 64) -> None:
+        self.objectives = tuple(objectives)
+        self.payload = tuple(payload)
+        self.grid = grid
+        self.values = np.empty((0, len(self.objectives)))
+        self.data = np.empty((0, len(self.payload)))
+        self.seen = 0
+        self._edges: list = []
+        self._bound: np.ndarray | None = None
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _build_index(self) -> None:
+        k = len(self.objectives)
+        if not 2 <= k <= 3 or not len(self.values):
+            self._bound = None
+            return
+        lead = self.values[:, : k - 1]
+        # Quantile edges keep cells balanced; edges[-1] is the maximum, so every point has a cell.
+        q = np.linspace(0.0, 1.0, self.grid)
+        self._edges = [np.unique(np.quantile(lead[:, d], q)) for d in range(k - 1)]
+        cells = tuple(np.searchsorted(e, lead[:, d], "left") for d, e in enumerate(self._edges))
+        bound = np.full(tuple(len(e) for e in self._edges), np.inf)
+        np.minimum.at(bound, cells, self.values[:, -1])
+        for axis in range(k - 1):
+            bound = np.minimum.accumulate(bound, axis=axis)
+        self._bound = bound
+
+    def _prefilter(self, values: np.ndarray) -> np.ndarray:
+        """Mask of rows not already (weakly) dominated according to the grid index."""
+        if self._bound is None:
+            return np.ones(len(values), dtype=bool)
+        k = len(self.objectives)
+        # A candidate in cell i has edges[i] <= value, and frontier points binned at or below i are <= edges[i].
+        cells = [np.searchsorted(e, values[:, d], "right") - 1 for d, e in enumerate(self._edges)]
+        inside = np.logical_and.reduce([c >= 0 for c in cells])
+        bound = np.full(len(values), np.inf)
+        bound[inside] = self._bound[tuple(c[inside] for c in cells)]
+        return values[:, k - 1] < bound
+
+    def add(self, values: np.ndarray, data: np.ndarray | None = None) -> int:
+        """Merge a block of points; returns how many of them joined the frontier."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.objectives))
+        data = np.empty((len(values), 0)) if data is None else np.asarray(data, dtype=np.float64).reshape(len(values), -1)
+        self.seen += len(values)
+        finite = np.isfinite(values).all(axis=1)
+        values, data = values[finite], data[finite]
+
+        keep = self._prefilter(values)
+        if not keep.any():
+            return 0
+        # The frontier goes first, so a candidate equal to a frontier point is the one dropped.
+        merged = np.concatenate([self.values, values[keep]])
+        idx = np.sort(nondominated(merged))
+        added = int((idx >= len(self.values)).sum())
+        self.values = merged[idx]
+        self.data = np.concatenate([self.data, data[keep]])[idx]
+        if added:
+            self._build_index()
+        return added
+
+    def to_frame(self, signs: Dict[str, float] | None = None) -> pd.DataFrame:
+        """Columnar frontier (payload columns, then objectives), sorted by the first objective.
+
+        ``signs`` maps objectives stored negated (maximised) back to their natural sign.
+        """
+        order = np.lexsort(self.values.T[::-1])
+        columns = {name: self.data[order, j] for j, name in enumerate(self.payload)}
+        for j, name in enumerate(self.objectives):
+            columns[name] = self.values[order, j] * (signs or {}).get(name, 1.0)
+        return pd.DataFrame(columns)
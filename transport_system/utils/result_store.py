@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from transport_system.schemas import LEVERS, KpiRecord, Scenario
+from transport_system.utils.io import ensure_dir
+
+# Bump when a model change alters KPIs for unchanged scenarios, configs and data.
+MODEL_VERSION = "1"
+
+# SQLite caps bound parameters per statement; lookups go in batches of this size.
+_BATCH = 900
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS layouts (id INTEGER PRIMARY KEY, names TEXT UNIQUE NOT NULL);
+CREATE TABLE IF NOT EXISTS results (
+    key BLOB PRIMARY KEY,
+    data_version TEXT NOT NULL,
+    config_version TEXT NOT NULL,
+    layout INTEGER NOT NULL,
+    kpis BLOB NOT NULL,
+    last_used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS results_last_used ON results (last_used);
+CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL NOT NULL);
+INSERT OR IGNORE INTO meta VALUES ('bytes', 0);
+"""
+
+# Stored bytes per row besides the KPI values (key, versions, index entry), for eviction accounting.
+_ROW_OVERHEAD = 96
+
+
+def canonical_levers(scenario: Scenario) -> Tuple[float, ...]:
+    """Lever values that determine a scenario's KPIs (the name does not)."""
+    return tuple(float(getattr(scenario, name)) for name in LEVERS)
+
+
+def result_key(levers: Sequence[float], config_version: str, data_version: str) -> bytes:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(levers, dtype=np.float64).tobytes())
+    h.update(f"\0{config_version}\0{data_version}".encode())
+    return h.digest()
+
+
+class ResultStore:
+    """Durable KPI store in one SQLite file, keyed by scenario, config version and data version.
+
+    KPIs are stored as float64 blobs with their names kept once per layout, so a lookup is one
+    indexed read and a ``np.frombuffer``. The database runs in WAL mode: any number of readers
+    (threads or processes) proceed alongside one writer. When the stored rows exceed
+    ``max_bytes``, the least recently used are evicted down to 90% of it; lookups only note their
+    hits in memory and the recency is written with the next insert.
+    """
+
+    def __init__(self, path: str | Path = "data/results.sqlite", max_bytes: int = 256 * 2**20) -> None:
+        self.path = Path(path)
+        ensure_dir(self.path.parent)
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._touched: set = set()
+        self._layouts: Dict[int, Tuple[str, ...]] = {}
+        self._layout_ids: Dict[Tuple[str, ...], int] = {}
+        self.hits = 0
+        self.misses = 0
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def __getstate__(self) -> Dict[str, object]:
+        # Connections and locks stay behind; a worker process reopens the same file.
+        return {"path": self.path, "max_bytes": self.max_bytes}
+
+    def __setstate__(self, state: Dict[str, object]) -> None:
+        self.__init__(**state)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def close(self) -> None:
+        self._flush_touched()
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def _names(self, layout: int) -> Tuple[str, ...]:
+        names = self._layouts.get(layout)
+        if names is None:
+            row = self._connect().execute("SELECT names FROM layouts WHERE id = ?", (layout,)).fetchone()
+            names = self._layouts[layout] = tuple(json.loads(row[0]))
+            self._layout_ids[names] = layout
+        return names
+
+    def _layout_id(self, conn: sqlite3.Connection, names: Tuple[str, ...]) -> int:
+        layout = self._layout_ids.get(names)
+        if layout is None:
+            text = json.dumps(names)
+            conn.execute("INSERT OR IGNORE INTO layouts (names) VALUES (?)", (text,))
+            layout = conn.execute("SELECT id FROM layouts WHERE names = ?", (text,)).fetchone()[0]
+            self._layout_ids[names] = layout
+            self._layouts[layout] = names
+        return layout
+
+    def get_many(self, keys: Sequence[bytes]) -> List[KpiRecord | None]:
+        """Stored KPIs for each key, ``None`` where absent."""
+        conn = self._connect()
+        found: Dict[bytes, KpiRecord] = {}
+        for lo in range(0, len(keys), _BATCH):
+            batch = keys[lo : lo + _BATCH]
+            marks = ",".join("?" * len(batch))
+            for key, layout, blob in conn.execute(
+                f"SELECT key, layout, kpis FROM results WHERE key IN ({marks})", batch
+            ):
+                found[key] = KpiRecord(self._names(layout), np.frombuffer(blob, dtype=np.float64))
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+            self._touched.update(found)
+        return [found.get(key) for key in keys]
+
+    def get(self, key: bytes) -> KpiRecord | None:
+        return self.get_many([key])[0]
+
+    def put_many(self, items: Iterable[Tuple[bytes, KpiRecord]], data_version: str, config_version: str) -> None:
+        """Insert or replace results in one transaction, then evict if over ``max_bytes``."""
+        now = time.time()
+        conn = self._connect()
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = [
+                (key, data_version, config_version, self._layout_id(conn, record.names), record.values.tobytes(), now)
+                for key, record in items
+            ]
+            keys = [r[0] for r in rows]
+            replaced = 0
+            for lo in range(0, len(keys), _BATCH):
+                batch = keys[lo : lo + _BATCH]
+                marks = ",".join("?" * len(batch))
+                replaced += conn.execute(
+                    f"SELECT COALESCE(SUM(LENGTH(kpis)), 0) + {_ROW_OVERHEAD} * COUNT(*) FROM results WHERE key IN ({marks})",
+                    batch,
+                ).fetchone()[0]
+            conn.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+            added = sum(len(r[4]) + _ROW_OVERHEAD for r in rows) - replaced
+            conn.executemany("UPDATE results SET last_used = ? WHERE key = ?", [(now, k) for k in touched])
+            total = conn.execute("UPDATE meta SET value = value + ? WHERE name = 'bytes' RETURNING value", (added,)).fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def put(self, key: bytes, record: KpiRecord, data_version: str, config_version: str) -> None:
+        self.put_many([(key, record)], data_version, config_version)
+
+    def _evict(self, conn: sqlite3.Connection, total: float) -> None:
+        target = 0.9 * self.max_bytes
+        while total > target:
+            victims = conn.execute(
+                f"SELECT key, LENGTH(kpis) + {_ROW_OVERHEAD} FROM results ORDER BY last_used LIMIT 1000"
+            ).fetchall()
+            if not victims:
+                break
+            freed = 0
+            drop = []
+            for key, size in victims:
+                drop.append((key,))
+                freed += size
+                if total - freed <= target:
+                    break
+            conn.executemany("DELETE FROM results WHERE key = ?", drop)
+            total -= freed
+        conn.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (max(total, 0.0),))
+
+    def _flush_touched(self) -> None:
+        with self._lock:
+            touched, self._touched = self._touched, set()
+        if touched:
+            self._connect().executemany("UPDATE results SET last_used = ? WHERE key = ?", [(time.time(), k) for k in touched])
+
+    def purge(self, data_version: str | None = None, config_version: str | None = None) -> int:
+        """Delete results not matching the given current versions; returns the rows removed."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = conn.execute(
+                "DELETE FROM results WHERE (? IS NOT NULL AND data_version != ?) OR (? IS NOT NULL AND config_version != ?)",
+                (data_version, data_version, config_version, config_version),
+            ).rowcount
+            size = conn.execute(f"SELECT COALESCE(SUM(LENGTH(kpis)), 0) + {_ROW_OVERHEAD} * COUNT(*) FROM results").fetchone()[0]
+            conn.execute("UPDATE meta SET value = ? WHERE name = 'bytes'", (size,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def stats(self) -> Dict[str, float]:
+        conn = self._connect()
+        size = conn.execute("SELECT value FROM meta WHERE name = 'bytes'").fetchone()[0]
+        with self._lock:
+            return {"store_hits": float(self.hits), "store_misses": float(self.misses), "store_bytes": float(size)}
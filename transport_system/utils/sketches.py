@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import numpy as np
+
+
+class StreamingHistogram:
+    """Fixed-size histogram sketch for streaming quantiles in bounded memory.
+
+    Bins are equal-width over a range that doubles (merging neighbouring bins) whenever new values
+    fall outside it, so memory is ``bins`` counters regardless of how many values are added and the
+    quantile error is at most one bin width, i.e. ``(max - min) / bins`` up to a factor of two.
+    """
+
+    def __init__(self, bins: int = 4096) -> None:
+        if bins < 2 or bins % 2:
+            raise ValueError("bins must be an even number >= 2")
+        self.bins = bins
+        self.counts = np.zeros(bins, dtype=np.int64)
+        self.lo = 0.0
+        self.width = 0.0
+        self.count = 0
+        self.total = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    @property
+    def hi(self) -> float:
+        return self.lo + self.width * self.bins
+
+    def _grow(self, vmin: float, vmax: float) -> None:
+        while vmin < self.lo or vmax >= self.hi:
+            merged = self.counts.reshape(-1, 2).sum(axis=1)
+            self.counts[:] = 0
+            if vmin < self.lo:
+                # Extend downwards: the old range becomes the upper half.
+                self.counts[self.bins // 2 :] = merged
+                self.lo -= self.width * self.bins
+            else:
+                self.counts[: self.bins // 2] = merged
+            self.width *= 2.0
+
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[np.isfinite(values)]
+        if not values.size:
+            return
+        vmin, vmax = float(values.min()), float(values.max())
+        if self.count == 0:
+            span = vmax - vmin
+            pad = span * 0.05 if span > 0 else max(abs(vmin), 1.0) * 1e-6
+            self.lo = vmin - pad
+            self.width = (span + 2 * pad) / self.bins
+        else:
+            self._grow(vmin, vmax)
+
+        idx = np.minimum(((values - self.lo) / self.width).astype(np.int64), self.bins - 1)
+        self.counts += np.bincount(idx, minlength=self.bins)
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.min = min(self.min, vmin)
+        self.max = max(self.max, vmax)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else float("nan")
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return float("nan")
+        cum = np.cumsum(self.counts)
+        target = q * self.count
+        i = int(np.searchsorted(cum, target, side="left"))
+        i = min(i, self.bins - 1)
+        before = cum[i - 1] if i > 0 else 0
+        frac = (target - before) / self.counts[i] if self.counts[i] else 0.0
+        value = self.lo + (i + frac) * self.width
+        return float(min(max(value, self.min), self.max))
@@ -0,0 +1,276 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from transport_system.utils.io import ensure_dir, read_json, write_json
+from transport_system.utils.link_table import LinkTable
+
+# A skim is a directory under the store root named after its key (network version + link-time state):
+#
+#   manifest.json       zones, dtype, versions; written last
+#   time.npy            zones x zones shortest-path time (min)        \
+#   distance.npy        zones x zones length of those paths (km)       } loaded with mmap_mode="r"
+#   node_time.npy       zones x nodes tree times  \  kept so later link edits can tell which
+#   pred.npy            zones x nodes tree preds  /  origin trees they touch
+#   link_time.npy, link_length.npy                   the per-link state the trees were grown on
+
+MANIFEST = "manifest.json"
+FORMAT = "transport-system-skim"
+FORMAT_VERSION = 1
+# Relative slack when testing whether a cheaper link could enter a tree; errs towards recomputing.
+_IMPROVE_TOL = 1e-6
+
+
+def _hash(*parts: bytes) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        h.update(part)
+        h.update(b"\x1f")
+    return h.hexdigest()
+
+
+def _labels(arr: np.ndarray) -> bytes:
+    return "\x1f".join(map(str, arr)).encode()
+
+
+def topology_version(links: LinkTable) -> str:
+    """Hash of link ids and endpoints; skims with the same topology can be updated incrementally."""
+    return _hash(_labels(links.link_id), _labels(links.from_node), _labels(links.to_node))
+
+
+def network_version(links: LinkTable) -> str:
+    """Hash of the full link table (topology, lengths, free-flow times and capacities)."""
+    return _hash(
+        topology_version(links).encode(),
+        np.ascontiguousarray(links.length_km, dtype=np.float64).tobytes(),
+        np.ascontiguousarray(links.free_flow_time_min, dtype=np.float64).tobytes(),
+        np.ascontiguousarray(links.capacity_vph, dtype=np.float64).tobytes(),
+    )
+
+
+def _tree_length(graph, pred: np.ndarray, link_length: np.ndarray) -> np.ndarray:
+    """Length along each shortest-path tree from its root, accumulated level by level."""
+    from transport_system.utils.assignment import _tree_depth
+
+    b, n = pred.shape
+    rows_off = (np.arange(b, dtype=np.int64) * n)[:, None]
+    flat_pred = np.where(pred >= 0, pred.astype(np.int64) + rows_off, -1).ravel()
+    has = np.flatnonzero(flat_pred >= 0)
+    edge = np.zeros(b * n)
+    edge[has] = link_length[graph.tree_links(flat_pred[has] % n, has % n)]
+
+    depth = _tree_depth(flat_pred)
+    order = np.argsort(depth, kind="stable")
+    out = np.zeros(b * n)
+    pos = 0
+    for size in np.bincount(depth):
+        idx = order[pos : pos + size]
+        pos += size
+        child = idx[flat_pred[idx] >= 0]
+        out[child] = out[flat_pred[child]] + edge[child]
+    return out.reshape(b, n)
+
+
+@dataclass
+class Skim:
+    """Zone-to-zone time and distance matrices, memory-mapped from a ``SkimStore`` entry."""
+
+    path: Path
+    zones: Tuple[str, ...]
+    time: np.ndarray
+    distance: np.ndarray
+    manifest: Dict[str, Any]
+
+    @property
+    def key(self) -> str:
+        return self.path.name
+
+    def zone_index(self) -> Dict[str, int]:
+        return {z: i for i, z in enumerate(self.zones)}
+
+    def cost_blocks(self, block: int = 1024) -> Iterator[Tuple[int, np.ndarray]]:
+        """Row blocks of the time matrix, e.g. for ``gravity_accessibility``."""
+        for start in range(0, len(self.zones), block):
+            yield start, self.time[start : start + block]
+
+
+class SkimStore:
+    """On-disk cache of shortest-path skims keyed by network version and link-time state.
+
+    ``get`` returns a memory-mapped skim if one exists for exactly these links and times. Otherwise,
+    if the store holds a skim over the same topology and zones, it is copied and only the origin
+    trees touched by the changed links are regrown; failing that, all trees are built in blocks of
+    ``block`` origins.
+    """
+
+    def __init__(self, root: str | Path = "data/skims", block: int = 256, dtype: str = "float32") -> None:
+        self.root = Path(root)
+        self.block = block
+        self.dtype = np.dtype(dtype)
+        self.last_update: Dict[str, float] = {}
+
+    def key(self, links: LinkTable, zones: Sequence[str], link_time: np.ndarray) -> str:
+        return _hash(
+            network_version(links).encode(),
+            np.ascontiguousarray(link_time, dtype=np.float64).tobytes(),
+            _labels(np.asarray(zones, dtype=object)),
+            self.dtype.str.encode(),
+        )
+
+    def get(self, links, zones: Sequence[str], link_time: np.ndarray | None = None) -> Skim:
+        """Skim over ``zones`` with ``link_time`` per link (free-flow times when None, else e.g. loaded times)."""
+        links = LinkTable.coerce(links)
+        zones = tuple(str(z) for z in zones)
+        link_time = links.free_flow_time_min if link_time is None else np.asarray(link_time, dtype=np.float64)
+        key = self.key(links, zones, link_time)
+        path = self.root / key
+        if (path / MANIFEST).is_file():
+            self.last_update = {"recomputed_origins": 0.0, "origins": float(len(zones))}
+            return self.load(path)
+
+        base = self._find_base(topology_version(links), zones)
+        tmp = ensure_dir(self.root / f".{key}.{os.getpid()}.tmp")
+        try:
+            if base is None:
+                self._build(tmp, links, zones, link_time)
+            else:
+                self._update(tmp, base, links, zones, link_time)
+            self._write_manifest(tmp, links, zones)
+            try:
+                os.replace(tmp, path)
+            except OSError:
+                # Another process published the same key first; theirs is equivalent.
+                shutil.rmtree(tmp, ignore_errors=True)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        return self.load(path)
+
+    @staticmethod
+    def load(path: str | Path) -> Skim:
+        path = Path(path)
+        manifest = read_json(path / MANIFEST)
+        if manifest.get("format") != FORMAT or manifest.get("format_version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported skim at {path}: {manifest.get('format')!r}")
+        return Skim(
+            path=path,
+            zones=tuple(manifest["zones"]),
+            time=np.load(path / "time.npy", mmap_mode="r"),
+            distance=np.load(path / "distance.npy", mmap_mode="r"),
+            manifest=manifest,
+        )
+
+    def _find_base(self, topology: str, zones: Tuple[str, ...]) -> Path | None:
+        if not self.root.is_dir():
+            return None
+        candidates = []
+        for manifest_path in self.root.glob(f"*/{MANIFEST}"):
+            manifest = read_json(manifest_path)
+            if (
+                manifest.get("format_version") == FORMAT_VERSION
+                and manifest.get("topology_version") == topology
+                and manifest.get("dtype") == self.dtype.str
+                and tuple(manifest.get("zones", ())) == zones
+            ):
+                candidates.append(manifest_path)
+        if not candidates:
+            return None
+        return max(candidates, key=lambda p: p.stat().st_mtime_ns).parent
+
+    def _graph(self, links: LinkTable, zones: Tuple[str, ...], link_time: np.ndarray):
+        from transport_system.utils.assignment import LinkGraph
+
+        graph = LinkGraph(links, extra_nodes=np.asarray(zones, dtype=object))
+        graph.reweight(link_time)
+        nodes = np.fromiter((graph.node_index[z] for z in zones), dtype=np.int64, count=len(zones))
+        return graph, nodes
+
+    def _open(self, out: Path, n_zones: int, n_nodes: int, mode: str) -> Dict[str, np.ndarray]:
+        shapes = {
+            "time": (n_zones, n_zones),
+            "distance": (n_zones, n_zones),
+            "node_time": (n_zones, n_nodes),
+        }
+        arrays = {
+            name: np.lib.format.open_memmap(out / f"{name}.npy", mode=mode, dtype=self.dtype, shape=shape)
+            for name, shape in shapes.items()
+        }
+        arrays["pred"] = np.lib.format.open_memmap(
+            out / "pred.npy", mode=mode, dtype=np.int32, shape=(n_zones, n_nodes)
+        )
+        return arrays
+
+    def _grow(self, arrays, graph, nodes: np.ndarray, links: LinkTable, rows: np.ndarray) -> None:
+        for start in range(0, rows.shape[0], self.block):
+            sel = rows[start : start + self.block]
+            dist, pred = graph.shortest_trees(nodes[sel])
+            length = _tree_length(graph, pred, links.length_km)
+            length[~np.isfinite(dist)] = np.inf
+            arrays["node_time"][sel] = dist
+            arrays["pred"][sel] = pred
+            arrays["time"][sel] = dist[:, nodes]
+            arrays["distance"][sel] = length[:, nodes]
+
+    def _build(self, out: Path, links: LinkTable, zones: Tuple[str, ...], link_time: np.ndarray) -> None:
+        graph, nodes = self._graph(links, zones, link_time)
+        arrays = self._open(out, len(zones), graph.num_nodes, mode="w+")
+        self._grow(arrays, graph, nodes, links, np.arange(len(zones)))
+        self._save_state(out, arrays, links, link_time)
+        self.last_update = {"recomputed_origins": float(len(zones)), "origins": float(len(zones))}
+
+    def _update(self, out: Path, base: Path, links: LinkTable, zones: Tuple[str, ...], link_time: np.ndarray) -> None:
+        for name in ("time", "distance", "node_time", "pred"):
+            shutil.copyfile(base / f"{name}.npy", out / f"{name}.npy")
+        old_time = np.load(base / "link_time.npy")
+        old_length = np.load(base / "link_length.npy")
+
+        graph, nodes = self._graph(links, zones, link_time)
+        arrays = self._open(out, len(zones), graph.num_nodes, mode="r+")
+        new_time = np.maximum(link_time, 0.0)
+        changed = np.flatnonzero((new_time != old_time) | (links.length_km != old_length))
+
+        affected = np.zeros(len(zones), dtype=bool)
+        for link in changed:
+            u, v = graph.tail[link], graph.head[link]
+            # A link already in an origin's tree changes that tree's times or lengths ...
+            affected |= np.asarray(arrays["pred"][:, v]) == u
+            # ... and a cheaper link can pull itself into any tree it now shortcuts.
+            if new_time[link] < old_time[link]:
+                via = np.asarray(arrays["node_time"][:, u], dtype=np.float64) + new_time[link]
+                affected |= via <= np.asarray(arrays["node_time"][:, v], dtype=np.float64) * (1 + _IMPROVE_TOL)
+
+        rows = np.flatnonzero(affected)
+        self._grow(arrays, graph, nodes, links, rows)
+        self._save_state(out, arrays, links, link_time)
+        self.last_update = {
+            "recomputed_origins": float(rows.shape[0]),
+            "origins": float(len(zones)),
+            "changed_links": float(changed.shape[0]),
+        }
+
+    @staticmethod
+    def _save_state(out: Path, arrays, links: LinkTable, link_time: np.ndarray) -> None:
+        for arr in arrays.values():
+            arr.flush()
+        np.save(out / "link_time.npy", np.maximum(np.asarray(link_time, dtype=np.float64), 0.0))
+        np.save(out / "link_length.npy", np.asarray(links.length_km, dtype=np.float64))
+
+    def _write_manifest(self, out: Path, links: LinkTable, zones: Tuple[str, ...]) -> None:
+        write_json(
+            out / MANIFEST,
+            {
+                "format": FORMAT,
+                "format_version": FORMAT_VERSION,
+                "network_version": network_version(links),
+                "topology_version": topology_version(links),
+                "dtype": self.dtype.str,
+                "zones": list(zones),
+            },
+        )
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Dict
+
+import numpy as np
+
+from transport_system.utils.link_table import LinkTable
+from transport_system.utils.math_models import bpr_travel_time_array
+
+
+def default_profile(intervals: int = 96) -> np.ndarray:
+    """Illustrative weekday demand profile: hourly demand rate per interval relative to the peak hour.
+
+    Morning (09:00) and evening (18:30) peaks over a small night-time base; the maximum is 1.0, so
+    the peak interval carries ``peak_hour_trips``.
+    """
+    hours = (np.arange(intervals) + 0.5) * 24.0 / intervals
+    profile = (
+        0.04
+        + 1.00 * np.exp(-0.5 * ((hours - 9.0) / 1.2) ** 2)
+        + 0.90 * np.exp(-0.5 * ((hours - 18.5) / 1.5) ** 2)
+        + 0.45 * np.exp(-0.5 * ((hours - 13.5) / 2.5) ** 2)
+    )
+    return profile / profile.max()
+
+
+def point_queue(arrivals: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """End-of-interval queues of a point queue starting empty, along the intervals axis (-2).
+
+    Solves the Lindley recursion ``q[k] = max(0, q[k-1] + a[k] - c[k])`` in closed form,
+    ``q[k] = S[k] - min(0, min_j<=k S[j])`` with ``S`` the running sum of ``a - c``, so every
+    interval is computed in one pass over the whole array.
+    """
+    s = np.cumsum(arrivals - capacity, axis=-2)
+    return s - np.minimum.accumulate(np.minimum(s, 0.0), axis=-2)
+
+
+def simulate_day(
+    links: LinkTable,
+    peak_volume: np.ndarray | float,
+    profile: np.ndarray,
+    interval_minutes: float = 15.0,
+    improve_efficiency_factor: np.ndarray | float = 0.0,
+) -> Dict[str, np.ndarray]:
+    """Volume–delay over a day as (..., intervals, links) arrays with queues carried between intervals.
+
+    ``peak_volume`` is the peak-hour demand per link (any leading batch dims, e.g. scenarios x links);
+    each interval's demand rate is ``peak_volume * profile[k]``. Demand above capacity waits in a
+    point queue and is served in later intervals; link time is the BPR time of the served flow plus
+    the average wait of the queue. Returns per-interval network means and daily sums, each with the
+    leading batch dims.
+    """
+    profile = np.asarray(profile, dtype=np.float64)
+    dt = interval_minutes / 60.0
+    n = len(links)
+    peak_volume = np.asarray(peak_volume, dtype=np.float64)
+    # Links are the contiguous axis, so per-interval reductions below are BLAS matrix-vector products.
+    served = peak_volume[..., None, :] * (profile * dt)[:, None]
+
+    # Only links whose demand ever exceeds capacity can queue; the rest serve their arrivals as is.
+    peak_rate = peak_volume * profile.max(initial=0.0)
+    over = np.flatnonzero((peak_rate > links.capacity_vph).reshape(-1, n).any(axis=0))
+    cap_over = links.capacity_vph[over] * dt
+    arrivals_over = served[..., over]
+    queue = point_queue(arrivals_over, cap_over)
+    prev = np.concatenate([np.zeros_like(queue[..., :1, :]), queue[..., :-1, :]], axis=-2)
+    served[..., over] = arrivals_over + prev - queue
+
+    tt = bpr_travel_time_array(links.free_flow_time_min, served / dt, links.capacity_vph)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tt[..., over] += np.where(cap_over > 0, 0.5 * (prev + queue) / cap_over * dt * 60.0, 0.0)
+        tt *= 1.0 - 0.3 * np.asarray(improve_efficiency_factor, dtype=np.float64)[..., None, None]
+        inv_fft = 1.0 / links.free_flow_time_min
+
+    return {
+        "interval_travel_time_min": tt @ np.full(n, 1.0 / max(n, 1)),
+        "interval_congestion_index": tt @ (inv_fft / max(n, 1)),
+        "interval_queue_veh": queue.sum(axis=-1),
+        "daily_vehicle_km": served.sum(axis=-2) @ links.length_km,
+        "daily_vehicle_hours": np.einsum("...kl,...kl->...", served, tt) / 60.0,
+        "residual_queue_veh": queue[..., -1, :].sum(axis=-1),
+    }
+
+
+def day_kpis(day: Dict[str, np.ndarray], interval_minutes: float) -> Dict[str, np.ndarray]:
+    """Daily totals plus the KPIs of the interval with the highest average travel time."""
+    tt = day["interval_travel_time_min"]
+    peak = np.argmax(tt, axis=-1)
+    pick = lambda a: np.take_along_axis(a, peak[..., None], axis=-1)[..., 0]  # noqa: E731
+    return {
+        "daily_vehicle_km": day["daily_vehicle_km"],
+        "daily_vehicle_hours": day["daily_vehicle_hours"],
+        "peak_interval_start_h": peak * interval_minutes / 60.0,
+        "peak_interval_travel_time_min": pick(tt),
+        "peak_interval_congestion_index": pick(day["interval_congestion_index"]),
+        "max_queue_veh": day["interval_queue_veh"].max(axis=-1),
+        "residual_queue_veh": day["residual_queue_veh"],
+    }
+
+
+def daily_totals(day_factor, passenger_co2_kg, energy_kwh, energy_co2_kg, freight_co2_kg) -> Dict[str, np.ndarray]:
+    """Scale peak-hour passenger emissions and energy to the day; freight inputs are already daily."""
+    return {
+        "daily_passenger_co2_kg": passenger_co2_kg * day_factor,
+        "daily_energy_kwh": energy_kwh * day_factor,
+        "daily_system_co2_kg": (passenger_co2_kg + energy_co2_kg) * day_factor + freight_co2_kg,
+    }
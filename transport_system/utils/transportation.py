@@ -0,0 +1,395 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import numpy as np
+
+# Amounts below this (relative to total supply) count as zero when checking feasibility.
+_REL_TOL = 1e-9
+
+
+@dataclass
+class TransportationSolution:
+    """Optimal flows of a balanced transportation problem, as the basic cells of the final basis.
+
+    ``flow[k]`` tonnes go from origin ``rows[k]`` to destination ``cols[k]``; degenerate basic cells
+    carry zero. ``u`` and ``v`` are the MODI potentials (duals of the supply and demand rows).
+    """
+
+    rows: np.ndarray
+    cols: np.ndarray
+    flow: np.ndarray
+    objective: float
+    u: np.ndarray
+    v: np.ndarray
+    iterations: int
+    warm_started: bool
+
+    def dense(self, shape: Tuple[int, int]) -> np.ndarray:
+        out = np.zeros(shape)
+        np.add.at(out, (self.rows, self.cols), self.flow)
+        return out
+
+
+def _top2(sub: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Index of the cheapest entry per row of ``sub`` and the penalty (second cheapest minus cheapest)."""
+    two = np.argpartition(sub, 1, axis=1)[:, :2]
+    a = np.take_along_axis(sub, two, axis=1)
+    swap = a[:, 1] < a[:, 0]
+    first = np.where(swap, two[:, 1], two[:, 0])
+    return first, np.abs(a[:, 1] - a[:, 0])
+
+
+def vogel_start(cost: np.ndarray, supply: np.ndarray, demand: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vogel's approximation: a basic feasible solution of exactly ``m + n - 1`` cells (a spanning tree).
+
+    Each step allocates on the line (row or column) with the largest regret, i.e. the gap between its
+    two cheapest open cells. Regrets are only recomputed for lines whose two cheapest cells were just
+    closed, each in one vectorised pass, so a step costs O(m + n) plus the touched lines.
+    """
+    m, n = cost.shape
+    s = np.asarray(supply, dtype=np.float64).copy()
+    d = np.asarray(demand, dtype=np.float64).copy()
+    row_on = np.ones(m, dtype=bool)
+    col_on = np.ones(n, dtype=bool)
+    rows: List[int] = []
+    cols: List[int] = []
+    flows: List[float] = []
+
+    if m > 1 and n > 1:
+        r_first, r_pen = _top2(cost)
+        c_first, c_pen = _top2(cost.T)
+        # The runner-up per line, to find the lines a closure affects.
+        r_second = np.argpartition(cost, 1, axis=1)[:, :2].sum(axis=1) - r_first
+        c_second = np.argpartition(cost.T, 1, axis=1)[:, :2].sum(axis=1) - c_first
+        n_rows, n_cols = m, n
+        while n_rows > 1 and n_cols > 1:
+            i = int(np.argmax(r_pen))
+            j = int(np.argmax(c_pen))
+            if r_pen[i] >= c_pen[j]:
+                j = int(r_first[i])
+                close_row = s[i] <= d[j]
+            else:
+                i = int(c_first[j])
+                close_row = s[i] < d[j]
+            x = min(s[i], d[j])
+            rows.append(i)
+            cols.append(j)
+            flows.append(x)
+            s[i] -= x
+            d[j] -= x
+            # Close exactly one line per step; on a tie the other keeps a zero balance (degenerate cell).
+            if close_row:
+                row_on[i] = False
+                r_pen[i] = -np.inf
+                n_rows -= 1
+                hit = np.flatnonzero(col_on & ((c_first == i) | (c_second == i)))
+                if len(hit) and n_rows > 1:
+                    sub = np.where(row_on[None, :], cost[:, hit].T, np.inf)
+                    first, pen = _top2(sub)
+                    c_first[hit], c_pen[hit] = first, pen
+                    c_second[hit] = np.argpartition(sub, 1, axis=1)[:, :2].sum(axis=1) - first
+            else:
+                col_on[j] = False
+                c_pen[j] = -np.inf
+                n_cols -= 1
+                hit = np.flatnonzero(row_on & ((r_first == j) | (r_second == j)))
+                if len(hit) and n_cols > 1:
+                    sub = np.where(col_on[None, :], cost[hit], np.inf)
+                    first, pen = _top2(sub)
+                    r_first[hit], r_pen[hit] = first, pen
+                    r_second[hit] = np.argpartition(sub, 1, axis=1)[:, :2].sum(axis=1) - first
+
+    # One line left open: it takes every remaining open cell of the other dimension.
+    open_rows = np.flatnonzero(row_on)
+    open_cols = np.flatnonzero(col_on)
+    if len(open_rows) == 1:
+        i = int(open_rows[0])
+        for j in open_cols.tolist():
+            rows.append(i)
+            cols.append(j)
+            flows.append(d[j])
+    else:
+        j = int(open_cols[0])
+        for i in open_rows.tolist():
+            rows.append(i)
+            cols.append(j)
+            flows.append(s[i])
+    return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.maximum(np.array(flows), 0.0)
+
+
+class TransportationSolver:
+    """Transportation simplex (MODI) for ``min sum(cost * x)`` with row sums ``supply`` and column sums
+    ``demand``.
+
+    The basis is a spanning tree over the m origin and n destination nodes. Each pivot prices one
+    block of rows with NumPy (block pricing) and walks parent links for the cycle. The subtree cut
+    off by the leaving cell is a contiguous run of the tree's preorder array, so it is re-hung and
+    its potentials shifted with array slices. Supply above demand goes to a zero-cost slack
+    destination.
+
+    The final basis is kept for the next ``solve`` of the same shape. Changed costs re-use it
+    directly. Changed supplies or demands re-use it when its tree flows stay non-negative, and
+    otherwise restart from Vogel. A new optimum is then usually a few pivots away.
+    """
+
+    def __init__(self, block_cells: int = 16_384, max_iterations: int | None = None) -> None:
+        self.block_cells = block_cells
+        self.max_iterations = max_iterations
+        self._basis: Tuple[Tuple[int, int], np.ndarray, np.ndarray] | None = None
+
+    def reset(self) -> None:
+        self._basis = None
+
+    def solve(
+        self, cost: np.ndarray, supply: np.ndarray, demand: np.ndarray, warm_start: bool = True
+    ) -> TransportationSolution:
+        cost = np.ascontiguousarray(cost, dtype=np.float64)
+        supply = np.asarray(supply, dtype=np.float64)
+        demand = np.asarray(demand, dtype=np.float64)
+        m, n = cost.shape
+        if supply.shape != (m,) or demand.shape != (n,):
+            raise ValueError("supply and demand must match the cost matrix shape")
+        if (supply < 0).any() or (demand < 0).any() or not np.isfinite(cost).all():
+            raise ValueError("supplies and demands must be non-negative and costs finite")
+        total = float(supply.sum())
+        excess = total - float(demand.sum())
+        tol = _REL_TOL * max(total, 1.0)
+        if excess < -tol:
+            raise ValueError(f"demand exceeds supply by {-excess:g}; the problem is infeasible")
+        slack = excess > tol
+        if slack:
+            cost = np.hstack([cost, np.zeros((m, 1))])
+            demand = np.append(demand, excess)
+        else:
+            demand = demand * (total / max(float(demand.sum()), 1e-300))
+
+        solution = self._simplex(cost, supply, demand, warm_start, tol)
+        if slack:
+            keep = solution.cols < n
+            solution.rows, solution.cols, solution.flow = solution.rows[keep], solution.cols[keep], solution.flow[keep]
+            solution.v = solution.v[:n]
+        return solution
+
+    def _warm_basis(self, shape, supply, demand, tol):
+        if self._basis is None or self._basis[0] != shape:
+            return None
+        rows, cols = self._basis[1], self._basis[2]
+        flow = _tree_flows(shape, rows, cols, supply, demand)
+        if flow is None or flow.min() < -tol:
+            return None
+        return rows.copy(), cols.copy(), np.maximum(flow, 0.0)
+
+    def _simplex(self, cost, supply, demand, warm_start, tol) -> TransportationSolution:
+        m, n = cost.shape
+        basis = self._warm_basis((m, n), supply, demand, tol) if warm_start else None
+        warm = basis is not None
+        brow, bcol, bflow = basis if warm else vogel_start(cost, supply, demand)
+        nodes = m + n
+
+        # Tree over nodes (origins 0..m-1, destinations m..m+n-1); adj[x] maps neighbour -> basis slot.
+        adj: List[dict] = [{} for _ in range(nodes)]
+        for e, (i, j) in enumerate(zip(brow.tolist(), bcol.tolist())):
+            adj[i][m + j] = e
+            adj[m + j][i] = e
+        # Preorder of the tree from node 0, kept as arrays: a subtree is a contiguous run of ``order``
+        # (``pos`` inverts it, ``dord`` holds the depth at each position), so moving a subtree or
+        # shifting its potentials is a few NumPy slices.
+        parent = [-1] * nodes
+        pedge = [-1] * nodes
+        pot = np.zeros(nodes)
+        depth = [0] * nodes
+        preorder: List[int] = []
+        stack = [0]
+        seen = [False] * nodes
+        seen[0] = True
+        while stack:
+            x = stack.pop()
+            preorder.append(x)
+            for y, e in adj[x].items():
+                if not seen[y]:
+                    seen[y] = True
+                    parent[y], pedge[y], depth[y] = x, e, depth[x] + 1
+                    pot[y] = cost[brow[e], bcol[e]] - pot[x]
+                    stack.append(y)
+        if len(preorder) != nodes:
+            raise RuntimeError("basis is not a spanning tree")
+        order = np.array(preorder, dtype=np.int64)
+        pos = np.empty(nodes, dtype=np.int64)
+        pos[order] = np.arange(nodes)
+        dord = np.array(depth, dtype=np.int64)[order]
+        sign = np.where(np.arange(nodes) < m, 1.0, -1.0)
+
+        flow = bflow.tolist()
+        # Visit stamps for the cycle search; a fresh pair per pivot, no clearing.
+        mark = [0] * nodes
+        stamp = 0
+        block = max(1, min(m, self.block_cells // max(n, 1)))
+        blocks = -(-m // block)
+        scale = max(float(np.abs(cost).max()), 1.0)
+        eps = 1e-12 * scale
+        start = 0
+        iterations = 0
+        limit = self.max_iterations or 50 * (m + n) + 1_000
+        while iterations < limit:
+            # Block pricing: scan row blocks from where the last pivot stopped; enter the most negative cell.
+            entering = None
+            for k in range(blocks):
+                lo = (start + k) % blocks * block
+                hi = min(lo + block, m)
+                reduced = cost[lo:hi] - pot[lo:hi, None] - pot[None, m:]
+                flat = int(np.argmin(reduced))
+                if reduced.flat[flat] < -eps:
+                    entering = (lo + flat // n, flat % n, float(reduced.flat[flat]))
+                    start = (start + k + 1) % blocks
+                    break
+            if entering is None:
+                break
+            iterations += 1
+            i, j, delta = entering
+            a, b = i, m + j
+
+            # Cycle: climb from a and b in turn, stamping nodes, until one climb meets the other's trail.
+            stamp += 2
+            sa, sb = stamp - 1, stamp
+            x, y = a, b
+            mark[x], mark[y] = sa, sb
+            while True:
+                if x >= 0:
+                    x = parent[x]
+                    if x >= 0:
+                        if mark[x] == sb:
+                            top = x
+                            break
+                        mark[x] = sa
+                if y >= 0:
+                    y = parent[y]
+                    if y >= 0:
+                        if mark[y] == sa:
+                            top = y
+                            break
+                        mark[y] = sb
+            path_a: List[int] = []
+            path_b: List[int] = []
+            x = a
+            while x != top:
+                path_a.append(x)
+                x = parent[x]
+            y = b
+            while y != top:
+                path_b.append(y)
+                y = parent[y]
+            # Order around the cycle after the entering cell: up from b, then down to a. Signs alternate
+            # starting with minus; each node in the paths stands for the edge to its parent.
+            cycle = path_b + path_a[::-1]
+            minus = cycle[0::2]
+            theta = min(flow[pedge[z]] for z in minus)
+            leave = next(z for z in minus if flow[pedge[z]] == theta)
+            for z in minus:
+                flow[pedge[z]] -= theta
+            for z in cycle[1::2]:
+                flow[pedge[z]] += theta
+
+            # Drop the leaving edge (leave -> parent[leave]); the subtree B under ``leave`` re-hangs from
+            # the entering edge at whichever endpoint (s_node) lies inside it.
+            e_out = pedge[leave]
+            p = parent[leave]
+            del adj[leave][p]
+            del adj[p][leave]
+            inside_a = leave in path_a
+            s_node, t_node = (a, b) if inside_a else (b, a)
+            adj[s_node][t_node] = e_out
+            adj[t_node][s_node] = e_out
+            brow[e_out], bcol[e_out] = i, j
+            flow[e_out] = theta
+
+            # The entering cell must get u_i + v_j = c_ij: shift B's potentials by delta.
+            lo = int(pos[leave])
+            below = np.flatnonzero(dord[lo + 1 :] <= dord[lo])
+            hi = lo + 1 + int(below[0]) if len(below) else nodes
+            moved = order[lo:hi]
+            pot[moved] += (delta if inside_a else -delta) * sign[moved]
+
+            # B re-rooted at s_node, in preorder: walking the chain s_node = x0, x1, ..., leave, each
+            # x_t contributes itself and its subtrees other than x_{t-1}'s, as two runs of ``order``.
+            path = path_a if inside_a else path_b
+            chain = np.array(path[: path.index(leave) + 1])
+            at = pos[chain]
+            depth_at = dord[at]
+            # Subtree ends of all chain nodes at once: past x0, x_t's subtree runs until the depth first
+            # drops to depth(x_t) or below, i.e. until the running minimum does.
+            running = np.minimum.accumulate(dord[at[0] + 1 : hi])
+            ends = at[0] + 1 + np.searchsorted(-running, -depth_at)
+            k = len(chain)
+            starts = np.empty(2 * k - 1, dtype=np.int64)
+            stops = np.empty(2 * k - 1, dtype=np.int64)
+            starts[0], stops[0] = at[0], ends[0]
+            starts[1::2], stops[1::2] = at[1:], at[:-1]
+            starts[2::2], stops[2::2] = ends[:-1], ends[1:]
+            step = np.repeat(np.arange(k), 2)[1:]
+            lengths = stops - starts
+            gather = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(hi - lo)
+            new_nodes = order[gather]
+            new_depth = dord[gather] + np.repeat(int(dord[pos[t_node]]) + 1 + step - depth_at[step], lengths)
+            rest = np.concatenate([order[:lo], order[hi:]])
+            rest_depth = np.concatenate([dord[:lo], dord[hi:]])
+            at = int(pos[t_node])
+            ins = (at if at < lo else at - (hi - lo)) + 1
+            order = np.concatenate([rest[:ins], new_nodes, rest[ins:]])
+            dord = np.concatenate([rest_depth[:ins], new_depth, rest_depth[ins:]])
+            pos[order] = np.arange(nodes)
+
+            # Only the parent links along the chain turn around.
+            x, prev, prev_e = s_node, t_node, e_out
+            while True:
+                nxt, nxt_e = parent[x], pedge[x]
+                parent[x], pedge[x] = prev, prev_e
+                if x == leave:
+                    break
+                x, prev, prev_e = nxt, x, nxt_e
+
+        if iterations >= limit:
+            raise RuntimeError(f"transportation simplex did not converge in {limit} pivots")
+        self._basis = ((m, n), brow.copy(), bcol.copy())
+        bflow = np.maximum(np.array(flow), 0.0)
+        return TransportationSolution(
+            rows=brow.copy(),
+            cols=bcol.copy(),
+            flow=bflow,
+            objective=float((cost[brow, bcol] * bflow).sum()),
+            u=pot[:m].copy(),
+            v=pot[m:].copy(),
+            iterations=iterations,
+            warm_started=warm,
+        )
+
+
+def _tree_flows(shape, rows: np.ndarray, cols: np.ndarray, supply: np.ndarray, demand: np.ndarray):
+    """Flows on a spanning-tree basis that balance ``supply`` and ``demand`` (leaf elimination), or
+    ``None`` if the cells do not form a spanning tree."""
+    m, n = shape
+    adj: List[dict] = [{} for _ in range(m + n)]
+    for e, (i, j) in enumerate(zip(rows.tolist(), cols.tolist())):
+        adj[i][m + j] = e
+        adj[m + j][i] = e
+    order = [0]
+    parent = [-1] * (m + n)
+    pedge = [-1] * (m + n)
+    seen = [False] * (m + n)
+    seen[0] = True
+    for x in order:
+        for y, e in adj[x].items():
+            if not seen[y]:
+                seen[y] = True
+                parent[y], pedge[y] = x, e
+                order.append(y)
+    if len(order) != m + n:
+        return None
+    balance = np.concatenate([supply, -demand]).tolist()
+    flow = np.zeros(len(rows))
+    for x in reversed(order[1:]):
+        # Net supply of x's subtree leaves through its parent edge (row -> column is positive).
+        flow[pedge[x]] = balance[x] if x < m else -balance[x]
+        balance[parent[x]] += balance[x]
+    return flow